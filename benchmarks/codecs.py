@@ -0,0 +1,130 @@
+"""Compare the generated codecs with `model_validate` and `model_dump` of pydantic on a nested payload.
+
+An order with a customer, its addresses and a list of items is decoded from a dictionary into
+the models, and encoded back. The generated `<model>_from_dict` and `<model>_to_dict` functions
+are measured with the dataclass and the `msgspec.Struct` models. The targets whose library isn't
+installed are skipped.
+
+Run with `python -m benchmarks.codecs [--items N] [--payloads N] [--repeat N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.models_memory import load_models, pydantic_generator
+from zen_generator.generators.common_python import BasePythonGenerator
+from zen_generator.generators.python import Generator
+
+SCHEMA_PREFIX = "#/components/schemas/"
+SCHEMAS: dict[str, Any] = {
+    "Address": {
+        "type": "object",
+        "required": ["street", "city"],
+        "properties": {"street": {"type": "string"}, "city": {"type": "string"}, "zip": {"type": "string"}},
+    },
+    "Customer": {
+        "type": "object",
+        "required": ["customer_id", "name", "addresses"],
+        "properties": {
+            "customer_id": {"type": "integer"},
+            "name": {"type": "string"},
+            "addresses": {"type": "array", "items": {"$ref": f"{SCHEMA_PREFIX}Address"}},
+        },
+    },
+    "Item": {
+        "type": "object",
+        "required": ["sku", "quantity", "price"],
+        "properties": {"sku": {"type": "string"}, "quantity": {"type": "integer"}, "price": {"type": "number"}},
+    },
+    "Order": {
+        "type": "object",
+        "required": ["order_id", "customer", "items"],
+        "properties": {
+            "order_id": {"type": "integer"},
+            "customer": {"$ref": f"{SCHEMA_PREFIX}Customer"},
+            "items": {"type": "array", "items": {"$ref": f"{SCHEMA_PREFIX}Item"}},
+            "shipping": {"$ref": f"{SCHEMA_PREFIX}Address"},
+            "note": {"type": "string"},
+        },
+    },
+}
+
+
+def make_order(index: int, n_items: int) -> dict[str, Any]:
+    address = {"street": f"Street {index}", "city": "Rome", "zip": "00100"}
+    return {
+        "order_id": index,
+        "customer": {"customer_id": index, "name": f"Customer {index}", "addresses": [address, address]},
+        "items": [{"sku": f"SKU-{item}", "quantity": item, "price": 9.99} for item in range(n_items)],
+        "shipping": address,
+        "note": None,
+    }
+
+
+def codecs_target(generator: BasePythonGenerator) -> Callable[[Path], tuple[Callable, Callable]]:
+    def load(directory: Path) -> tuple[Callable, Callable]:
+        generator.codecs = True
+        models = load_models(generator, SCHEMAS, directory)
+        return models.order_from_dict, models.order_to_dict
+
+    return load
+
+
+def pydantic_target(directory: Path) -> tuple[Callable, Callable]:
+    order = load_models(pydantic_generator(), SCHEMAS, directory).Order
+    return order.model_validate, order.model_dump
+
+
+TARGETS: dict[str, Callable[[Path], tuple[Callable, Callable]]] = {
+    "dataclass codecs": codecs_target(Generator.dataclass_generator()),
+    "msgspec codecs": codecs_target(Generator.msgspec_generator()),
+    "pydantic": pydantic_target,
+}
+
+
+def per_second(func: Callable[[Any], Any], values: list[Any], repeat: int) -> float:
+    """Return the best rate of calls to `func` over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            func(value)
+        best = min(best, time.perf_counter() - start)
+    return len(values) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--payloads", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = [make_order(index, args.items) for index in range(args.payloads)]
+
+    print(f"payloads: {args.payloads}, items per order: {args.items}, best of {args.repeat} runs")
+    print(f"{'target':<17} {'decode/s':>10} {'encode/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for target, load in TARGETS.items():
+            directory = Path(tmp_dir) / target.replace(" ", "_")
+            directory.mkdir()
+            try:
+                decode, encode = load(directory)
+            except ImportError as exc:
+                print(f"{target:<17} skipped: {exc}")
+                continue
+            models = [decode(payload) for payload in payloads]
+            assert encode(models[0]) == payloads[0]
+            print(
+                f"{target:<17} {per_second(decode, payloads, args.repeat):>10,.0f} "
+                f"{per_second(encode, models, args.repeat):>10,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
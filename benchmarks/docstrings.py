@@ -0,0 +1,112 @@
+"""Compare the docstring parser of `zen_generator.core.docstrings` with the previous regular expressions.
+
+The uncached parser and the regular expressions are measured on a corpus of distinct docstrings
+of every style, so that no result is reused. The regular expressions only understood the Google
+style: on the other styles they find nothing, which is why they are reported separately. The
+cached parser is then measured on docstrings drawn, with repetitions, from the same corpus.
+
+Run with `python -m benchmarks.docstrings [--docstrings N] [--unique N] [--repeat N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from typing import Any, Callable
+
+from zen_generator.core.docstrings import parse_docstring
+
+# the patterns used by `core.parsing` before the docstring parser
+ARGS_PATTERN = re.compile(r"Args:(.*?)(?:Returns|$)", re.DOTALL)
+RETURNS_PATTERN = re.compile(r"Returns:(.*?)$", re.DOTALL)
+ARGS_DESCRIPTION_PATTERN = r"\s*([\w_]+)\s*\(\)\s*:\s*([^(\n)]+)"
+
+WORDS = ("user", "task", "id", "the", "of", "list", "attachment", "value", "returns", "environment", "year")
+STYLES = ("google", "legacy", "numpy", "sphinx")
+
+
+def sentence(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def make_docstring(rng: random.Random, n_params: int, style: str) -> str:
+    """Generate a docstring documenting `n_params` parameters, in the given style."""
+    names = [f"param_{index}" for index in range(n_params)]
+    summary = sentence(rng, 8)
+    if style in ("google", "legacy"):
+        type_hint = "()" if style == "legacy" else "(int)"
+        args = "\n".join(f"    {name} {type_hint}: {sentence(rng, 6)}" for name in names)
+        return f"{summary}\n\nArgs:\n{args}\n\nReturns:\n    {sentence(rng, 5)}\n"
+    if style == "numpy":
+        args = "\n".join(f"{name} : int\n    {sentence(rng, 6)}" for name in names)
+        return f"{summary}\n\nParameters\n----------\n{args}\n\nReturns\n-------\nint\n    {sentence(rng, 5)}\n"
+    args = "\n".join(f":param int {name}: {sentence(rng, 6)}" for name in names)
+    return f"{summary}\n\n{args}\n:returns: {sentence(rng, 5)}\n:rtype: int\n"
+
+
+def make_corpus(n_docstrings: int, seed: int = 0) -> dict[str, list[str]]:
+    """Generate `n_docstrings` distinct docstrings of every style."""
+    rng = random.Random(seed)
+    corpus: dict[str, list[str]] = {}
+    for style in STYLES:
+        docstrings: dict[str, None] = {}
+        while len(docstrings) < n_docstrings:
+            docstrings[make_docstring(rng, rng.randint(0, 8), style)] = None
+        corpus[style] = list(docstrings)
+    return corpus
+
+
+def parse_with_regex(docstring: str) -> tuple[dict[str, str], str]:
+    args_match = ARGS_PATTERN.search(docstring)
+    returns_match = RETURNS_PATTERN.search(docstring)
+    descriptions = dict(re.findall(ARGS_DESCRIPTION_PATTERN, args_match.group(1).strip())) if args_match else {}
+    return descriptions, returns_match.group(1).strip() if returns_match else ""
+
+
+def parse_uncached(docstring: str) -> Any:
+    return parse_docstring.__wrapped__(docstring)
+
+
+def measure(corpus: list[str], parse: Callable[[str], Any], repeat: int) -> float:
+    """Return the best time, over `repeat` runs, to parse the corpus."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for docstring in corpus:
+            parse(docstring)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docstrings", type=int, default=2_500, help="distinct docstrings of every style")
+    parser.add_argument("--unique", type=int, default=2_000, help="distinct docstrings parsed by the cached parser")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docstrings)
+    corpus["all"] = [docstring for docstrings in corpus.values() for docstring in docstrings]
+    print(f"corpus: {args.docstrings} distinct docstrings of every style, time per docstring (us)")
+    print(f"{'style':<10} {'regular expressions':>20} {'parser, uncached':>18} {'ratio':>7}")
+    for style, docstrings in corpus.items():
+        regex = measure(docstrings, parse_with_regex, args.repeat) / len(docstrings) * 1e6
+        uncached = measure(docstrings, parse_uncached, args.repeat) / len(docstrings) * 1e6
+        print(f"{style:<10} {regex:>20.1f} {uncached:>18.1f} {uncached / regex:>7.2f}")
+
+    rng = random.Random(0)
+    unique = rng.sample(corpus["all"], min(args.unique, len(corpus["all"])))
+    repeated = [rng.choice(unique) for _ in range(len(corpus["all"]))]
+    parse_docstring.cache_clear()
+    elapsed = measure(repeated, parse_docstring, 1)
+    info = parse_docstring.cache_info()
+    print(
+        f"\nparser, cached: {elapsed / len(repeated) * 1e6:.1f} us per docstring on {len(repeated)} docstrings "
+        f"drawn from {len(unique)} distinct ones ({info.hits} hits, {info.misses} misses)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare the import time of the models generated as a single module and as a package.
+
+Run with `python -m benchmarks.import_time [--schemas N] [--repeat N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from ast import ImportFrom, alias
+from pathlib import Path
+
+from benchmarks.synthetic import make_spec
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.core.io import save_python_files
+from zen_generator.generators.common_python import BasePythonGenerator
+
+# every scenario runs in a fresh interpreter, `models` is the generated module or package
+SCENARIOS = {
+    "import": "import models",
+    "one model": "from models import Model0",
+    "all models": "import models; [getattr(models, f'Model{{index}}') for index in range({schemas})]",
+}
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def generate(spec: dict, destination: Path, split_models: bool) -> None:
+    generator = BasePythonGenerator(
+        extra_imports=[ImportFrom(module="typing", names=[alias(name="TypedDict")], level=0)],
+        formatter=RuffFormatter(enabled=False),
+        split_models=split_models,
+    )
+    generator.source_content = spec
+    generator.load_component_schemas()
+    generator._generate_models()
+    save_python_files(generator.models_modules(destination / "models.py"), generator.formatter)
+
+
+def import_time(directory: Path, statement: str, repeat: int) -> float:
+    """Return the best import time in seconds, each run in a new interpreter."""
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            cwd=directory,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(float(result.stdout))
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=3000)
+    parser.add_argument("--fields", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    spec = make_spec(n_schemas=args.schemas, n_operations=0, n_fields=args.fields)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        layouts = {"single module": Path(tmp_dir) / "single", "package": Path(tmp_dir) / "package"}
+        for directory in layouts.values():
+            split_models = directory.name == "package"
+            directory.mkdir()
+            generate(spec, directory, split_models)
+            # compile once, so every layout is measured with its bytecode cached
+            subprocess.run([sys.executable, "-m", "compileall", "-q", str(directory)], check=True)
+
+        print(f"models: {args.schemas}, best of {args.repeat} runs")
+        print(f"{'layout':<14} {'scenario':<12} {'time (ms)':>10}")
+        for layout, directory in layouts.items():
+            for scenario, statement in SCENARIOS.items():
+                elapsed = import_time(directory, statement.format(schemas=args.schemas), args.repeat)
+                print(f"{layout:<14} {scenario:<12} {elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Compare the memory per instance and the construction speed of the generated models.
+
+The same schema is generated as a TypedDict, a pydantic model, a slotted dataclass and a
+`msgspec.Struct`. The targets whose library isn't installed are skipped.
+
+Run with `python -m benchmarks.models_memory [--fields N] [--instances N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+import tracemalloc
+from ast import ImportFrom, alias
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.core.io import save_python_files
+from zen_generator.generators.common_python import BasePythonGenerator
+from zen_generator.generators.python import Generator
+
+PRIMITIVE_VALUES = {"string": "value", "integer": 42, "boolean": True}
+
+
+def typed_dict_generator() -> BasePythonGenerator:
+    return BasePythonGenerator(
+        override_base_class="TypedDict",
+        extra_imports=[ImportFrom(module="typing", names=[alias(name="TypedDict")], level=0)],
+    )
+
+
+def pydantic_generator() -> BasePythonGenerator:
+    return BasePythonGenerator(
+        override_base_class="BaseModel",
+        extra_imports=[ImportFrom(module="pydantic", names=[alias(name="BaseModel")], level=0)],
+    )
+
+
+TARGETS: dict[str, Callable[[], BasePythonGenerator]] = {
+    "TypedDict": typed_dict_generator,
+    "pydantic": pydantic_generator,
+    "dataclass": Generator.dataclass_generator,
+    "msgspec": Generator.msgspec_generator,
+}
+
+
+def make_schema(n_fields: int) -> dict[str, Any]:
+    """Generate a model with `n_fields` primitive properties, half of them required."""
+    types = list(PRIMITIVE_VALUES)
+    properties = {f"field_{index}": {"type": types[index % len(types)]} for index in range(n_fields)}
+    return {"type": "object", "required": list(properties)[::2], "properties": properties}
+
+
+def load_models(generator: BasePythonGenerator, schemas: dict[str, Any], directory: Path) -> ModuleType:
+    """Generate the models with the given generator and import them from a new module."""
+    generator.formatter = RuffFormatter(enabled=False)
+    generator.component_schemas = schemas
+    generator._generate_models()
+    models_file = directory / "models.py"
+    save_python_files(generator.models_modules(models_file), generator.formatter)
+
+    name = f"benchmark_models_{directory.name}"
+    spec = importlib.util.spec_from_file_location(name, models_file)
+    assert spec is not None and spec.loader is not None
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    # pydantic and msgspec look for the annotations of the fields in the module
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def bytes_per_instance(factory: Callable[[], Any], instances: int) -> float:
+    """Return the memory allocated by every instance, including its slot in the list that holds them."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [factory() for _ in range(instances)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return (after - before) / instances
+
+
+def constructions_per_second(factory: Callable[[], Any], instances: int, repeat: int) -> float:
+    """Return the best construction rate over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(instances):
+            factory()
+        best = min(best, time.perf_counter() - start)
+    return instances / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fields", type=int, default=8)
+    parser.add_argument("--instances", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    schema = make_schema(args.fields)
+    values = {name: PRIMITIVE_VALUES[prop["type"]] for name, prop in schema["properties"].items()}
+
+    print(f"fields: {args.fields}, instances: {args.instances}, best of {args.repeat} runs")
+    print(f"{'target':<10} {'bytes/instance':>15} {'constructions/s':>16}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for target, make_generator in TARGETS.items():
+            directory = Path(tmp_dir) / target
+            directory.mkdir()
+            try:
+                model = load_models(make_generator(), {"Model": schema}, directory).Model
+            except ImportError as exc:
+                print(f"{target:<10} skipped: {exc}")
+                continue
+
+            def factory(model: type = model) -> Any:
+                return model(**values)
+
+            size = bytes_per_instance(factory, args.instances)
+            rate = constructions_per_second(factory, args.instances, args.repeat)
+            print(f"{target:<10} {size:>15.1f} {rate:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
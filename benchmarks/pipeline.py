@@ -0,0 +1,227 @@
+"""Measure every stage of the generation, in both directions, on a synthetic document and its sources.
+
+The AsyncAPI to Python direction loads the document and builds the models, the functions and the
+formatted code. The Python to AsyncAPI direction parses the sources, converts their annotations
+and writes the document. Every stage is timed, best of `--repeat` runs, and its memory peak is
+measured with tracemalloc in a separate run, so the tracing doesn't inflate the time. The caches
+of the annotations and of the docstrings are cleared before every run, and the formatted code
+isn't cached.
+
+Run with:
+
+    python -m benchmarks.pipeline run [--schemas N] [--operations N] [--fields N] [--union-width N]
+        [--depth N] [--seed N] [--repeat N] [--output results.json]
+    python -m benchmarks.pipeline compare baseline.json results.json [--threshold 0.2]
+
+`compare` exits with status 1 when a stage of the results is slower, or needs more memory, than in
+the baseline by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from ast import AnnAssign, FunctionDef, Module, fix_missing_locations, parse, unparse, walk
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+
+from benchmarks.synthetic import make_sources, make_spec
+from zen_generator.core.ast_utils import annotation_schema_cache, generate_component_schemas, parse_type_annotation
+from zen_generator.core.docstrings import parse_docstring
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.core.io import load_yaml, save_yaml_file
+from zen_generator.core.parsing import function_content_reader
+from zen_generator.generators.asyncapi import create_async_api_content
+from zen_generator.generators.python import Generator
+
+Stage = Callable[[dict[str, Any]], Any]
+
+
+def clear_caches() -> None:
+    annotation_schema_cache.clear()
+    parse_docstring.cache_clear()
+
+
+def annotations_of(trees: list[Module]) -> list[Any]:
+    """Return the annotations of the fields and of the signatures of the parsed sources."""
+    annotations: list[Any] = []
+    for tree in trees:
+        for node in walk(tree):
+            if isinstance(node, AnnAssign):
+                annotations.append(node.annotation)
+            elif isinstance(node, FunctionDef):
+                annotations.extend(param.annotation for param in node.args.args)
+                annotations.append(node.returns)
+    return annotations
+
+
+def generate_models(state: dict[str, Any]) -> Any:
+    generator = state["generator"]
+    generator.models_ast = []
+    generator.generate_models_ast()
+    return generator.models_ast
+
+
+def generate_functions(state: dict[str, Any]) -> Any:
+    generator = state["generator"]
+    generator.functions_ast = []
+    generator.generate_function_ast("Synthetic")
+    return generator.functions_ast
+
+
+def format_code(state: dict[str, Any]) -> Any:
+    # without the cache, which would return the code formatted by the previous run
+    formatter = RuffFormatter(cache=None)
+    return [formatter.format_code(code) for code in state["unparse"]]
+
+
+def python_stages(directory: Path) -> dict[str, Stage]:
+    """The stages of the AsyncAPI to Python direction, each reading the results of the previous ones."""
+    source = directory / "asyncapi.yaml"
+
+    def load(state: dict[str, Any]) -> Any:
+        generator = Generator.pure_python_generator()
+        generator.formatter = RuffFormatter(enabled=False)
+        generator.source_content = load_yaml(source) or {}
+        generator.load_component_schemas()
+        state["generator"] = generator
+        return generator.source_content
+
+    return {
+        "load_yaml": load,
+        "generate_models_ast": generate_models,
+        "generate_function_ast": generate_functions,
+        "unparse": lambda state: [
+            unparse(fix_missing_locations(Module(body=nodes, type_ignores=[])))
+            for nodes in (state["generate_models_ast"], state["generate_function_ast"])
+        ],
+        "format_python_code": format_code,
+    }
+
+
+def asyncapi_stages(directory: Path) -> dict[str, Stage]:
+    """The stages of the Python to AsyncAPI direction, each reading the results of the previous ones."""
+    destination = directory / "Synthetic.yaml"
+    return {
+        "parse": lambda state: [parse(source) for source in state["sources"]],
+        "parse_type_annotation": lambda state: [
+            parse_type_annotation(annotation) for annotation in annotations_of(state["parse"])
+        ],
+        "generate_component_schemas": lambda state: generate_component_schemas(state["parse"][0], state["sources"][0]),
+        "function_content_reader": lambda state: function_content_reader(state["parse"][1], state["sources"][1]),
+        "create_async_api_content": lambda state: create_async_api_content(
+            "Synthetic", state["generate_component_schemas"], *state["function_content_reader"]
+        ),
+        "save_yaml_file": lambda state: save_yaml_file(state["create_async_api_content"], destination, "Synthetic"),
+    }
+
+
+def measure(stages: dict[str, Stage], state: dict[str, Any], repeat: int) -> dict[str, dict[str, float]]:
+    """Run the stages in order, and return the best time and the memory peak of every stage."""
+    results: dict[str, dict[str, float]] = {}
+    for name, stage in stages.items():
+        best = float("inf")
+        for _ in range(repeat):
+            clear_caches()
+            start = time.perf_counter()
+            stage(state)
+            best = min(best, time.perf_counter() - start)
+
+        clear_caches()
+        tracemalloc.start()
+        state[name] = stage(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {"seconds": best, "peak_bytes": peak}
+    return results
+
+
+def run(args: argparse.Namespace) -> None:
+    params = {
+        "n_schemas": args.schemas,
+        "n_operations": args.operations,
+        "n_fields": args.fields,
+        "seed": args.seed,
+        "union_width": args.union_width,
+        "depth": args.depth,
+    }
+    stages: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = Path(tmp_dir)
+        with open(directory / "asyncapi.yaml", mode="w") as f:
+            yaml.dump(make_spec(**params), f, Dumper=yaml.SafeDumper, sort_keys=False)
+        for direction, direction_stages, state in (
+            ("python", python_stages(directory), {}),
+            ("asyncapi", asyncapi_stages(directory), {"sources": list(make_sources(**params))}),
+        ):
+            for name, result in measure(direction_stages, state, args.repeat).items():
+                stages[f"{direction}.{name}"] = result
+
+    print(f"{', '.join(f'{name}: {value}' for name, value in params.items())}, best of {args.repeat} runs")
+    print(f"{'stage':<36} {'time (s)':>10} {'peak (MiB)':>12}")
+    for name, result in stages.items():
+        print(f"{name:<36} {result['seconds']:>10.4f} {result['peak_bytes'] / 2**20:>12.2f}")
+
+    if args.output is not None:
+        results = {"params": params, "python": platform.python_version(), "stages": stages}
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Written: {args.output}")
+
+
+def compare(args: argparse.Namespace) -> None:
+    baseline = json.loads(args.baseline.read_text())
+    results = json.loads(args.results.read_text())
+    if baseline["params"] != results["params"]:
+        print(f"warning: the parameters differ, {baseline['params']} and {results['params']}")
+
+    regressions = 0
+    print(f"{'stage':<36} {'time':>8} {'memory':>8}")
+    for name, result in results["stages"].items():
+        if name not in baseline["stages"]:
+            print(f"{name:<36} {'new':>8} {'new':>8}")
+            continue
+        base = baseline["stages"][name]
+        ratios = [result[metric] / base[metric] if base[metric] else 1.0 for metric in ("seconds", "peak_bytes")]
+        regressed = any(ratio > 1 + args.threshold for ratio in ratios)
+        regressions += regressed
+        print(f"{name:<36} {ratios[0]:>7.2f}x {ratios[1]:>7.2f}x{'  REGRESSION' if regressed else ''}")
+
+    if regressions:
+        print(f"{regressions} stage(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Measure the stages and optionally save the results as JSON")
+    run_parser.add_argument("--schemas", type=int, default=500)
+    run_parser.add_argument("--operations", type=int, default=500)
+    run_parser.add_argument("--fields", type=int, default=8)
+    run_parser.add_argument("--union-width", type=int, default=2)
+    run_parser.add_argument("--depth", type=int, default=2)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", type=Path)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="Flag the stages that regressed against a baseline")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("results", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
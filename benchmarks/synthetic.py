@@ -0,0 +1,171 @@
+"""This module generates synthetic AsyncAPI documents, and the matching Python sources, for the benchmarks.
+
+The document and the sources are built from the same seeded random choices: `make_spec` and
+`make_sources` called with the same arguments describe the same models and operations.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from zen_generator.generators.asyncapi import create_async_api_content
+
+PRIMITIVE_TYPES = ("string", "integer", "boolean")
+PYTHON_TYPES = {"string": "str", "integer": "int", "boolean": "bool"}
+
+
+def make_type(
+    rng: random.Random,
+    n_models: int,
+    ref_ratio: float = 0.3,
+    union_width: int = 1,
+    depth: int = 1,
+) -> tuple[dict[str, Any], str]:
+    """Generate the schema of a property and the matching Python annotation.
+
+    Args:
+        rng: The random generator.
+        n_models: The number of models the property may reference, `Model0` to `Model<n_models - 1>`.
+        ref_ratio: The probability of every option to reference a model.
+        union_width: The number of options of the property, an option drawn twice is kept once.
+        depth: The number of nested lists around the property, which is a list one time in five.
+
+    Returns:
+        The schema and the annotation, e.g. `{"oneOf": [...]}` and `int | Model3`.
+    """
+    schemas: list[dict[str, Any]] = []
+    annotations: list[str] = []
+    for _ in range(union_width):
+        if n_models and rng.random() < ref_ratio:
+            annotation = f"Model{rng.randrange(n_models)}"
+            schema: dict[str, Any] = {"$ref": f"#/components/schemas/{annotation}"}
+        else:
+            type_name = rng.choice(PRIMITIVE_TYPES)
+            annotation, schema = PYTHON_TYPES[type_name], {"type": type_name}
+        if annotation not in annotations:
+            annotations.append(annotation)
+            schemas.append(schema)
+    schema = schemas[0] if len(schemas) == 1 else {"oneOf": schemas}
+    annotation = " | ".join(annotations)
+    if depth and rng.random() < 0.2:
+        for _ in range(depth):
+            schema = {"type": "array", "items": schema}
+            annotation = f"list[{annotation}]"
+    return schema, annotation
+
+
+def make_schema(
+    rng: random.Random, index: int, n_fields: int, union_width: int = 1, depth: int = 1
+) -> tuple[dict[str, Any], str]:
+    """Generate the schema of a model with `n_fields` properties, and its class.
+
+    Properties may reference any of the models generated before this one.
+    """
+    properties: dict[str, Any] = {}
+    fields: list[str] = []
+    for field_index in range(n_fields):
+        prop, annotation = make_type(rng, index, 0.3, union_width, depth)
+        properties[f"field_{field_index}"] = prop
+        fields.append(f"field_{field_index}: {annotation}")
+    required = [name for name in properties if rng.random() < 0.7]
+    fields = [line if line.split(":")[0] in required else f"{line} | None" for line in fields]
+    source = f"class Model{index}(TypedDict):\n" + "".join(f"    {line}\n" for line in fields)
+    return {"type": "object", "base_class": "TypedDict", "required": required, "properties": properties}, source
+
+
+def make_function(
+    rng: random.Random, name: str, n_schemas: int, n_params: int, union_width: int = 1, depth: int = 1
+) -> tuple[dict[str, Any], str]:
+    """Generate the request/response messages of an operation, and its function."""
+    properties = {}
+    params: list[str] = []
+    for param_index in range(n_params):
+        prop, annotation = make_type(rng, n_schemas, 0.5, union_width, depth)
+        properties[f"param_{param_index}"] = {**prop, "description": f"Parameter {param_index} of {name}"}
+        params.append(f"param_{param_index}: {annotation}{' | None' if param_index >= n_params // 2 else ''}")
+    description = f"Description of {name}.\n\nArgs:\n    param_0 (): the first parameter"
+    request = {
+        "title": f"Request params for {name}",
+        "summary": "",
+        "description": description,
+        "payload": {"type": "object", "required": list(properties)[: n_params // 2], "properties": properties},
+    }
+    response_type = rng.choice(PRIMITIVE_TYPES)
+    response = {
+        "title": f"Response params for {name}",
+        "summary": "",
+        "description": "The result",
+        "payload": {"type": response_type, "format": "required"},
+    }
+    source = (
+        f"def {name}({', '.join(params)}) -> {PYTHON_TYPES[response_type]}:\n"
+        f'    """Description of {name}.\n\n    Args:\n        param_0 (): the first parameter\n\n'
+        f'    Returns:\n        The result\n    """\n'
+    )
+    return {"request": request, "response": response}, source
+
+
+def _make_parts(
+    n_schemas: int, n_operations: int, n_fields: int, union_width: int, depth: int, seed: int
+) -> tuple[dict[str, tuple[dict[str, Any], str]], dict[str, tuple[dict[str, Any], str]]]:
+    rng = random.Random(seed)
+    schemas = {f"Model{index}": make_schema(rng, index, n_fields, union_width, depth) for index in range(n_schemas)}
+    functions = {
+        f"operation_{index}": make_function(rng, f"operation_{index}", n_schemas, n_fields, union_width, depth)
+        for index in range(n_operations)
+    }
+    return schemas, functions
+
+
+def make_spec(
+    n_schemas: int = 1000,
+    n_operations: int = 1000,
+    n_fields: int = 8,
+    seed: int = 0,
+    union_width: int = 1,
+    depth: int = 1,
+) -> dict[str, Any]:
+    """Generate a synthetic AsyncAPI document.
+
+    Args:
+        n_schemas: The number of models in `components.schemas`.
+        n_operations: The number of operations, each with a request and a response message.
+        n_fields: The number of properties of every model and of every request.
+        seed: The seed of the random generator, the same seed always gives the same document.
+        union_width: The number of options of every property, `oneOf` when greater than one.
+        depth: The number of nested arrays around the properties that are arrays.
+
+    Returns:
+        The AsyncAPI document.
+    """
+    schemas, functions = _make_parts(n_schemas, n_operations, n_fields, union_width, depth, seed)
+    return create_async_api_content(
+        "Synthetic",
+        {name: schema for name, (schema, _) in schemas.items()},
+        "Synthetic API",
+        {name: messages for name, (messages, _) in functions.items()},
+    )
+
+
+def make_sources(
+    n_schemas: int = 1000,
+    n_operations: int = 1000,
+    n_fields: int = 8,
+    seed: int = 0,
+    union_width: int = 1,
+    depth: int = 1,
+) -> tuple[str, str]:
+    """Generate the models and the functions modules described by `make_spec` with the same arguments.
+
+    Returns:
+        The source code of the models module and of the functions module.
+    """
+    schemas, functions = _make_parts(n_schemas, n_operations, n_fields, union_width, depth, seed)
+    models = "from __future__ import annotations\n\nfrom typing import TypedDict\n\n\n" + "\n\n".join(
+        source for _, source in schemas.values()
+    )
+    functions_source = '"""Synthetic API"""\n\nfrom __future__ import annotations\n\n\n' + "\n\n".join(
+        source for _, source in functions.values()
+    )
+    return models, functions_source
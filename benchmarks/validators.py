@@ -0,0 +1,108 @@
+"""Compare the generated validators with the validation of jsonschema on the same payloads.
+
+Every request payload of a synthetic document is validated by its generated validator and by a
+jsonschema validator built once per payload. The jsonschema target is skipped if it isn't installed.
+
+Run with `python -m benchmarks.validators [--schemas N] [--operations N] [--repeat N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Callable
+
+from benchmarks.synthetic import make_spec
+from zen_generator.core.ast_utils import generate_code_from_ast
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.generators.common_python import BasePythonGenerator
+
+PRIMITIVE_VALUES = {"string": "value", "integer": 42, "boolean": True}
+SCHEMA_PREFIX = "#/components/schemas/"
+
+
+def make_value(schema: dict[str, Any], schemas: dict[str, Any], rng: random.Random) -> Any:
+    """Build a valid value of a schema, with the optional properties of the models left out half of the time."""
+    if "$ref" in schema:
+        return make_value(schemas[schema["$ref"].removeprefix(SCHEMA_PREFIX)], schemas, rng)
+    if schema.get("type") == "array":
+        return [make_value(schema["items"], schemas, rng) for _ in range(rng.randrange(3))]
+    if schema.get("type") == "object":
+        required = schema.get("required", [])
+        return {
+            name: make_value(prop, schemas, rng)
+            for name, prop in schema.get("properties", {}).items()
+            if name in required or rng.random() < 0.5
+        }
+    return PRIMITIVE_VALUES[schema["type"]]
+
+
+def generated_validators(spec: dict[str, Any]) -> dict[str, Callable[[Any], None]]:
+    generator = BasePythonGenerator(formatter=RuffFormatter(enabled=False), validators=True)
+    generator.source_content = spec
+    generator.load_component_schemas()
+    generator.generate_validators_ast()
+    namespace: dict[str, Any] = {}
+    exec(compile(generate_code_from_ast(generator.validators_ast), "validators.py", "exec"), namespace)
+    return namespace["VALIDATORS"]
+
+
+def jsonschema_validators(spec: dict[str, Any], payloads: dict[str, Any]) -> dict[str, Callable[[Any], None]]:
+    from jsonschema import Draft202012Validator
+
+    # the references are resolved against the root of the schema, which carries the components
+    return {
+        name: Draft202012Validator(
+            {**spec["components"]["messages"][name]["payload"], "components": spec["components"]}
+        ).validate
+        for name in payloads
+    }
+
+
+def best_time(validators: dict[str, Callable[[Any], None]], payloads: dict[str, Any], repeat: int) -> float:
+    """Return the best time to validate every payload once."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name, payload in payloads.items():
+            validators[name](payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=100)
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--fields", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    spec = make_spec(n_schemas=args.schemas, n_operations=args.operations, n_fields=args.fields)
+    schemas = spec["components"]["schemas"]
+    rng = random.Random(0)
+    payloads = {
+        name: make_value(message["payload"], schemas, rng)
+        for name, message in spec["components"]["messages"].items()
+        if name.endswith("_request")
+    }
+
+    targets = {
+        "generated": lambda: generated_validators(spec),
+        "jsonschema": lambda: jsonschema_validators(spec, payloads),
+    }
+    print(f"payloads: {len(payloads)}, best of {args.repeat} runs")
+    print(f"{'target':<11} {'total (ms)':>11} {'per payload (us)':>17}")
+    for target, build in targets.items():
+        try:
+            validators = build()
+        except ImportError as exc:
+            print(f"{target:<11} skipped: {exc}")
+            continue
+        elapsed = best_time(validators, payloads, args.repeat)
+        print(f"{target:<11} {elapsed * 1000:>11.2f} {elapsed / len(payloads) * 1e6:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare the libyaml and the pure Python YAML paths used by `zen_generator.core.io`.
+
+Run with `python -m benchmarks.yaml_io [--schemas N] [--operations N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+
+from benchmarks.synthetic import make_spec
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, int]:
+    """Return the wall time in seconds and the peak of allocated memory in bytes of `func`."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def dump_to_string(spec: dict[str, Any], destination: Path, dumper: type) -> None:
+    dumped = yaml.dump(spec, Dumper=dumper, default_flow_style=False, sort_keys=False)
+    with open(destination, mode="w") as f:
+        f.write(dumped)
+
+
+def dump_streaming(spec: dict[str, Any], destination: Path, dumper: type) -> None:
+    with open(destination, mode="w") as f:
+        yaml.dump(spec, f, Dumper=dumper, default_flow_style=False, sort_keys=False)
+
+
+def load(source: Path, loader: type) -> Any:
+    with open(source) as f:
+        return yaml.load(f, Loader=loader)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=2000)
+    parser.add_argument("--operations", type=int, default=2000)
+    args = parser.parse_args()
+
+    spec = make_spec(n_schemas=args.schemas, n_operations=args.operations)
+    paths: list[tuple[str, type, type]] = [("pure python", yaml.SafeLoader, yaml.SafeDumper)]
+    if yaml.__with_libyaml__:
+        paths.append(("libyaml", yaml.CSafeLoader, yaml.CSafeDumper))
+    else:
+        print("libyaml is not available, only the pure Python path is measured")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        destination = Path(tmp_dir) / "asyncapi.yaml"
+        dump_streaming(spec, destination, yaml.SafeDumper)
+        print(f"spec: {args.schemas} schemas, {args.operations} operations, {destination.stat().st_size:,} bytes")
+        print(f"{'path':<12} {'stage':<16} {'time (s)':>10} {'peak (MiB)':>12}")
+        for name, loader, dumper in paths:
+            stages: dict[str, Callable[[], Any]] = {
+                "load": lambda loader=loader: load(destination, loader),
+                "dump to string": lambda dumper=dumper: dump_to_string(spec, destination, dumper),
+                "dump streaming": lambda dumper=dumper: dump_streaming(spec, destination, dumper),
+            }
+            for stage, func in stages.items():
+                elapsed, peak = measure(func)
+                print(f"{name:<12} {stage:<16} {elapsed:>10.3f} {peak / 2**20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,14 @@ import os
 
 import pytest
 
+from zen_generator.core.cache import CACHE_DIR_ENV
+
 
 @pytest.fixture(autouse=True, scope="session")
 def change_test_dir():
     os.chdir(os.path.dirname(__file__))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache_dir(tmp_path_factory):
+    os.environ[CACHE_DIR_ENV] = str(tmp_path_factory.mktemp("cache"))
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import ast
 from ast import ClassDef, Constant, Expr, FunctionDef, Load, Name, Pass, arg, arguments
 
 
-from zen_generator.core.ast_utils import generate_code_from_ast
+from zen_generator.core.ast_utils import AnnotationSchemaCache, annotation_fingerprint, generate_code_from_ast
+from zen_generator.core.parsing import function_content_reader
 from zen_generator.core.formatting import format_python_code
 
 
@@ -108,3 +110,49 @@ def test_generate_code_from_ast_with_multiple_nodes() -> None:
         "def test_function(x:str, y:bool = True) -> None:\n    pass\n\nclass TestClass:\n    def __init__(self) -> None:\n        pass\n"
     )
     assert result == expected_code
+
+
+def _annotation(source: str) -> ast.expr:
+    return ast.parse(source, mode="eval").body
+
+
+def test_annotation_fingerprint() -> None:
+    assert annotation_fingerprint(_annotation("list[User] | None")) == annotation_fingerprint(
+        _annotation("list[User]|None")
+    )
+    assert annotation_fingerprint(_annotation("list[User]")) != annotation_fingerprint(_annotation("list[Users]"))
+    assert annotation_fingerprint(_annotation("None")) != annotation_fingerprint(_annotation("'None'"))
+
+
+def test_annotation_schema_cache() -> None:
+    cache = AnnotationSchemaCache()
+    first = cache.convert(_annotation("str | None"))
+    second = cache.convert(_annotation("str | None"))
+    assert first == (False, {"type": "string"})
+    assert second[1] is first[1]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.clear()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_interned_schemas_are_copied_on_write() -> None:
+    tree = ast.parse(
+        '''
+def first(user_id: int) -> int:
+    """Args:
+        user_id (): the first description
+    """
+
+def second(user_id: int) -> int:
+    """Args:
+        user_id (): the second description
+    """
+'''
+    )
+    _, functions = function_content_reader(tree)
+    first_property = functions["first"]["request"]["payload"]["properties"]["user_id"]
+    second_property = functions["second"]["request"]["payload"]["properties"]["user_id"]
+    assert first_property == {"type": "integer", "description": "the first description"}
+    assert second_property == {"type": "integer", "description": "the second description"}
+    assert functions["first"]["response"]["payload"] == {"type": "integer", "format": "required"}
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from zen_generator.core import cache as cache_module
+from zen_generator.core.cache import DiskCache, SchemaCache, content_hash, default_cache_dir
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.generators import asyncapi
+from zen_generator.generators.asyncapi import generate_asyncapi_from_files
+
+
+def test_content_hash() -> None:
+    assert content_hash("a", "bc") == content_hash("a", "bc")
+    assert content_hash("a", "bc") != content_hash("ab", "c")
+
+
+def test_default_cache_dir(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("ZEN_GENERATOR_CACHE_DIR", str(tmp_path))
+    assert default_cache_dir() == tmp_path
+
+
+def test_disk_cache_get_set(tmp_path) -> None:
+    cache = DiskCache(tmp_path)
+    assert cache.get("abcdef") is None
+    cache.set("abcdef", "value")
+    assert cache.get("abcdef") == "value"
+    cache.clear()
+    assert cache.get("abcdef") is None
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = DiskCache(tmp_path, max_size=25)
+    cache.set("aa01", "x" * 10)
+    cache.set("aa02", "x" * 10)
+    os.utime(tmp_path / "aa" / "aa01", (1, 1))
+    os.utime(tmp_path / "aa" / "aa02", (2, 2))
+    assert cache.get("aa01") == "x" * 10
+
+    cache.set("aa03", "x" * 10)
+
+    assert cache.get("aa02") is None
+    assert cache.get("aa01") == "x" * 10
+    assert cache.get("aa03") == "x" * 10
+
+
+def test_disk_cache_overwrite_keeps_size(tmp_path, monkeypatch) -> None:
+    cache = DiskCache(tmp_path, max_size=25)
+    cache.set("aa01", "x" * 10)
+    cache.set("aa02", "x" * 10)
+    monkeypatch.setattr(cache, "evict", lambda: pytest.fail("overwritten entries counted twice"))
+
+    for _ in range(3):
+        cache.set("aa01", "y" * 10)
+
+    assert cache.get("aa01") == "y" * 10
+    assert cache.get("aa02") == "x" * 10
+
+
+def test_formatter_uses_cache(tmp_path, monkeypatch) -> None:
+    formatter = RuffFormatter(cache=DiskCache(tmp_path))
+    formatted = formatter.format_code("x=1\n")
+    assert formatted.endswith("x = 1\n")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ruff should not run on a cache hit")
+
+    monkeypatch.setattr(formatter, "_run", fail)
+    assert formatter.format_code("x=1\n") == formatted
+
+    destination = tmp_path / "cached.py"
+    formatter.write_files({destination: "x=1\n"})
+    assert destination.read_text() == formatted
+
+
+def test_formatter_cache_key_depends_on_config(tmp_path) -> None:
+    config = tmp_path / "ruff.toml"
+    config.write_text("line-length = 100\n")
+    formatter = RuffFormatter(config_file=config, cache=DiskCache(tmp_path))
+    other = RuffFormatter(config_file=None, cache=DiskCache(tmp_path))
+    assert formatter.cache_key("x=1\n") != other.cache_key("x=1\n")
+
+
+def test_schema_cache_get_or_build(tmp_path) -> None:
+    cache = SchemaCache(DiskCache(tmp_path))
+    assert cache.get_or_build("class", "class Foo: ...", lambda: {"type": "object"}) == {"type": "object"}
+    assert cache.get_or_build("class", "class Foo: ...", lambda: pytest.fail("schema rebuilt")) == {"type": "object"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_schema_cache_keys_depend_on_format_version(tmp_path, monkeypatch) -> None:
+    cache = SchemaCache(DiskCache(tmp_path / "cache"))
+    cache.get_or_build("class", "class Foo: ...", lambda: {"type": "object"})
+
+    monkeypatch.setattr(cache_module, "SCHEMA_FORMAT_VERSION", cache_module.SCHEMA_FORMAT_VERSION + 1)
+    assert cache.get_or_build("class", "class Foo: ...", lambda: {"type": "string"}) == {"type": "string"}
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_generate_asyncapi_from_files_with_cache(tmp_path, monkeypatch) -> None:
+    models_file = tmp_path / "models.py"
+    functions_file = tmp_path / "functions.py"
+    shutil.copy(Path("models.py"), models_file)
+    shutil.copy(Path("functions.py"), functions_file)
+    output_file = tmp_path / "asyncapi.yaml"
+
+    generate_asyncapi_from_files(models_file, functions_file, output_file, "TestApp")
+    expected = output_file.read_text()
+    output_file.unlink()
+
+    cache = SchemaCache(DiskCache(tmp_path / "cache"))
+    generate_asyncapi_from_files(models_file, functions_file, output_file, "TestApp", cache)
+    assert output_file.read_text() == expected
+    assert cache.hits == 0
+
+    # unchanged sources: nothing is written
+    with monkeypatch.context() as patch:
+        patch.setattr(asyncapi, "save_yaml_file", lambda *args: pytest.fail("output rewritten"))
+        generate_asyncapi_from_files(models_file, functions_file, output_file, "TestApp", cache)
+
+    # a new format of the generated content: the output is written again
+    with monkeypatch.context() as patch:
+        patch.setattr(cache_module, "SCHEMA_FORMAT_VERSION", cache_module.SCHEMA_FORMAT_VERSION + 1)
+        output_file.write_text("stale")
+        generate_asyncapi_from_files(models_file, functions_file, output_file, "TestApp", cache)
+        assert output_file.read_text() == expected
+
+    # one edited class: only its schema is built again
+    models_file.write_text(models_file.read_text().replace("kind: str", "kind: int"))
+    cache = SchemaCache(DiskCache(tmp_path / "cache"))
+    generate_asyncapi_from_files(models_file, functions_file, output_file, "TestApp", cache)
+    assert cache.misses == 1
+    assert cache.hits > 0
+    assert output_file.read_text() != expected
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from zen_generator.core.ast_utils import generate_code_from_ast
+from zen_generator.core.io import save_python_files
+from zen_generator.generators.common_python import BasePythonGenerator
+from zen_generator.generators.python import Generator
+
+SCHEMAS = "#/components/schemas/"
+
+
+def order_schemas() -> dict[str, Any]:
+    return {
+        "Address": {
+            "type": "object",
+            "required": ["street"],
+            "properties": {"street": {"type": "string"}, "zip": {"type": "string"}},
+        },
+        "Order": {
+            "type": "object",
+            "required": ["order_id", "addresses"],
+            "properties": {
+                "order_id": {"type": "integer"},
+                "addresses": {"type": "array", "items": {"$ref": f"{SCHEMAS}Address"}},
+                "billing": {"$ref": f"{SCHEMAS}Address"},
+                "created": {"type": "string", "format": "date-time"},
+                "contact": {"oneOf": [{"type": "string"}, {"$ref": f"{SCHEMAS}Address"}]},
+            },
+        },
+    }
+
+
+def generate_models(generator: BasePythonGenerator) -> str:
+    generator.codecs = True
+    generator.component_schemas = order_schemas()
+    generator.generate_models_ast()
+    return generate_code_from_ast(generator.models_ast)
+
+
+def test_generate_codecs() -> None:
+    py = generate_models(Generator.dataclass_generator())
+
+    assert py.startswith(
+        "from __future__ import annotations\n\nfrom dataclasses import dataclass\n"
+        "from datetime import datetime\nfrom typing import Any\n"
+    )
+    assert (
+        """
+def address_to_dict(obj: Address) -> dict[str, Any]:
+    return {"street": obj.street, "zip": obj.zip}
+
+
+def address_from_dict(data: dict[str, Any]) -> Address:
+    return Address(street=data["street"], zip=data.get("zip"))
+
+
+def order_to_dict(obj: Order) -> dict[str, Any]:
+    return {
+        "order_id": obj.order_id,
+        "addresses": [address_to_dict(item) for item in obj.addresses],
+        "billing": None if obj.billing is None else address_to_dict(obj.billing),
+        "created": None if obj.created is None else obj.created.isoformat(),
+        "contact": address_to_dict(obj.contact) if isinstance(obj.contact, Address) else obj.contact,
+    }
+"""
+        in py
+    )
+
+
+def test_codecs_round_trip() -> None:
+    namespace: dict[str, Any] = {}
+    exec(generate_models(Generator.dataclass_generator()), namespace)
+    payload = {
+        "order_id": 1,
+        "addresses": [{"street": "Main", "zip": None}, {"street": "Side", "zip": "00100"}],
+        "billing": None,
+        "created": "2025-01-02T03:04:05",
+        "contact": {"street": "Main", "zip": None},
+    }
+
+    order = namespace["order_from_dict"](payload)
+
+    assert order.addresses[1] == namespace["Address"](street="Side", zip="00100")
+    assert order.created == datetime(2025, 1, 2, 3, 4, 5)
+    assert order.contact == namespace["Address"](street="Main")
+    assert namespace["order_to_dict"](order) == payload
+    assert namespace["order_from_dict"]({"order_id": 2, "addresses": [], "contact": "mail"}).contact == "mail"
+
+
+def test_msgspec_codecs_round_trip() -> None:
+    pytest.importorskip("msgspec")
+    namespace: dict[str, Any] = {}
+    exec(generate_models(Generator.msgspec_generator()), namespace)
+    payload = {"order_id": 1, "addresses": [{"street": "Main", "zip": None}]}
+
+    order = namespace["order_from_dict"](payload)
+
+    assert namespace["order_to_dict"](order) == {**payload, "billing": None, "created": None, "contact": None}
+
+
+def test_codecs_in_models_package(tmp_path, monkeypatch) -> None:
+    generator = Generator.dataclass_generator()
+    generator.codecs = True
+    generator.split_models = True
+    generator.component_schemas = order_schemas()
+    generator._generate_models()
+    save_python_files(generator.models_modules(tmp_path / "order_models.py"), generator.formatter)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    import order_models
+
+    try:
+        assert (
+            "from .address import Address, address_from_dict, address_to_dict"
+            in (tmp_path / "order_models" / "order.py").read_text()
+        )
+        order = order_models.order_from_dict({"order_id": 1, "addresses": [{"street": "Main"}]})
+        assert order.addresses == [order_models.Address(street="Main")]
+    finally:
+        for name in [name for name in sys.modules if name.startswith("order_models")]:
+            del sys.modules[name]
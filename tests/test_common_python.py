@@ -1,9 +1,13 @@
-from ast import Assign, ClassDef, Constant, Expr, FunctionDef, ImportFrom
+import importlib
+import sys
+from ast import Assign, ClassDef, Constant, Expr, FunctionDef, ImportFrom, alias
 from typing import Any
 import pytest
 from pathlib import Path
 from zen_generator.core.ast_utils import generate_code_from_ast
-from zen_generator.generators.common_python import BasePythonGenerator
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.core.io import save_python_files
+from zen_generator.generators.common_python import BasePythonGenerator, model_groups, unique_module_name
 
 
 @pytest.fixture
@@ -132,3 +136,110 @@ def test_generate_function_ast_without_logger(generator):
     generator.generate_function_ast("TestApp", logger=False)
 
     assert not any(isinstance(node, Assign) and node.targets[0].id == "logger" for node in generator.functions_ast)
+
+
+def test_regenerate_files_from_asyncapi(generator, asyncapi_file, tmp_path):
+    models_file = tmp_path / "models.py"
+    functions_file = tmp_path / "functions.py"
+    args = (asyncapi_file, models_file, functions_file, "TestApp")
+
+    assert generator.regenerate_files_from_asyncapi(*args) == [models_file, functions_file]
+    assert generator.regenerate_files_from_asyncapi(*args) == []
+
+    asyncapi_file.write_text(asyncapi_file.read_text().replace("type: integer", "type: string"))
+    assert generator.regenerate_files_from_asyncapi(*args) == [models_file]
+    assert "age: str" in models_file.read_text()
+
+    asyncapi_file.write_text(asyncapi_file.read_text().replace("Test API description", "New description"))
+    assert generator.regenerate_files_from_asyncapi(*args) == [functions_file]
+    assert "New description" in functions_file.read_text()
+
+
+def test_generate_models_ast_imports_registered_types(generator):
+    generator.component_schemas = {
+        "Event": {
+            "required": ["at"],
+            "properties": {"at": {"type": "string", "format": "date-time"}, "id": {"type": "string", "format": "uuid"}},
+        }
+    }
+    generator.generate_models_ast()
+    code = generate_code_from_ast(generator.models_ast, RuffFormatter(enabled=False))
+
+    assert "from datetime import datetime" in code
+    assert "from uuid import UUID" in code
+    assert "at: datetime" in code
+    assert "id: UUID | None" in code
+
+
+def test_generate_models_ast_ignores_fields_named_like_types(generator):
+    generator.component_schemas = {
+        "Invoice": {
+            "required": ["date", "Decimal"],
+            "properties": {
+                "date": {"type": "string"},
+                "Decimal": {"type": "string"},
+                "due": {"type": "string", "format": "date"},
+            },
+        }
+    }
+    generator.generate_models_ast()
+    code = generate_code_from_ast(generator.models_ast, RuffFormatter(enabled=False))
+
+    assert "from decimal import Decimal" not in code
+    # `date` is imported for the annotation of `due`, not for the field called `date`
+    assert "from datetime import date" in code
+    generator.component_schemas["Invoice"]["properties"].pop("due")
+    generator.models_ast = []
+    generator.generate_models_ast()
+    assert "from datetime" not in generate_code_from_ast(generator.models_ast, RuffFormatter(enabled=False))
+
+
+def test_unique_module_name():
+    assert unique_module_name("HTTPRequest", set()) == "http_request"
+    assert unique_module_name("UserTaxDeclarationInfo", set()) == "user_tax_declaration_info"
+    assert unique_module_name("Class", set()) == "class_"
+    assert unique_module_name("Foo", {"foo", "foo_2"}) == "foo_3"
+
+
+def test_model_groups():
+    assert model_groups(["A", "Node", "B", "Tree"], [["Node", "Tree"]]) == [["A"], ["Node", "Tree"], ["B"]]
+
+
+@pytest.mark.parametrize("runtime_model_imports", [False, True])
+def test_generate_models_package(tmp_path, monkeypatch, runtime_model_imports):
+    schemas = "#/components/schemas/"
+    generator = BasePythonGenerator(
+        extra_imports=[ImportFrom(module="typing", names=[alias(name="TypedDict")], level=0)],
+        formatter=RuffFormatter(enabled=False),
+        split_models=True,
+        runtime_model_imports=runtime_model_imports,
+    )
+    generator.component_schemas = {
+        "Order": {"base_class": "TypedDict", "properties": {"customer": {"$ref": f"{schemas}Customer"}}},
+        "Customer": {"base_class": "TypedDict", "properties": {"name": {"type": "string"}}},
+        "Node": {"base_class": "TypedDict", "properties": {"tree": {"$ref": f"{schemas}Tree"}}},
+        "Tree": {"base_class": "TypedDict", "properties": {"root": {"$ref": f"{schemas}Node"}}},
+    }
+    generator.generate_models_package_ast()
+    modules = generator.models_modules(tmp_path / "shop_models.py")
+    save_python_files(modules, generator.formatter)
+
+    assert sorted(path.name for path in modules) == ["__init__.py", "customer.py", "node.py", "order.py"]
+    order = (tmp_path / "shop_models" / "order.py").read_text()
+    assert ("if TYPE_CHECKING:" in order) is not runtime_model_imports
+    assert "from .customer import Customer" in order
+    assert "class Tree(TypedDict)" in (tmp_path / "shop_models" / "node.py").read_text()
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = importlib.import_module("shop_models")
+    try:
+        assert "shop_models.order" not in sys.modules
+        assert package.Order.__name__ == "Order"
+        assert "shop_models.order" in sys.modules
+        assert ("shop_models.customer" in sys.modules) is runtime_model_imports
+        assert "Tree" in dir(package)
+        with pytest.raises(AttributeError):
+            package.__getattr__("Missing")
+    finally:
+        for name in [name for name in sys.modules if name.split(".")[0] == "shop_models"]:
+            del sys.modules[name]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from zen_generator.core.docstrings import DocstringParam, DocstringRaises, parse_docstring
+
+GOOGLE = """Get a user.
+
+Args:
+    user_id (int): The id
+        of the user.
+    kinds: The kinds.
+    other (): The legacy (empty) type.
+
+Returns:
+    The user.
+
+Raises:
+    KeyError: If the user doesn't exist.
+"""
+
+NUMPY = """Get a user.
+
+Parameters
+----------
+user_id : int
+    The id
+    of the user.
+kinds, other : str
+    The kinds.
+
+Returns
+-------
+User
+    The user.
+
+Raises
+------
+KeyError
+    If the user doesn't exist.
+"""
+
+SPHINX = """Get a user.
+
+:param int user_id: The id
+    of the user.
+:param kinds: The kinds.
+:type kinds: list[str]
+:returns: The user.
+:rtype: User
+:raises KeyError: If the user doesn't exist.
+"""
+
+
+@pytest.mark.parametrize("docstring, style", [(GOOGLE, "google"), (NUMPY, "numpy"), (SPHINX, "sphinx")])
+def test_parse_docstring(docstring, style) -> None:
+    parsed = parse_docstring(docstring)
+
+    assert parsed.style == style
+    assert parsed.summary == "Get a user."
+    assert parsed.params[0] == DocstringParam("user_id", "int", "The id of the user.")
+    assert parsed.param_descriptions["kinds"] == "The kinds."
+    assert parsed.returns == "The user."
+    assert parsed.raises == (DocstringRaises("KeyError", "If the user doesn't exist."),)
+
+
+def test_parse_docstring_details() -> None:
+    assert parse_docstring(GOOGLE).params[2] == DocstringParam("other", None, "The legacy (empty) type.")
+    assert parse_docstring(NUMPY).params[2] == DocstringParam("other", "str", "The kinds.")
+    assert parse_docstring(NUMPY).returns_type == "User"
+    assert parse_docstring(SPHINX).params[1] == DocstringParam("kinds", "list[str]", "The kinds.")
+    assert parse_docstring("Returns: the user").returns == "the user"
+
+
+def test_parse_docstring_without_sections() -> None:
+    parsed = parse_docstring("Get a user.\n\nThe user is read from the database.")
+
+    assert parsed.style is None
+    assert parsed.description == "Get a user.\n\nThe user is read from the database."
+    assert parsed.params == ()
+    assert parsed.returns is None
+
+
+def test_parse_docstring_is_cached() -> None:
+    assert parse_docstring(GOOGLE) is parse_docstring(GOOGLE)
+
+
+def test_parse_docstring_entries_spanning_lines() -> None:
+    google = "Args:\n    *args: The\n\n        arguments.\n    **kwargs (dict):   The options.  \n  unindented text"
+    assert parse_docstring(google).params == (
+        DocstringParam("args", None, "The arguments."),
+        DocstringParam("kwargs", "dict", "The options. unindented text"),
+    )
+    sphinx = ":param **kwargs: The options.\n:param   : Nothing.\n:paramx: Not a field."
+    assert parse_docstring(sphinx).params == (
+        DocstringParam("kwargs", None, "The options."),
+        DocstringParam("", None, "Nothing. :paramx: Not a field."),
+    )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from zen_generator.core.document import LazyMapping, load_lazy_yaml, load_lazy_yaml_file
+from zen_generator.core.exception import InvalidFile
+from zen_generator.generators.python import Generator
+
+
+@pytest.mark.parametrize("source", ["test.yaml", "async_api_test.yaml", "test_functions.yaml", "test_models.yaml"])
+def test_lazy_document_matches_eager_load(source) -> None:
+    text = Path(source).read_text()
+    document = load_lazy_yaml(text)
+    assert isinstance(document, LazyMapping)
+    assert document.to_dict() == yaml.safe_load(text)
+
+
+def test_lazy_document_builds_only_accessed_sections() -> None:
+    document = load_lazy_yaml_file(Path("test.yaml"))
+    components = document["components"]
+    assert isinstance(components, LazyMapping)
+    assert components.loaded_keys == []
+
+    schemas = components["schemas"]
+    assert isinstance(schemas, dict)
+    assert "TaskAttachment" in schemas
+    assert components.loaded_keys == ["schemas"]
+    assert document.loaded_keys == ["components"]
+
+
+def test_lazy_document_value_types() -> None:
+    text = """
+flow: {a: [1, 2], b: x}
+block: |
+  some
+  text
+sequence:
+- a: 1
+  b: 2
+- c
+nested:
+  deep:
+    value: 1
+  quoted: '1'
+  number: 1
+"""
+    document = load_lazy_yaml(text)
+    assert document.to_dict() == yaml.safe_load(text)
+    assert document["nested"]["deep"] == {"value": 1}
+
+
+def test_lazy_document_with_aliases_is_loaded_eagerly() -> None:
+    document = load_lazy_yaml("a: &anchor {b: 1}\nc: *anchor\n")
+    assert document == {"a": {"b": 1}, "c": {"b": 1}}
+    assert not isinstance(document, LazyMapping)
+
+
+def test_lazy_document_not_a_mapping() -> None:
+    assert load_lazy_yaml("") is None
+    assert load_lazy_yaml("- 1\n- 2\n") == [1, 2]
+
+
+def test_lazy_document_file_not_found() -> None:
+    with pytest.raises(InvalidFile):
+        load_lazy_yaml_file(Path("./fake_path"))
+
+
+def test_generator_loads_only_needed_sections() -> None:
+    generator = Generator.pure_python_generator()
+    generator.load_asyncapi_content(Path("test.yaml"))
+    generator.load_component_schemas()
+    generator.generate_models_ast()
+
+    assert generator.source_content.loaded_keys == ["components"]
+    assert generator.source_content["components"].loaded_keys == ["schemas"]
+
+
+def test_lazy_document_with_byte_order_mark(tmp_path) -> None:
+    text = Path("test.yaml").read_text()
+    source = tmp_path / "bom.yaml"
+    source.write_text("\ufeff" + text, encoding="utf-8")
+
+    assert load_lazy_yaml("\ufeff" + text).to_dict() == yaml.safe_load(text)
+    assert load_lazy_yaml_file(source).to_dict() == yaml.safe_load(text)
+
+
+def test_generate_from_file_with_byte_order_mark(tmp_path) -> None:
+    source = tmp_path / "bom.yaml"
+    source.write_text("\ufeff" + Path("test.yaml").read_text(), encoding="utf-8")
+    generator = Generator.pure_python_generator()
+
+    generator.generate_files_from_asyncapi(source, tmp_path / "models.py", tmp_path / "functions.py", "Fake")
+
+    assert "def get_attachments_from_utd(" in (tmp_path / "functions.py").read_text()
+
+
+def test_lazy_document_invalid_yaml() -> None:
+    with pytest.raises(yaml.YAMLError):
+        load_lazy_yaml("a: [1, 2\n")
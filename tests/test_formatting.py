@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from zen_generator.core.formatting import RuffFormatter, find_ruff_config, format_python_code
+
+RAW_CODE = "import sys\nimport os\ndef foo(x:int,y:str)->None: ...\n"
+
+
+def test_find_ruff_config() -> None:
+    config = find_ruff_config()
+    assert config is not None
+    assert config.name == "pyproject.toml"
+
+
+def test_find_ruff_config_without_config() -> None:
+    assert find_ruff_config(Path("/")) is None
+
+
+def test_format_code() -> None:
+    formatted = RuffFormatter().format_code(RAW_CODE)
+    assert "import os\nimport sys\n" in formatted
+    assert "def foo(x: int, y: str) -> None: ..." in formatted
+    assert formatted == format_python_code(RAW_CODE)
+
+
+def test_format_code_invalid_code() -> None:
+    code = "def foo(:\n"
+    assert RuffFormatter().format_code(code) == code
+
+
+def test_format_code_disabled() -> None:
+    assert RuffFormatter(enabled=False).format_code(RAW_CODE) == RAW_CODE
+
+
+def test_write_files(tmp_path) -> None:
+    formatter = RuffFormatter()
+    first, second = tmp_path / "first.py", tmp_path / "second.py"
+    formatter.write_files({first: RAW_CODE, second: "x=1\n"})
+    assert first.read_text() == formatter.format_code(RAW_CODE)
+    assert second.read_text() == formatter.format_code("x=1\n")
+
+
+def test_write_files_disabled(tmp_path) -> None:
+    destination = tmp_path / "raw.py"
+    RuffFormatter(enabled=False).write_files({destination: RAW_CODE})
+    assert destination.read_text() == RAW_CODE
+
+
+def test_format_sources() -> None:
+    formatter = RuffFormatter(cache=None)
+    first, second, third = Path("first.py"), Path("second.py"), Path("third.py")
+
+    formatted = formatter.format_sources({first: RAW_CODE, second: "x=1\n", third: RAW_CODE})
+
+    assert formatted == {
+        first: formatter.format_code(RAW_CODE),
+        second: formatter.format_code("x=1\n"),
+        third: formatter.format_code(RAW_CODE),
+    }
+    assert not first.exists()
+
+
+def test_format_sources_disabled() -> None:
+    assert RuffFormatter(enabled=False).format_sources({Path("raw.py"): RAW_CODE}) == {Path("raw.py"): RAW_CODE}
@@ -3,11 +3,19 @@ from __future__ import annotations
 from pathlib import Path
 
 import pytest
+import typer
+import yaml
 
-from zen_generator.cli import fastapi, pure_python
+from zen_generator import cli
+from zen_generator.cli import dataclasses, fastapi, fastapi_post, pure_python
 from zen_generator.core.ast_utils import generate_code_from_ast, get_component_schemas
+from zen_generator.core.cache import DiskCache
 from zen_generator.core.exception import InvalidFile
+from zen_generator.core.formatting import RuffFormatter
 from zen_generator.core.io import load_yaml
+from zen_generator.core.refs import UnknownOperation
+from zen_generator.generators.asyncapi import create_async_api_content, generate_asyncapi_from_sources
+from zen_generator.generators.common_python import BasePythonGenerator, body_docstring
 from zen_generator.generators.python import Generator
 
 
@@ -125,6 +133,24 @@ def test_generate_functions_and_model_from_yaml(tmp_path) -> None:
     assert models_file.exists() and functions_file.exists()
 
 
+def test_watch_reports_invalid_documents(tmp_path, monkeypatch, capsys) -> None:
+    source = tmp_path / "asyncapi.yaml"
+    source.write_text(Path("./test.yaml").read_text())
+    models_file, functions_file = tmp_path / "models.py", tmp_path / "functions.py"
+
+    def edit_source(paths, regenerate) -> None:
+        source.write_text(source.read_text().replace("schemas/TaskAttachment'", "schemas/Missing'"))
+        regenerate({source})
+
+    monkeypatch.setattr(cli, "watch_and_regenerate", edit_source)
+    pure_python(source, models_file, functions_file, "Fake", watch=True)
+
+    assert "The reference '#/components/schemas/Missing'" in capsys.readouterr().out
+    with pytest.raises(typer.Abort):
+        pure_python(source, models_file, functions_file, "Fake", watch=True)
+    assert "The reference '#/components/schemas/Missing'" in capsys.readouterr().out
+
+
 ## FASTAPI
 
 
@@ -224,3 +250,279 @@ def test_generate_fastapi_from_yaml(tmp_path) -> None:
     fastapi(source, models_file, functions_file, app_name)
 
     assert models_file.exists() and functions_file.exists()
+
+
+def generate_fastapi_post(orjson: bool = False, async_operations: list[str] | None = None) -> BasePythonGenerator:
+    generator = Generator.fastapi_post_generator(orjson)
+    generator.async_operations = async_operations
+    generator.load_asyncapi_content(Path("./test_functions.yaml"))
+    generator._check_references()
+    generator.generate_models_ast()
+    generator.generate_function_ast("Fake")
+    return generator
+
+
+def test_generate_fastapi_post_endpoints() -> None:
+    generator = generate_fastapi_post(orjson=True, async_operations=["generate_sync_task"])
+    py = generate_code_from_ast(generator.functions_ast)
+
+    aspect_result = """\"\"\"Test API description\"\"\"
+
+from __future__ import annotations
+
+import logging
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from .models import (
+    GenerateIiaccTaskRequest,
+    GenerateIvaSyncTaskRequest,
+    GenerateSyncTaskRequest,
+    GetAttachmentsFromUtdRequest,
+)
+
+app = FastAPI(default_response_class=ORJSONResponse)
+logger = logging.getLogger("Fake")
+
+
+@app.post("/get_attachments_from_utd", response_model=list[TaskAttachment])
+def get_attachments_from_utd(body: GetAttachmentsFromUtdRequest) -> list[TaskAttachment]: ...
+
+
+@app.post("/generate_sync_task", response_model=int | None)
+async def generate_sync_task(body: GenerateSyncTaskRequest) -> int | None: ...
+
+
+@app.post("/generate_iiacc_task", response_model=int | str | TaskAttachment | None)
+def generate_iiacc_task(body: GenerateIiaccTaskRequest) -> int | str | TaskAttachment | None: ...
+
+
+@app.post("/generate_iva_sync_task", response_model=None)
+def generate_iva_sync_task(body: GenerateIvaSyncTaskRequest) -> None: ...
+"""
+    assert py == aspect_result
+
+
+def test_generate_fastapi_post_body_models() -> None:
+    py = generate_code_from_ast(generate_fastapi_post().models_ast)
+
+    assert py.startswith(
+        "from __future__ import annotations\n\nfrom fastapi import FastAPI\nfrom pydantic import BaseModel\n"
+    )
+    assert (
+        """
+class GenerateSyncTaskRequest(BaseModel):
+    utd_info: UserTaxDeclarationInfo
+    sequence: int | None = None
+    skip_create_f24s: bool
+"""
+        in py
+    )
+
+
+def test_fastapi_post_optional_params_default_to_none() -> None:
+    content = create_async_api_content(
+        "Search",
+        {},
+        "Search API",
+        {
+            "search": {
+                "request": {
+                    "description": "Search.\n\nArgs:\n    query (str): the query\n    limit (int): the limit\n\n"
+                    "Returns:\n    the results",
+                    "payload": {
+                        "type": "object",
+                        "required": ["query"],
+                        "properties": {"query": {"type": "string"}, "limit": {"type": "integer"}},
+                    },
+                },
+                "response": {"payload": {"type": "integer"}},
+            }
+        },
+    )
+    generator = Generator.fastapi_post_generator()
+    generator.formatter = RuffFormatter(enabled=False)
+
+    artifacts = generator.generate_artifacts(content, "Search")
+
+    assert "class SearchRequest(BaseModel):\n    query: str\n    limit: int | None = None" in artifacts["models.py"]
+    functions = artifacts["functions.py"]
+    assert "Args:\n    body (SearchRequest): The request payload.\n\nReturns:\n    the results" in functions
+    assert "query (str)" not in functions
+
+
+def test_body_docstring_styles() -> None:
+    numpy = "Search.\n\nParameters\n----------\nquery : str\n    the query\n\nReturns\n-------\nint\n"
+    sphinx = "Search.\n\n:param query: the query\n    continued\n:type query: str\n:returns: things\n"
+
+    assert body_docstring(numpy, "Req") == (
+        "Search.\n\nParameters\n----------\nbody : Req\n    The request payload.\n\nReturns\n-------\nint\n"
+    )
+    assert body_docstring(sphinx, "Req") == "Search.\n\n:param body: The request payload.\n:returns: things\n"
+    assert body_docstring("Search.", "Req") == "Search."
+
+
+def test_fastapi_post_body_model_names_are_unique() -> None:
+    generator = Generator.fastapi_post_generator()
+    generator.load_asyncapi_content(Path("./test_functions.yaml"))
+    generator.component_schemas = {"GenerateSyncTaskRequest": {"type": "object"}}
+
+    assert generator.request_body_names()["generate_sync_task"] == "GenerateSyncTaskRequest2"
+
+
+def test_fastapi_post_unknown_async_operation() -> None:
+    with pytest.raises(UnknownOperation, match="missing"):
+        generate_fastapi_post(async_operations=["missing"])
+
+
+def test_generate_fastapi_post_from_yaml(tmp_path) -> None:
+    models_file = tmp_path / "models.py"
+    functions_file = tmp_path / "functions.py"
+
+    fastapi_post(Path("./test.yaml"), models_file, functions_file, "Fake", split_models=True)
+
+    bodies = (tmp_path / "models" / "request_bodies.py").read_text()
+    assert "from .task_attachment import TaskAttachment" in bodies
+    assert "class GetAttachmentsFromUtdRequest(BaseModel):" in bodies
+    assert '"GetAttachmentsFromUtdRequest": "request_bodies"' in (tmp_path / "models" / "__init__.py").read_text()
+    assert '@app.post("/empty", response_model=None)\ndef empty() -> None:' in functions_file.read_text()
+
+
+## DATACLASSES AND MSGSPEC
+
+
+def generate_models(generator: BasePythonGenerator) -> str:
+    generator.component_schemas = get_component_schemas(load_yaml(Path("./test_models.yaml"))) or {}
+    generator.generate_models_ast()
+    return generate_code_from_ast(generator.models_ast)
+
+
+def test_generate_dataclass_models() -> None:
+    py = generate_models(Generator.dataclass_generator())
+
+    assert py.startswith("from __future__ import annotations\n\nfrom dataclasses import dataclass\n")
+    assert (
+        """
+@dataclass(slots=True, frozen=True, kw_only=True)
+class UserTaxDeclarationInfo:
+    utd_id: int | None = None
+    full_environment: bool
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class Mida4TaskEnvironmentChoices:
+    pass
+"""
+        in py
+    )
+
+    namespace: dict = {}
+    exec(compile(py, "models.py", "exec"), namespace)
+    info = namespace["UserTaxDeclarationInfo"](full_environment=True)
+    assert info.utd_id is None and not hasattr(info, "__dict__")
+    with pytest.raises(AttributeError):
+        info.utd_id = 1
+
+
+def test_generate_msgspec_models() -> None:
+    py = generate_models(Generator.msgspec_generator())
+
+    assert py.startswith("from __future__ import annotations\n\nfrom msgspec import Struct\n")
+    assert (
+        """
+class FooBar(Struct, frozen=True, kw_only=True):
+    env: str | None = None
+    baz: UserTaxDeclarationInfo | list[bool] | int
+    foo: str | object
+"""
+        in py
+    )
+
+
+def test_generate_dataclasses_from_yaml(tmp_path) -> None:
+    models_file = tmp_path / "models.py"
+    functions_file = tmp_path / "functions.py"
+
+    dataclasses(Path("./test.yaml"), models_file, functions_file, "Fake")
+
+    assert "@dataclass(slots=True, frozen=True, kw_only=True)" in models_file.read_text()
+    assert functions_file.exists()
+
+
+def test_generate_artifacts_matches_files(tmp_path) -> None:
+    content = load_yaml(Path("./test.yaml")) or {}
+
+    artifacts = Generator.fastapi_generator().generate_artifacts(content, "Fake")
+    Generator.fastapi_generator().generate_files_from_asyncapi(
+        Path("./test.yaml"), tmp_path / "models.py", tmp_path / "functions.py", "Fake"
+    )
+
+    assert artifacts == {
+        "models.py": (tmp_path / "models.py").read_text(),
+        "functions.py": (tmp_path / "functions.py").read_text(),
+    }
+
+
+def test_generate_artifacts_package(tmp_path, monkeypatch) -> None:
+    content = load_yaml(Path("./test.yaml")) or {}
+    monkeypatch.chdir(tmp_path)
+    generator = Generator.pure_python_generator()
+    generator.split_models = True
+    generator.validators = True
+
+    artifacts = generator.generate_artifacts(content, "Fake", models_module="schemas", functions_module="api")
+
+    assert "schemas/__init__.py" in artifacts and "api.py" in artifacts and "validators.py" in artifacts
+    assert "from .schemas import" in artifacts["api.py"]
+    # nothing is written
+    assert list(tmp_path.iterdir()) == []
+    # the generator can be reused
+    assert generator.generate_artifacts(content, "Fake", models_module="schemas", functions_module="api") == artifacts
+
+
+def test_generate_artifacts_without_disk_cache(tmp_path) -> None:
+    content = load_yaml(Path("./test.yaml")) or {}
+    cache = DiskCache(tmp_path / "cache")
+    generator = Generator.pure_python_generator()
+    generator.formatter = RuffFormatter(cache=cache)
+
+    artifacts = generator.generate_artifacts(content, "Fake")
+
+    assert not cache.directory.exists()
+    assert generator.formatter.cache is cache
+    assert generator.generate_artifacts(content, "Fake", formatter=generator.formatter) == artifacts
+    assert cache.directory.exists()
+
+
+def test_required_formatted_return_round_trip() -> None:
+    functions = '''from datetime import datetime
+from uuid import UUID
+
+
+def get_time(x: int) -> datetime:
+    """Get the time."""
+
+
+def get_id(x: int) -> UUID:
+    """Get the id."""
+
+
+def get_count(x: int) -> int:
+    """Get the count."""
+
+
+def find_time(x: int) -> datetime | None:
+    """Find the time."""
+'''
+    document = generate_asyncapi_from_sources({}, {"functions.py": functions}, "Fake")["asyncapi.yaml"]
+    generator = Generator.pure_python_generator()
+    generator.formatter = RuffFormatter(enabled=False)
+
+    code = generator.generate_artifacts(yaml.safe_load(document), "Fake")["functions.py"]
+
+    assert "def get_time(x: int) -> datetime:" in code
+    assert "def get_id(x: int) -> UUID:" in code
+    assert "def get_count(x: int) -> int:" in code
+    assert "def find_time(x: int) -> datetime | None:" in code
@@ -1,5 +1,16 @@
 from pathlib import Path
-from zen_generator.generators.asyncapi import generate_asyncapi_from_files, create_async_api_content
+
+import pytest
+import shutil
+
+from zen_generator.core import io
+from zen_generator.core.scanning import NameCollision
+from zen_generator.generators.asyncapi import (
+    IncrementalAsyncAPIGenerator,
+    create_async_api_content,
+    generate_asyncapi_from_files,
+    generate_asyncapi_from_sources,
+)
 
 
 def test_create_async_api_content() -> None:
@@ -37,3 +48,44 @@ def test_generate_asyncapi_from_files(tmp_path) -> None:
     assert "TaskAttachment" in content
     assert "UserTaxDeclarationInfo" in content
     assert "Mida4TaskEnvironmentChoices" in content
+
+
+def test_incremental_asyncapi_generator(tmp_path, monkeypatch) -> None:
+    models_file = tmp_path / "models.py"
+    functions_file = tmp_path / "functions.py"
+    shutil.copy("models.py", models_file)
+    shutil.copy("functions.py", functions_file)
+    output_file = tmp_path / "asyncapi.yaml"
+
+    generator = IncrementalAsyncAPIGenerator(models_file, functions_file, output_file, "TestApp")
+    generator.generate()
+    assert "TaskAttachment" in output_file.read_text()
+
+    models_file.write_text(models_file.read_text().replace("TaskAttachment(", "Attachment("))
+    monkeypatch.setattr(generator, "load_functions", lambda: pytest.fail("functions rebuilt"))
+    generator.generate({models_file})
+
+    content = output_file.read_text()
+    assert "Attachment" in content
+    assert "get_attachments_from_utd" in content
+
+
+def test_generate_asyncapi_from_sources(tmp_path, monkeypatch) -> None:
+    output_file = tmp_path / "output.yaml"
+    with monkeypatch.context() as patch:
+        # the file is written by streaming the dump, not from the whole YAML text
+        patch.setattr(io, "dump_yaml", lambda *args: pytest.fail("document dumped in memory"))
+        generate_asyncapi_from_files(Path("models.py"), Path("functions.py"), output_file, "TestApp")
+
+    artifacts = generate_asyncapi_from_sources(
+        {"models.py": Path("models.py").read_text()}, {"functions.py": Path("functions.py").read_text()}, "TestApp"
+    )
+
+    assert artifacts == {"asyncapi.yaml": output_file.read_text()}
+
+
+def test_generate_asyncapi_from_sources_name_collision() -> None:
+    source = "from typing import TypedDict\n\n\nclass User(TypedDict):\n    name: str\n"
+
+    with pytest.raises(NameCollision, match="'User' is defined in both 'a.py' and 'b.py'"):
+        generate_asyncapi_from_sources({"a.py": source, "b.py": source}, {}, "TestApp")
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Mapping
+
+import pytest
+
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.core.hooks import NO_HOOKS, Hook, item, run, stage
+from zen_generator.generators.asyncapi import generate_asyncapi_from_files
+from zen_generator.generators.python import Generator
+
+
+class Recorder(Hook):
+    def __init__(self) -> None:
+        self.events: list[tuple[str, ...]] = []
+
+    def run_start(self, name: str) -> None:
+        self.events.append(("run_start", name))
+
+    def run_end(self, name: str) -> None:
+        self.events.append(("run_end", name))
+
+    def stage_start(self, name: str) -> None:
+        self.events.append(("stage_start", name))
+
+    def stage_end(self, name: str, counts: Mapping[str, int]) -> None:
+        self.events.append(("stage_end", name, *(f"{key}={value}" for key, value in counts.items())))
+
+    def item_start(self, kind: str, name: str) -> None:
+        self.events.append(("item_start", kind, name))
+
+    def item_end(self, kind: str, name: str) -> None:
+        self.events.append(("item_end", kind, name))
+
+
+def test_no_hooks() -> None:
+    def count() -> int:
+        raise AssertionError("counted without hooks")
+
+    assert run([], "app") is NO_HOOKS
+    assert stage([], "load", items=count) is NO_HOOKS
+    assert item((), "schema", "Model") is NO_HOOKS
+    with stage([], "load", items=count):
+        pass
+
+
+def test_events_are_nested() -> None:
+    recorder = Recorder()
+
+    with run([recorder], "app"):
+        with stage([recorder], "ast", items=lambda: 1):
+            with item([recorder], "schema", "Model"):
+                pass
+
+    assert recorder.events == [
+        ("run_start", "app"),
+        ("stage_start", "ast"),
+        ("item_start", "schema", "Model"),
+        ("item_end", "schema", "Model"),
+        ("stage_end", "ast", "items=1"),
+        ("run_end", "app"),
+    ]
+
+
+def test_hooks_end_in_reverse_order() -> None:
+    order: list[str] = []
+
+    class Ordered(Hook):
+        def __init__(self, label: str) -> None:
+            self.label = label
+
+        def stage_start(self, name: str) -> None:
+            order.append(f"start {self.label}")
+
+        def stage_end(self, name: str, counts: Mapping[str, int]) -> None:
+            order.append(f"end {self.label}")
+
+    with stage([Ordered("a"), Ordered("b")], "load"):
+        pass
+
+    assert order == ["start a", "start b", "end b", "end a"]
+
+
+def test_stage_that_raises_ends_without_counts() -> None:
+    recorder = Recorder()
+
+    with pytest.raises(ValueError):
+        with stage([recorder], "load", items=lambda: undefined):  # type: ignore[name-defined]  # noqa: F821
+            raise ValueError
+
+    assert recorder.events == [("stage_start", "load"), ("stage_end", "load")]
+
+
+def test_counts_are_computed_once() -> None:
+    calls: list[int] = []
+
+    def count() -> int:
+        calls.append(1)
+        return 3
+
+    with stage([Recorder(), Recorder()], "load", items=count):
+        pass
+
+    assert len(calls) == 1
+
+
+def test_generate_python_events(tmp_path) -> None:
+    recorder = Recorder()
+    generator = Generator.pure_python_generator()
+    generator.formatter = RuffFormatter(enabled=False)
+    generator.hooks = [recorder]
+
+    generator.generate_files_from_asyncapi(
+        Path("./test.yaml"), tmp_path / "models.py", tmp_path / "functions.py", "Fake", False
+    )
+
+    assert recorder.events[0] == ("run_start", "Fake") and recorder.events[-1] == ("run_end", "Fake")
+    items = [event[1:] for event in recorder.events if event[0] == "item_end"]
+    assert ("schema", "Mida4TaskEnvironmentChoices") in items
+    assert [name for kind, name in items if kind == "operation"] == generator.selected_operations()
+    # the items are emitted in the "ast" stage
+    start, end = recorder.events.index(("stage_start", "ast")), recorder.events.index(("item_end", *items[-1]))
+    assert all(event[0] != "stage_end" for event in recorder.events[start:end])
+
+
+def test_generate_asyncapi_events(tmp_path) -> None:
+    recorder = Recorder()
+
+    generate_asyncapi_from_files(
+        Path("models.py"), Path("functions.py"), tmp_path / "output.yaml", "TestApp", hooks=[recorder]
+    )
+
+    stages = [event[1] for event in recorder.events if event[0] == "stage_end"]
+    assert stages == ["load", "scan", "document", "write"]
+    operations = [event[2] for event in recorder.events if event[:2] == ("item_end", "operation")]
+    assert "get_attachments_from_utd" in operations
+    assert any(event[:2] == ("item_end", "schema") for event in recorder.events)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+from ast import parse
+from pathlib import Path
+
+from zen_generator.cli import asyncapi_documentation, pure_python
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.core.hooks import stage
+from zen_generator.core.profiling import ChromeTrace, Profiler, count_lines, count_nodes
+from zen_generator.generators.asyncapi import generate_asyncapi_from_files
+from zen_generator.generators.python import Generator
+
+
+def test_profiler_measures_stages_in_order() -> None:
+    profiler = Profiler()
+    items: list[int] = []
+
+    with stage([profiler], "fill", items=lambda: len(items)):
+        items.extend(range(1000))
+    with stage([profiler], "empty"):
+        pass
+
+    fill, empty = profiler.stages
+    assert fill.name == "fill" and empty.name == "empty"
+    # the counts are computed when the stage ends
+    assert fill.counts == {"items": 1000}
+    assert fill.wall_time > 0 and fill.memory_peak > 0
+    assert empty.counts == {}
+
+
+def test_profiler_without_memory_tracing() -> None:
+    profiler = Profiler(trace_memory=False)
+
+    with stage([profiler], "fill"):
+        _ = list(range(1000))
+
+    assert profiler.stages[0].memory_peak == 0
+
+
+def test_profiler_to_dict() -> None:
+    profiler = Profiler(trace_memory=False)
+    with stage([profiler], "first"):
+        pass
+    with stage([profiler], "second"):
+        pass
+
+    result = profiler.to_dict()
+
+    assert [stage["name"] for stage in result["stages"]] == ["first", "second"]
+    assert result["total"]["wall_time"] == sum(profile.wall_time for profile in profiler.stages)
+    json.dumps(result)
+
+
+def test_profiler_nested_stages() -> None:
+    profiler = Profiler()
+
+    with stage([profiler], "outer"):
+        with stage([profiler], "inner"):
+            _ = list(range(1000))
+
+    inner, outer = profiler.stages
+    assert inner.name == "inner" and outer.name == "outer"
+    # only the outermost stage traces the memory
+    assert inner.memory_peak == 0 and outer.memory_peak > 0
+    assert outer.wall_time >= inner.wall_time
+
+
+def test_count_nodes_and_lines() -> None:
+    tree = parse("a = 1\nb = a")
+
+    assert count_nodes([tree.body, []]) == 9
+    assert count_lines(["a = 1\n", "b = 2\nc = 3\n"]) == 3
+
+
+def test_generate_python_stages(tmp_path) -> None:
+    generator = Generator.pure_python_generator()
+    generator.formatter = RuffFormatter(enabled=False)
+    profiler = Profiler(trace_memory=False)
+    generator.hooks = [profiler]
+
+    generator.generate_files_from_asyncapi(
+        Path("./test.yaml"), tmp_path / "models.py", tmp_path / "functions.py", "Fake", False
+    )
+
+    stages = {profile.name: profile for profile in profiler.stages}
+    assert list(stages) == ["load", "schemas", "ast", "unparse", "write", "format"]
+    assert stages["ast"].counts["modules"] == 2
+    assert stages["unparse"].counts["lines"] > 0
+    assert stages["write"].counts == {"files": 2, "cached": 0}
+
+
+def test_generate_asyncapi_stages(tmp_path) -> None:
+    profiler = Profiler(trace_memory=False)
+
+    generate_asyncapi_from_files(
+        Path("models.py"), Path("functions.py"), tmp_path / "output.yaml", "TestApp", hooks=[profiler]
+    )
+
+    stages = {profile.name: profile for profile in profiler.stages}
+    assert list(stages) == ["load", "scan", "document", "write"]
+    assert stages["load"].counts["modules"] == 2
+    assert stages["document"].counts["operations"] > 0
+    assert stages["write"].counts["bytes"] == (tmp_path / "output.yaml").stat().st_size
+
+
+def test_cli_profile_file(tmp_path, capsys) -> None:
+    profile_file = tmp_path / "profile.json"
+
+    pure_python(
+        Path("./test.yaml"), tmp_path / "models.py", tmp_path / "functions.py", "Fake", profile_file=profile_file
+    )
+
+    assert "Profile" in capsys.readouterr().out
+    result = json.loads(profile_file.read_text())
+    assert [stage["name"] for stage in result["stages"]][:3] == ["load", "schemas", "ast"]
+
+
+def test_cli_asyncapi_profile_file(tmp_path) -> None:
+    profile_file = tmp_path / "profile.json"
+
+    asyncapi_documentation(
+        [Path("models.py")], [Path("functions.py")], tmp_path / "output.yaml", "TestApp", profile_file=profile_file
+    )
+
+    result = json.loads(profile_file.read_text())
+    assert [stage["name"] for stage in result["stages"]] == ["load", "scan", "document", "write"]
+
+
+def test_chrome_trace(tmp_path) -> None:
+    trace = ChromeTrace(tmp_path / "trace.json")
+    generator = Generator.pure_python_generator()
+    generator.formatter = RuffFormatter(enabled=False)
+    generator.hooks = [trace]
+
+    generator.generate_files_from_asyncapi(
+        Path("./test.yaml"), tmp_path / "models.py", tmp_path / "functions.py", "Fake", False
+    )
+
+    events = json.loads(trace.path.read_text())["traceEvents"]
+    assert (events[0]["name"], events[0]["ph"]) == ("Fake", "B")
+    assert (events[-1]["name"], events[-1]["ph"]) == ("Fake", "E")
+    assert [event["ts"] for event in events] == sorted(event["ts"] for event in events)
+    ends = {event["name"]: event for event in events if event["ph"] == "E"}
+    assert ends["schemas"]["args"] == {"schemas": 4, "operations": 5}
+    assert {event["cat"] for event in events} == {"run", "stage", "schema", "operation"}
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from zen_generator.core.ast_utils import generate_code_from_ast
+from zen_generator.core.document import load_lazy_yaml_file
+from zen_generator.core.refs import DanglingReference, OperationMessages, UnknownOperation, build_ref_graph
+from zen_generator.generators.common_python import BasePythonGenerator
+
+SCHEMAS = "#/components/schemas/"
+
+
+def schema_document() -> dict:
+    return {
+        "components": {
+            "schemas": {
+                "Order": {"properties": {"customer": {"$ref": f"{SCHEMAS}Customer"}}},
+                "Customer": {"properties": {"addresses": {"items": {"$ref": f"{SCHEMAS}Address"}}}},
+                "Address": {"properties": {"street": {"type": "string"}}},
+                "Node": {"properties": {"parent": {"oneOf": [{"$ref": f"{SCHEMAS}Tree"}, {"type": "null"}]}}},
+                "Tree": {"properties": {"root": {"$ref": f"{SCHEMAS}Node"}}},
+                "Loop": {"properties": {"next": {"$ref": f"{SCHEMAS}Loop"}}},
+            }
+        }
+    }
+
+
+def test_schema_order_follows_references() -> None:
+    graph = build_ref_graph(schema_document())
+
+    assert graph.schema_dependencies["Order"] == ["Customer"]
+    assert graph.schema_order() == ["Address", "Customer", "Order", "Node", "Tree", "Loop"]
+    assert graph.cycles == [["Node", "Tree"], ["Loop"]]
+
+
+def test_schema_order_keeps_document_order() -> None:
+    document = schema_document()
+    del document["components"]["schemas"]["Order"]
+    document["components"]["schemas"] = {"Z": {}, **document["components"]["schemas"], "A": {}}
+
+    assert build_ref_graph(document).schema_order() == ["Z", "Address", "Customer", "Node", "Tree", "Loop", "A"]
+
+
+def test_dangling_references() -> None:
+    document = schema_document()
+    document["components"]["schemas"]["Order"]["properties"]["items"] = {"$ref": f"{SCHEMAS}Item"}
+    document["components"]["operations"] = {"get": {"messages": [{"$ref": "#/channels/get/messages/request"}]}}
+    document["components"]["schemas"]["Address"]["properties"]["zip"] = {"$ref": "common.yaml#/Zip"}
+    graph = build_ref_graph(document)
+
+    assert graph.dangling == [(f"{SCHEMAS}Order/properties/items", f"{SCHEMAS}Item")]
+    assert graph.external == [
+        ("#/components/operations/get/messages/0", "#/channels/get/messages/request"),
+        (f"{SCHEMAS}Address/properties/zip", "common.yaml#/Zip"),
+    ]
+    assert graph.schema_dependencies["Order"] == ["Customer"]
+    with pytest.raises(DanglingReference) as exc:
+        graph.check()
+    assert exc.value.ref == f"{SCHEMAS}Item"
+    with pytest.raises(DanglingReference):
+        graph.resolve(f"{SCHEMAS}Item")
+
+
+def test_operation_messages_are_resolved_through_the_channels() -> None:
+    graph = build_ref_graph(load_lazy_yaml_file(Path("test.yaml")))
+
+    assert graph.operations["empty"] == OperationMessages(
+        "#/components/messages/empty_request", "#/components/messages/empty_response"
+    )
+    assert graph.message("empty", "request") is graph.resolve("#/channels/empty/messages/request")
+    assert graph.target("#/channels/empty/messages/response") == "#/components/messages/empty_response"
+    assert graph.message("missing", "request") == {}
+    graph.check()
+
+
+def test_operation_messages_with_any_name() -> None:
+    document = {
+        "channels": {"orders": {"messages": {"created": {"$ref": "#/components/messages/OrderCreated"}}}},
+        "components": {
+            "messages": {
+                "OrderCreated": {"payload": {"type": "object", "properties": {"order_id": {"type": "integer"}}}},
+                "place_order_request": {"payload": {"type": "object", "properties": {"wrong": {"type": "string"}}}},
+            },
+            "operations": {
+                "place_order": {"messages": [{"$ref": "#/channels/orders/messages/created"}], "reply": None},
+            },
+        },
+    }
+    generator = BasePythonGenerator()
+    generator.source_content = document
+    generator.generate_function_ast("Shop", logger=False)
+
+    assert "def place_order(order_id: int | None) -> None: ..." in generate_code_from_ast(generator.functions_ast)
+
+
+def test_models_are_generated_in_dependency_order() -> None:
+    generator = BasePythonGenerator()
+    generator.component_schemas = schema_document()["components"]["schemas"]
+    generator.generate_models_ast()
+
+    assert [node.name for node in generator.models_ast] == ["Address", "Customer", "Order", "Node", "Tree", "Loop"]
+
+
+def test_generator_rejects_dangling_references(tmp_path) -> None:
+    source = tmp_path / "asyncapi.yaml"
+    ref = f"{SCHEMAS}Item"
+    source.write_text(
+        f"components:\n  schemas:\n    Order:\n      properties:\n        item:\n          $ref: '{ref}'\n"
+    )
+    generator = BasePythonGenerator()
+
+    with pytest.raises(DanglingReference):
+        generator.generate_files_from_asyncapi(source, tmp_path / "models.py", tmp_path / "functions.py", "Shop")
+
+
+def shop_document() -> dict:
+    def message(payload: dict) -> dict:
+        return {"payload": payload}
+
+    return {
+        "components": {
+            "schemas": {
+                "Address": {"properties": {"street": {"type": "string"}}},
+                "Customer": {"properties": {"address": {"$ref": f"{SCHEMAS}Address"}}},
+                "Order": {"properties": {"customer": {"$ref": f"{SCHEMAS}Customer"}}},
+                "Invoice": {"properties": {"total": {"type": "integer"}}},
+                "Unused": {"properties": {"broken": {"$ref": f"{SCHEMAS}Missing"}}},
+            },
+            "messages": {
+                "get_order_request": message({"properties": {"order_id": {"type": "integer"}}}),
+                "get_order_response": message({"$ref": f"{SCHEMAS}Order"}),
+                "get_invoice_request": message({"properties": {"order": {"$ref": f"{SCHEMAS}Order"}}}),
+                "get_invoice_response": message({"$ref": f"{SCHEMAS}Invoice"}),
+                "ping_request": message({"properties": {}}),
+                "ping_response": message({"type": "string"}),
+            },
+            "tags": {"billing": {"name": "billing"}},
+            "operations": {
+                "get_order": {"tags": [{"name": "orders"}]},
+                "get_invoice": {"tags": [{"name": "orders"}, {"$ref": "#/components/tags/billing"}]},
+                "ping": {},
+            },
+        }
+    }
+
+
+def test_select_operations() -> None:
+    graph = build_ref_graph(shop_document())
+
+    assert graph.operation_tags("get_invoice") == ["orders", "billing"]
+    assert graph.select_operations(["ping"], ["billing"]) == ["get_invoice", "ping"]
+    assert graph.select_operations(tags=["orders"]) == ["get_order", "get_invoice"]
+    assert graph.select_operations() == []
+    with pytest.raises(UnknownOperation):
+        graph.select_operations(["missing"])
+
+
+def test_reachable_schemas() -> None:
+    graph = build_ref_graph(shop_document())
+
+    assert graph.reachable_schemas(["get_order"]) == ["Address", "Customer", "Order"]
+    assert graph.reachable_schemas(["get_invoice"]) == ["Address", "Customer", "Order", "Invoice"]
+    assert graph.reachable_schemas(["ping"]) == []
+    graph.check(["get_order", "get_invoice"])
+    with pytest.raises(DanglingReference):
+        graph.check()
+
+
+def test_generator_emits_only_the_selected_operations() -> None:
+    generator = BasePythonGenerator(tags=["billing"])
+    generator.source_content = shop_document()
+    generator.load_component_schemas()
+    generator._check_references()
+    generator.generate_models_ast()
+    generator.generate_function_ast("Shop", logger=False)
+
+    assert [node.name for node in generator.models_ast] == ["Address", "Customer", "Order", "Invoice"]
+    functions = generate_code_from_ast(generator.functions_ast)
+    assert "from .models import Address, Customer, Invoice, Order" in functions
+    assert "def get_invoice(order: Order | None) -> Invoice | None: ..." in functions
+    assert "def get_order" not in functions and "def ping" not in functions
+
+
+def test_generator_loads_only_the_selected_schemas(tmp_path) -> None:
+    source = tmp_path / "asyncapi.yaml"
+    source.write_text(yaml.safe_dump(shop_document()))
+    generator = BasePythonGenerator(operations=["get_order"])
+    generator.load_asyncapi_content(source)
+    generator.load_component_schemas()
+    generator._check_references()
+    generator.generate_models_ast()
+
+    components = generator.source_content["components"]
+    assert sorted(components["schemas"].loaded_keys) == ["Address", "Customer", "Order"]
+    assert sorted(components["messages"].loaded_keys) == ["get_order_request", "get_order_response"]
@@ -0,0 +1,169 @@
+"""Check that the stages of the generation scale linearly with the size of their input.
+
+Every stage runs at two sizes, 10x apart, and the growth exponent `k` of `time ~ size**k` is
+estimated from the best of several runs at each size. A linear stage gives `k` close to 1, a
+quadratic one close to 2.
+
+The wall-clock checks of the stages are flaky on a busy machine, so they only run when the
+`ZEN_GENERATOR_SCALING_TESTS` environment variable is set; the check of `growth_exponent` itself
+always runs.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import timeit
+from ast import parse
+from typing import Any, Callable
+
+import pytest
+
+from zen_generator.core.ast_utils import (
+    generate_bin_op,
+    generate_component_schemas,
+    parse_type_annotation,
+    type_to_ast_node,
+)
+from zen_generator.core.parsing import function_content_reader
+from zen_generator.core.refs import build_ref_graph
+from zen_generator.core.type_system import Primitive, Union
+from zen_generator.generators.asyncapi import create_async_api_content
+from zen_generator.generators.common_python import type_imports
+from zen_generator.generators.python import Generator
+
+MAX_EXPONENT = 1.4
+SCALE = 10
+SCALING_TESTS_ENV = "ZEN_GENERATOR_SCALING_TESTS"
+
+
+def growth_exponent(setup: Callable[[int], Callable[[], Any]], size: int, repeat: int = 5) -> float:
+    """Return the growth exponent of the function built by `setup` between `size` and `SCALE * size`."""
+    timings = []
+    for n in (size, SCALE * size):
+        func = setup(n)
+        timings.append(min(timeit.repeat(func, number=1, repeat=repeat)))
+    return math.log(timings[1] / timings[0], SCALE)
+
+
+def union_annotation(width: int) -> Callable[[], Any]:
+    annotation = parse(" | ".join(f"T{index}" for index in range(width)), mode="eval").body
+    return lambda: parse_type_annotation(annotation)
+
+
+def bin_op(width: int) -> Callable[[], Any]:
+    values = [f"T{index}" for index in range(width)]
+    return lambda: generate_bin_op(values)
+
+
+def schema(index: int) -> dict[str, Any]:
+    properties: dict[str, Any] = {"name": {"type": "string"}, "tags": {"type": "array", "items": {"type": "string"}}}
+    if index:
+        properties["parent"] = {"$ref": f"#/components/schemas/Model{index - 1}"}
+    return {"type": "object", "required": ["name"], "properties": properties}
+
+
+def spec(n_schemas: int, n_operations: int) -> dict[str, Any]:
+    functions = {
+        f"operation_{index}": {
+            "request": {
+                "payload": {
+                    "type": "object",
+                    "required": ["model"],
+                    "properties": {"model": {"$ref": f"#/components/schemas/Model{index % n_schemas}"}},
+                }
+            },
+            "response": {"payload": {"type": "integer"}},
+        }
+        for index in range(n_operations)
+    }
+    schemas = {f"Model{index}": schema(index) for index in range(n_schemas)}
+    return create_async_api_content("Scaling", schemas, "Scaling API", functions)
+
+
+def generate_models(n: int) -> Callable[[], Any]:
+    content = spec(n, 1)
+
+    def run() -> None:
+        generator = Generator.pure_python_generator()
+        generator.source_content = content
+        generator.load_component_schemas()
+        generator.generate_models_ast()
+
+    return run
+
+
+def generate_functions(n: int) -> Callable[[], Any]:
+    content = spec(10, n)
+
+    def run() -> None:
+        # the FastAPI routes have a decorator per function
+        generator = Generator.fastapi_post_generator()
+        generator.source_content = content
+        generator.load_component_schemas()
+        generator.generate_function_ast("Scaling")
+
+    return run
+
+
+def walk_imports(n: int) -> Callable[[], Any]:
+    tree = parse(
+        "\n".join(f"def f{index}(a: int, b: list[str]) -> datetime:\n    return g(a, b)\n" for index in range(n))
+    )
+    return lambda: type_imports(tree.body)
+
+
+def schema_order(n: int) -> Callable[[], Any]:
+    content = spec(n, 1)
+    return lambda: build_ref_graph(content, content["components"]["schemas"]).schema_order()
+
+
+def read_models(n: int) -> Callable[[], Any]:
+    source = "\n".join(
+        f"class Model{index}(TypedDict):\n    name: str\n    tags: list[str] | None\n" for index in range(n)
+    )
+    tree = parse(source)
+    return lambda: generate_component_schemas(tree, source)
+
+
+def read_functions(n: int) -> Callable[[], Any]:
+    source = "\n".join(
+        f'def f{index}(a: int, b: Model | None) -> str:\n    """Do it.\n\n    Args:\n        a: a value\n    """\n'
+        for index in range(n)
+    )
+    tree = parse(source)
+    return lambda: function_content_reader(tree, source)
+
+
+def union_node(width: int) -> Callable[[], Any]:
+    node = Union(tuple(Primitive(f"T{index}") for index in range(width)))
+    return lambda: type_to_ast_node(node)
+
+
+@pytest.mark.skipif(not os.environ.get(SCALING_TESTS_ENV), reason=f"set {SCALING_TESTS_ENV}=1 to run")
+@pytest.mark.parametrize(
+    ("setup", "size"),
+    [
+        pytest.param(bin_op, 100, id="generate_bin_op"),
+        pytest.param(union_node, 100, id="type_to_ast_node"),
+        pytest.param(union_annotation, 100, id="parse_type_annotation"),
+        pytest.param(walk_imports, 50, id="type_imports"),
+        pytest.param(generate_models, 20, id="generate_models_ast"),
+        pytest.param(generate_functions, 20, id="generate_function_ast"),
+        pytest.param(schema_order, 50, id="schema_order"),
+        pytest.param(read_models, 20, id="generate_component_schemas"),
+        pytest.param(read_functions, 20, id="function_content_reader"),
+    ],
+)
+def test_stage_scales_linearly(setup: Callable[[int], Callable[[], Any]], size: int) -> None:
+    exponent = growth_exponent(setup, size)
+
+    assert exponent < MAX_EXPONENT, f"time grows as size**{exponent:.2f}"
+
+
+def test_growth_exponent_detects_quadratic_stages() -> None:
+    def quadratic(n: int) -> Callable[[], Any]:
+        values = list(range(n))
+        return lambda: [value for value in values for _ in values]
+
+    assert growth_exponent(quadratic, 100) > MAX_EXPONENT
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from zen_generator.core.exception import InvalidFile
+from zen_generator.core.scanning import (
+    ModuleScan,
+    NameCollision,
+    expand_sources,
+    merge_scans,
+    read_modules,
+    scan_modules,
+)
+from zen_generator.generators.asyncapi import generate_asyncapi_from_files
+
+
+@pytest.fixture
+def package(tmp_path) -> Path:
+    for name in ("users", "orders"):
+        (tmp_path / "models").mkdir(exist_ok=True)
+        (tmp_path / "models" / f"{name}.py").write_text(f"class {name.title()}(BaseModel):\n    id: int\n")
+        (tmp_path / "handlers" / name).mkdir(parents=True)
+        (tmp_path / "handlers" / name / "api.py").write_text(
+            f'"""The {name} API."""\n\n\ndef get_{name}(id: int) -> {name.title()}:\n    """Get {name}."""\n'
+        )
+    return tmp_path
+
+
+def test_expand_sources(package) -> None:
+    users = package / "models" / "users.py"
+
+    assert expand_sources([package / "models"]) == [package / "models" / "orders.py", users]
+    assert expand_sources([users, package / "models"]) == [users, package / "models" / "orders.py"]
+    assert expand_sources([f"{package}/handlers/**/api.py"]) == [
+        package / "handlers" / "orders" / "api.py",
+        package / "handlers" / "users" / "api.py",
+    ]
+    with pytest.raises(InvalidFile):
+        expand_sources([package / "missing.py"])
+    with pytest.raises(InvalidFile):
+        expand_sources([f"{package}/*.txt"])
+
+
+def test_scan_modules_in_parallel(package) -> None:
+    modules = read_modules(expand_sources([package / "models"]), "models")
+    modules += read_modules(expand_sources([package / "handlers"]), "functions")
+
+    assert scan_modules(modules, jobs=2) == scan_modules(modules, jobs=1)
+
+
+def test_merge_scans(package) -> None:
+    schemas, description, functions = merge_scans(
+        [
+            ModuleScan(Path("users.py"), schemas={"User": {}}),
+            ModuleScan(Path("api.py"), description="Users.", functions={"get_user": {}}),
+            ModuleScan(Path("orders.py"), description="Orders.", functions={"get_order": {}}),
+        ]
+    )
+
+    assert list(schemas) == ["User"]
+    assert description == "Users.\n\nOrders."
+    assert list(functions) == ["get_user", "get_order"]
+
+
+def test_merge_scans_name_collision() -> None:
+    with pytest.raises(NameCollision, match="'User' is defined in both 'a.py' and 'b.py'"):
+        merge_scans([ModuleScan(Path("a.py"), schemas={"User": {}}), ModuleScan(Path("b.py"), schemas={"User": {}})])
+
+
+def test_generate_asyncapi_from_directories(package) -> None:
+    output_file = package / "asyncapi.yaml"
+
+    generate_asyncapi_from_files(package / "models", package / "handlers", output_file, "TestApp", jobs=2)
+
+    content = yaml.safe_load(output_file.read_text())
+    assert list(content["components"]["schemas"]) == ["Orders", "Users"]
+    assert list(content["operations"]) == ["get_orders", "get_users"]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+
+import pytest
+
+from zen_generator.core.ast_utils import generate_component_schemas
+from zen_generator.core.parsing import function_content_reader
+from zen_generator.core.signatures import parse_signatures, scan_signatures
+from zen_generator.generators.asyncapi import generate_asyncapi_from_files
+
+TRICKY_SOURCE = '''"""The API."""
+
+from __future__ import annotations
+
+QUERY = """
+def not_a_function(): ...
+class NotAClass: ...
+"""
+VALUES = [
+1,
+]
+TOTAL = 1 + \\
+2
+
+
+class User(TypedDict):
+    """A user."""
+
+    name: str
+    tags: list[
+        str
+    ] | None
+    count = 0
+
+    def display(self) -> str:
+        x: int = 1
+        return self.name
+
+
+@router.get("/users", tags=["a:b"])
+async def get_user(user_id: int, fields: dict[str, int] | None = None) -> User:  # the user
+    # comment before the docstring
+    """Get a user.
+
+Args:
+    user_id: The id.
+"""
+    text = """
+def hidden(): ...
+"""
+    return User(name=text)
+
+
+def no_docstring(a: int) -> int:
+    return a
+'''
+
+
+def _schemas(tree: ast.Module, source: str) -> tuple:
+    return generate_component_schemas(tree, source), function_content_reader(tree, source)
+
+
+@pytest.mark.parametrize("source_file", ["functions.py", "models.py"])
+def test_parse_signatures_builds_the_same_schemas(source_file) -> None:
+    source = Path(source_file).read_text()
+
+    assert _schemas(*parse_signatures(source)) == _schemas(ast.parse(source), source)
+
+
+def test_parse_signatures_tricky_source() -> None:
+    tree, skeleton = parse_signatures(TRICKY_SOURCE)
+
+    assert _schemas(tree, skeleton) == _schemas(ast.parse(TRICKY_SOURCE), TRICKY_SOURCE)
+    assert "hidden" not in skeleton
+    assert "return" not in skeleton
+    assert "count = 0" not in skeleton
+    assert [node.name for node in tree.body if not isinstance(node, ast.Expr)] == [
+        "User",
+        "get_user",
+        "no_docstring",
+    ]
+
+
+def test_scan_signatures_keeps_headers_and_docstrings() -> None:
+    skeleton = scan_signatures('def f(a: int) -> int:\n    """Doc."""\n    return a\n')
+
+    assert skeleton == 'def f(a: int) -> int:\n    """Doc."""\n    ...\n'
+
+
+def test_parse_signatures_statements_separated_by_semicolons() -> None:
+    source = 'class C(TypedDict):\n    """A node."""; x = 5; y: Optional["C"] = None\n    z: int; w = 1\n'
+    tree, skeleton = parse_signatures(source)
+
+    assert _schemas(tree, skeleton) == _schemas(ast.parse(source), source)
+    assert skeleton == 'class C(TypedDict):\n    """A node."""\n    y: Optional["C"] = None\n    z: int\n    ...\n'
+
+
+def test_parse_signatures_reports_syntax_errors() -> None:
+    source = "def f(:\n    pass\n"
+
+    with pytest.raises(SyntaxError):
+        parse_signatures(source)
+
+
+def test_generate_asyncapi_fast(tmp_path) -> None:
+    generate_asyncapi_from_files(Path("models.py"), Path("functions.py"), tmp_path / "full.yaml", "TestApp")
+    generate_asyncapi_from_files(Path("models.py"), Path("functions.py"), tmp_path / "fast.yaml", "TestApp", fast=True)
+
+    assert (tmp_path / "fast.yaml").read_text() == (tmp_path / "full.yaml").read_text()
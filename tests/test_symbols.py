@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import ast
+
+from zen_generator.core.ast_utils import generate_component_schemas
+from zen_generator.core.parsing import function_content_reader
+from zen_generator.core.symbols import build_module_index
+
+SOURCE = '''\
+"""Handlers."""
+
+
+class User(TypedDict):
+    name: str
+
+    class Meta:
+        label = "é"
+
+    def display(self) -> str:
+        return self.name
+
+
+@router
+def get_user(user_id: int) -> User:
+    """Get a user."""
+
+    def helper() -> None:
+        class Local(TypedDict):
+            value: int
+
+    return User(name="")
+
+
+async def delete_user(user_id: int) -> None:
+    """Delete a user."""
+'''
+
+
+def test_build_module_index() -> None:
+    index = build_module_index(ast.parse(SOURCE), SOURCE)
+
+    assert list(index.functions) == ["get_user", "delete_user"]
+    assert list(index.classes) == ["User", "User.Meta"]
+    assert list(index.methods) == ["User.display"]
+    assert [symbol.name for symbol in index.top_level_classes] == ["User"]
+    assert (index.functions["get_user"].start, index.functions["get_user"].end) == (14, 22)
+    assert index.symbol_at(8).name == "User.Meta"
+    assert index.symbol_at(19).name == "get_user"
+    assert index.symbol_at(2) is None
+
+
+def test_module_index_segment() -> None:
+    tree = ast.parse(SOURCE)
+    index = build_module_index(tree, SOURCE)
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.stmt, ast.expr)):
+            assert index.segment(node) == ast.get_source_segment(SOURCE, node)
+    assert build_module_index(tree).segment(tree.body[0]) is None
+
+
+def test_readers_skip_nested_definitions() -> None:
+    tree = ast.parse(SOURCE)
+
+    _, functions = function_content_reader(tree, SOURCE)
+    schemas = generate_component_schemas(tree, SOURCE)
+
+    assert list(functions) == ["get_user", "delete_user"]
+    assert list(schemas) == ["User"]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import ast
+import pickle
+
+import pytest
+
+from zen_generator.core.ast_utils import (
+    convert_annotations_to_asyncapi_schemas,
+    parse_type_annotation,
+    type_to_ast_node,
+)
+from zen_generator.core.exception import InvalidFile
+from zen_generator.core.type_system import (
+    DictOf,
+    ListOf,
+    NoneType,
+    Primitive,
+    Ref,
+    TypeMapping,
+    TypeRegistry,
+    Union,
+    named_type,
+    type_from_schema,
+    type_to_schema,
+)
+
+
+@pytest.mark.parametrize(
+    "annotation, expected",
+    [
+        ("int", Primitive("int")),
+        ("TaskAttachment", Ref("TaskAttachment")),
+        ("list[str]", ListOf(Primitive("str"))),
+        ("dict[str, User]", DictOf(Primitive("str"), Ref("User"))),
+        ("int | str | None", Union((Primitive("int"), Primitive("str"), NoneType()))),
+        ("None", NoneType()),
+        ("'User'", None),
+    ],
+)
+def test_parse_type_annotation(annotation, expected) -> None:
+    assert parse_type_annotation(ast.parse(annotation, mode="eval").body) == expected
+
+
+def test_type_nodes_are_immutable_hashable_and_picklable() -> None:
+    type_node = Union((ListOf(Ref("User")), DictOf(Primitive("str"), None), NoneType()))
+    assert not hasattr(type_node, "__dict__")
+    with pytest.raises(AttributeError):
+        type_node.options = ()  # type: ignore[misc]
+    assert {type_node: 1}[Union((ListOf(Ref("User")), DictOf(Primitive("str"), None), NoneType()))] == 1
+    assert pickle.loads(pickle.dumps(type_node)) == type_node
+
+
+def test_convert_annotations_to_asyncapi_schemas() -> None:
+    assert convert_annotations_to_asyncapi_schemas(Union((ListOf(Ref("User")), NoneType()))) == {
+        "required": False,
+        "properties": {"type": "array", "items": {"$ref": "#/components/schemas/User"}},
+    }
+    assert convert_annotations_to_asyncapi_schemas(None) == {"required": True, "properties": {}}
+
+
+@pytest.mark.parametrize("annotation", ["int", "list[User]", "str | list[bool] | User | None"])
+def test_round_trip(annotation) -> None:
+    type_node = parse_type_annotation(ast.parse(annotation, mode="eval").body)
+    options = type_node.options if isinstance(type_node, Union) else (type_node,)
+    schema = [type_to_schema(option) if option != NoneType() else None for option in options]
+    from_schema = type_from_schema(schema[0] if len(schema) == 1 else {"oneOf": schema})
+    assert ast.unparse(type_to_ast_node(from_schema)) == annotation
+
+
+@pytest.mark.parametrize(
+    "python_type, schema",
+    [
+        ("float", {"type": "number"}),
+        ("datetime", {"type": "string", "format": "date-time"}),
+        ("date", {"type": "string", "format": "date"}),
+        ("UUID", {"type": "string", "format": "uuid"}),
+        ("Decimal", {"type": "string", "format": "decimal"}),
+        ("bytes", {"type": "string", "format": "binary"}),
+        ("str", {"type": "string"}),
+    ],
+)
+def test_type_registry_round_trip(python_type, schema) -> None:
+    assert type_to_schema(named_type(python_type)) == schema
+    assert type_from_schema(schema) == Primitive(python_type)
+
+
+def test_type_registry_unknown_format_falls_back_to_type() -> None:
+    assert type_from_schema({"type": "string", "format": "required"}) == Primitive("str")
+    assert type_from_schema({"type": "array", "items": {"type": "string", "format": "uuid"}}) == ListOf(
+        Primitive("UUID")
+    )
+
+
+def test_type_registry_imports_for() -> None:
+    registry = TypeRegistry()
+
+    assert registry.imports_for(["UUID", "datetime", "date", "str", "User"]) == {
+        "datetime": ["date", "datetime"],
+        "uuid": ["UUID"],
+    }
+
+
+def test_type_registry_load_config(tmp_path) -> None:
+    config = tmp_path / "types.yml"
+    config.write_text("Money:\n  type: string\n  format: money\n  module: shop.types\n")
+    registry = TypeRegistry()
+    version = registry.version
+
+    registry.load_config(config)
+
+    assert registry.version > version
+    assert registry.get_python_mapping("Money") == TypeMapping("Money", "string", "money", "shop.types")
+    assert registry.to_python("string", "money") == "Money"
+    assert registry.to_asyncapi("Money") == "string"
+    assert named_type("Money", registry) == Primitive("Money")
+    assert named_type("Money") == Ref("Money")
+
+
+def test_type_registry_load_config_invalid(tmp_path) -> None:
+    config = tmp_path / "types.yml"
+    config.write_text("Money:\n  format: money\n")
+
+    with pytest.raises(InvalidFile):
+        TypeRegistry().load_config(config)
+    with pytest.raises(InvalidFile):
+        TypeRegistry().load_config(tmp_path / "missing.yml")
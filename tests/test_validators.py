@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from zen_generator.core.ast_utils import generate_code_from_ast
+from zen_generator.generators.common_python import BasePythonGenerator
+from zen_generator.generators.validators import build_validators_ast
+
+SCHEMAS = "#/components/schemas/"
+
+
+def shop_schemas() -> dict[str, Any]:
+    return {
+        "Address": {
+            "type": "object",
+            "required": ["street"],
+            "properties": {"street": {"type": "string"}, "number": {"type": "integer"}},
+        },
+        "Customer": {
+            "type": "object",
+            "required": ["name", "addresses"],
+            "properties": {
+                "name": {"type": "string"},
+                "addresses": {"type": "array", "items": {"$ref": f"{SCHEMAS}Address"}},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "contact": {"oneOf": [{"type": "string"}, {"$ref": f"{SCHEMAS}Address"}]},
+            },
+        },
+        "Node": {"type": "object", "properties": {"children": {"type": "array", "items": {"$ref": f"{SCHEMAS}Node"}}}},
+    }
+
+
+def shop_payloads() -> dict[str, Any]:
+    return {
+        "get_customer_request": {
+            "type": "object",
+            "required": ["customer_id"],
+            "properties": {"customer_id": {"type": "integer"}, "customer": {"$ref": f"{SCHEMAS}Customer"}},
+        },
+        "ping_request": {},
+    }
+
+
+@pytest.fixture
+def validators() -> dict[str, Any]:
+    namespace: dict[str, Any] = {}
+    exec(generate_code_from_ast(build_validators_ast(shop_schemas(), shop_payloads())), namespace)
+    return namespace
+
+
+def test_generated_validator() -> None:
+    code = generate_code_from_ast(build_validators_ast({"Address": shop_schemas()["Address"]}, {}))
+
+    assert (
+        '''
+def validate_address(value: Any, path: str = "$") -> None:
+    """Validate the `Address` model."""
+    if not isinstance(value, dict):
+        raise ValidationError(path, "expected object")
+    field = value.get("street", _MISSING)
+    if field is _MISSING:
+        raise ValidationError(path, "missing required property 'street'")
+    if not isinstance(field, str):
+        raise ValidationError(path + ".street", "expected string")
+    field = value.get("number")
+    if field is not None:
+        if not (isinstance(field, int) and type(field) is not bool):
+            raise ValidationError(path + ".number", "expected integer")
+'''
+        in code
+    )
+    assert code.endswith("""VALIDATORS: dict[str, Callable[[Any, str], None]] = {"Address": validate_address}\n""")
+
+
+def test_valid_payloads(validators) -> None:
+    customer = {"name": "Ada", "addresses": [{"street": "Main"}], "tags": None, "contact": {"street": "Side"}}
+
+    validators["validate_get_customer_request"]({"customer_id": 1, "customer": customer})
+    validators["validate_get_customer_request"]({"customer_id": 1, "customer": None})
+    validators["validate_node"]({"children": [{"children": []}, {}]})
+    validators["validate_ping_request"]("anything")
+    assert validators["VALIDATORS"]["get_customer_request"] is validators["validate_get_customer_request"]
+
+
+@pytest.mark.parametrize("schema", [{}, {"description": "Any value"}, {"oneOf": [{"type": "string"}, {}]}])
+def test_untyped_property_accepts_anything(schema: dict[str, Any]) -> None:
+    payload = {"type": "object", "required": ["a"], "properties": {"a": schema}}
+    namespace: dict[str, Any] = {}
+    exec(generate_code_from_ast(build_validators_ast({}, {"any_request": payload, "bare_request": schema})), namespace)
+
+    for value in (1, "a", None, [1], {"b": 2}):
+        namespace["validate_any_request"]({"a": value})
+        namespace["validate_bare_request"](value)
+    with pytest.raises(namespace["ValidationError"], match="missing required property 'a'"):
+        namespace["validate_any_request"]({})
+
+
+@pytest.mark.parametrize(
+    ("payload", "path", "message"),
+    [
+        ([], "$", "expected object"),
+        ({}, "$", "missing required property 'customer_id'"),
+        ({"customer_id": True}, "$.customer_id", "expected integer"),
+        ({"customer_id": 1, "customer": {"name": "Ada"}}, "$.customer", "missing required property 'addresses'"),
+        (
+            {"customer_id": 1, "customer": {"name": "Ada", "addresses": [{"street": "Main"}, {"street": 1}]}},
+            "$.customer.addresses[1].street",
+            "expected string",
+        ),
+        (
+            {"customer_id": 1, "customer": {"name": "Ada", "addresses": [], "tags": ["a", 2]}},
+            "$.customer.tags[1]",
+            "expected string",
+        ),
+        (
+            {"customer_id": 1, "customer": {"name": "Ada", "addresses": [], "contact": {}}},
+            "$.customer.contact",
+            "expected string or Address",
+        ),
+    ],
+)
+def test_invalid_payloads(validators, payload: Any, path: str, message: str) -> None:
+    with pytest.raises(validators["ValidationError"]) as exc:
+        validators["validate_get_customer_request"](payload)
+
+    assert (exc.value.path, exc.value.message) == (path, message)
+
+
+def test_validators_agree_with_jsonschema(validators) -> None:
+    jsonschema = pytest.importorskip("jsonschema")
+    payload_schema = {**shop_payloads()["get_customer_request"], "components": {"schemas": shop_schemas()}}
+    payloads = [
+        {"customer_id": 1},
+        {"customer_id": 1.5},
+        {"customer_id": 1, "customer": {"name": "Ada", "addresses": [{"street": "Main", "number": 3}]}},
+        {"customer_id": 1, "customer": {"name": "Ada", "addresses": [{"number": 3}]}},
+        {"customer_id": 1, "customer": {"name": "Ada", "addresses": [], "contact": "ada@example.com"}},
+        {"customer_id": 1, "customer": {"name": "Ada", "addresses": [], "contact": 1}},
+    ]
+
+    for payload in payloads:
+        expected = jsonschema.Draft202012Validator(payload_schema).is_valid(payload)
+        try:
+            validators["validate_get_customer_request"](payload)
+            valid = True
+        except validators["ValidationError"]:
+            valid = False
+        assert valid == expected, payload
+
+
+def test_generator_writes_the_validators(tmp_path) -> None:
+    models_file = tmp_path / "models.py"
+    generator = BasePythonGenerator(validators=True)
+
+    generator.generate_files_from_asyncapi(Path("test.yaml"), models_file, tmp_path / "functions.py", "Fake")
+
+    namespace: dict[str, Any] = {}
+    exec((tmp_path / "validators.py").read_text(), namespace)
+    assert list(namespace["VALIDATORS"]) == [
+        "TaskAttachment",
+        "UserTaxDeclarationInfo",
+        "Mida4TaskEnvironmentChoices",
+        "FooBar",
+        "get_attachments_from_utd_request",
+        "empty_request",
+        "generate_sync_task_request",
+        "generate_iiacc_task_request",
+        "generate_iva_sync_task_request",
+    ]
+    namespace["validate_generate_sync_task_request"](
+        {"utd_info": {"full_environment": True}, "skip_create_f24s": False}
+    )
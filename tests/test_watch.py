@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+import threading
+
+from zen_generator.core.watch import FileWatcher, file_state
+
+
+def test_file_state(tmp_path) -> None:
+    path = tmp_path / "models.py"
+    assert file_state(path) is None
+    path.write_text("x = 1\n")
+    assert file_state(path) is not None
+
+
+def test_file_watcher_poll(tmp_path) -> None:
+    models, functions = tmp_path / "models.py", tmp_path / "functions.py"
+    models.write_text("x = 1\n")
+    functions.write_text("y = 1\n")
+    watcher = FileWatcher([models, functions])
+    assert watcher.poll() == set()
+
+    models.write_text("x = 22\n")
+    assert watcher.poll() == {models}
+    assert watcher.poll() == set()
+
+    functions.unlink()
+    assert watcher.poll() == {functions}
+
+
+def test_file_watcher_run(tmp_path) -> None:
+    models = tmp_path / "models.py"
+    models.write_text("x = 1\n")
+    watcher = FileWatcher([models], interval=0.01)
+    stop = threading.Event()
+    calls = []
+
+    def on_change(changed):
+        calls.append(changed)
+        stop.set()
+
+    thread = threading.Thread(target=watcher.run, args=(on_change, stop))
+    thread.start()
+    models.write_text("x = 2\n")
+    os.utime(models, ns=(0, 0))
+    thread.join(timeout=5)
+
+    assert calls == [{models}]
@@ -1,23 +1,214 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from typing import Any, Callable
 
 import typer
 from rich import print
+from rich.table import Table
 from typing_extensions import Annotated
 
-from zen_generator.generators.asyncapi import generate_asyncapi_from_files
+from zen_generator.core.cache import SchemaCache
+from zen_generator.core.exception import InvalidFile
+from zen_generator.core.formatting import RuffFormatter
+from zen_generator.core.profiling import Profiler
+from zen_generator.core.refs import DanglingReference, RefGraph, UnknownOperation
+from zen_generator.core.scanning import NameCollision, expand_sources
+from zen_generator.core.type_system import default_type_registry
+from zen_generator.core.watch import FileWatcher
+from zen_generator.generators.asyncapi import IncrementalAsyncAPIGenerator, generate_asyncapi_from_files
+from zen_generator.generators.common_python import BasePythonGenerator
 from zen_generator.generators.python import Generator
 
 app = typer.Typer()
 
 
+def watch_and_regenerate(paths: list[Path], regenerate: Callable[[set[Path]], Any]) -> None:
+    """Run `regenerate` every time one of the given files changes, until the user stops the process.
+
+    Args:
+        paths: The files to watch.
+        regenerate: Called with the files that changed.
+    """
+    print(f"Watching {', '.join(str(path) for path in paths)} for changes, press Ctrl+C to stop")
+
+    def on_change(changed: set[Path]) -> None:
+        print(f"Changed: {', '.join(str(path) for path in sorted(changed))}")
+        try:
+            regenerate(changed)
+        except Exception as exc:
+            print(f":boom: [bold red]{type(exc).__name__}: {exc}[/bold red]")
+
+    try:
+        FileWatcher(paths).run(on_change)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+def report_cycles(graph: RefGraph) -> None:
+    """Warn about the models that reference each other, which can't be defined one after the other.
+
+    Args:
+        graph: The graph of the references of the AsyncAPI document.
+    """
+    for cycle in graph.cycles:
+        print(f":warning: [yellow]The models {', '.join(cycle)} reference each other[/yellow]")
+
+
+def split_names(values: list[str] | None) -> list[str] | None:
+    """Split the values of a repeatable option that also accepts comma separated names.
+
+    Args:
+        values: The values of the option, None if it isn't given.
+
+    Returns:
+        The names, None if the option isn't given.
+    """
+    if values is None:
+        return None
+    return [name.strip() for value in values for name in value.split(",") if name.strip()]
+
+
+def report_profile(profiler: Profiler, profile_file: Path | None) -> None:
+    """Print the measures of the stages of a run, and write them as JSON to `profile_file`, if given.
+
+    Args:
+        profiler: The profiler of the run.
+        profile_file: The JSON file to write.
+    """
+    table = Table("stage", "wall (ms)", "cpu (ms)", "peak (KiB)", "counts", title="Profile")
+    for stage in profiler.stages:
+        table.add_row(
+            stage.name,
+            f"{stage.wall_time * 1000:.1f}",
+            f"{stage.cpu_time * 1000:.1f}",
+            f"{stage.memory_peak / 1024:.1f}",
+            ", ".join(f"{name}: {count}" for name, count in stage.counts.items()),
+        )
+    print(table)
+    if profile_file is not None:
+        profile_file.write_text(json.dumps(profiler.to_dict(), indent=2) + "\n")
+        print(f"Profile written to {profile_file}")
+
+
+def load_types_file(types_file: Path | None) -> None:
+    """Register the type mappings defined in `types_file`, if any.
+
+    Args:
+        types_file: The YAML file with the type mappings.
+    """
+    if types_file is None:
+        return
+    try:
+        default_type_registry.load_config(types_file)
+    except InvalidFile as exc:
+        print(f":boom: :boom: [bold red]{exc.message}: '{exc.file_path}'[/bold red]")
+        raise typer.Abort() from exc
+
+
+def watch_python(
+    generator: BasePythonGenerator, asyncapi_file: Path, models_file: Path, functions_file: Path, application_name: str
+) -> None:
+    """Generate the Python files, then regenerate the ones affected by every change of the AsyncAPI file.
+
+    Args:
+        generator: The generator of the Python files.
+        asyncapi_file: The AsyncAPI file to watch.
+        models_file: The path to the generated models file.
+        functions_file: The path to the generated functions file.
+        application_name: The name of the application.
+    """
+
+    def regenerate(changed: set[Path] | None = None) -> None:
+        try:
+            written = generator.regenerate_files_from_asyncapi(
+                asyncapi_file, models_file, functions_file, application_name
+            )
+        except (DanglingReference, UnknownOperation) as exc:
+            print(f":boom: :boom: [bold red]{exc.message}[/bold red]")
+            # an invalid document found while watching is reported, the files are regenerated once it is fixed
+            if changed is None:
+                raise typer.Abort() from exc
+            return
+        print(f"Written: {', '.join(str(path) for path in written) or 'nothing'}")
+
+    regenerate()
+    watch_and_regenerate([asyncapi_file], regenerate)
+
+
+def generate_python(
+    generator: BasePythonGenerator,
+    asyncapi_file: Path,
+    models_file: Path,
+    functions_file: Path,
+    application_name: str,
+    is_async: bool,
+    formatting: bool,
+    watch: bool,
+    types_file: Path | None,
+    operations: list[str] | None,
+    tags: list[str] | None,
+    split_models: bool,
+    validators: bool,
+    codecs: bool = False,
+    async_operations: list[str] | None = None,
+    profile: bool = False,
+    profile_file: Path | None = None,
+) -> None:
+    """Generate the models and functions from the AsyncAPI file with the given generator.
+
+    The arguments are the options shared by the commands that generate Python code.
+    """
+    print("Preparing to generate models and functions from the asyncapi file")
+    load_types_file(types_file)
+    if asyncapi_file.is_file():
+        if not formatting:
+            generator.formatter = RuffFormatter(enabled=False)
+        generator.operations, generator.tags = split_names(operations), split_names(tags)
+        generator.split_models = split_models
+        generator.validators = validators
+        generator.codecs = codecs
+        generator.async_operations = split_names(async_operations)
+        if watch:
+            generator.is_async = is_async
+
+            watch_python(generator, asyncapi_file, models_file, functions_file, application_name)
+        else:
+            profiler = Profiler() if profile or profile_file is not None else None
+            if profiler is not None:
+                generator.hooks = [*generator.hooks, profiler]
+            try:
+                generator.generate_files_from_asyncapi(
+                    asyncapi_file, models_file, functions_file, application_name, is_async
+                )
+            except (DanglingReference, UnknownOperation) as exc:
+                print(f":boom: :boom: [bold red]{exc.message}[/bold red]")
+                raise typer.Abort() from exc
+            report_cycles(generator.ref_graph)
+            if profiler is not None:
+                report_profile(profiler, profile_file)
+    else:
+        print(
+            f":boom: :boom: [bold red]the source file '{asyncapi_file}' "
+            f"or the file '{functions_file}' is not a file![/bold red]"
+        )
+        raise typer.Abort()
+
+
 @app.command()
 def asyncapi_documentation(
-    models_file: Annotated[Path, typer.Option()] = Path("models.py"),
-    functions_file: Annotated[Path, typer.Option()] = Path("functions.py"),
+    models_file: Annotated[list[Path] | None, typer.Option(show_default="models.py")] = None,
+    functions_file: Annotated[list[Path] | None, typer.Option(show_default="functions.py")] = None,
     output_file: Annotated[Path, typer.Option()] = Path("asyncapi.yaml"),
     application_name: Annotated[str, typer.Option()] = "Zen",
+    cache: Annotated[bool, typer.Option("--cache/--no-cache")] = True,
+    watch: Annotated[bool, typer.Option()] = False,
+    types_file: Annotated[Path | None, typer.Option()] = None,
+    jobs: Annotated[int, typer.Option(min=0)] = 1,
+    fast: Annotated[bool, typer.Option()] = False,
+    profile: Annotated[bool, typer.Option()] = False,
+    profile_file: Annotated[Path | None, typer.Option()] = None,
 ) -> None:
     """Generate AsyncAPI documentation from source code.
 
@@ -26,20 +217,54 @@ def asyncapi_documentation(
     with the name of the application as title.
 
     Args:
-        models_file: The path to the file containing the models.
-        functions_file: The path to the file containing the functions.
+        models_file: The files, directories or glob patterns of the modules containing the models.
+        functions_file: The files, directories or glob patterns of the modules containing the functions.
         output_file: The path to the output file.
         application_name: The name of the application.
+        cache: Whether the schemas of unchanged classes and functions should be read from the cache.
+        watch: Whether to keep running and regenerate the documentation when the sources change.
+        types_file: A YAML file with additional mappings between Python and AsyncAPI types.
+        jobs: The number of processes that scan the modules, 0 uses one process per CPU.
+        fast: Whether to parse only the signatures, docstrings and class fields of the modules.
+        profile: Whether to print the wall time, CPU time, memory peak and counts of every stage.
+            Ignored with watch.
+        profile_file: The JSON file where the profile is written, implies profile.
     """
     print("Preparing to generate the documentation")
-    if models_file.is_file() and functions_file.is_file():
-        generate_asyncapi_from_files(models_file, functions_file, output_file, application_name)
-    else:
-        print(
-            f":boom: :boom: [bold red]the source file '{models_file}' "
-            f"or the file '{functions_file}' is not a file![/bold red]"
-        )
-        raise typer.Abort()
+    load_types_file(types_file)
+    models_file = models_file or [Path("models.py")]
+    functions_file = functions_file or [Path("functions.py")]
+    try:
+        sources = expand_sources([*models_file, *functions_file])
+    except InvalidFile as exc:
+        print(f":boom: :boom: [bold red]{exc.message}: '{exc.file_path}'[/bold red]")
+        raise typer.Abort() from exc
+
+    schema_cache = SchemaCache() if cache else None
+    try:
+        if watch:
+            generator = IncrementalAsyncAPIGenerator(
+                models_file, functions_file, output_file, application_name, schema_cache, fast
+            )
+            generator.generate()
+            watch_and_regenerate(sources, generator.generate)
+        else:
+            profiler = Profiler() if profile or profile_file is not None else None
+            generate_asyncapi_from_files(
+                models_file,
+                functions_file,
+                output_file,
+                application_name,
+                schema_cache,
+                jobs or None,
+                fast,
+                [profiler] if profiler is not None else (),
+            )
+            if profiler is not None:
+                report_profile(profiler, profile_file)
+    except NameCollision as exc:
+        print(f":boom: :boom: [bold red]{exc.message}[/bold red]")
+        raise typer.Abort() from exc
 
 
 @app.command()
@@ -49,6 +274,15 @@ def pure_python(
     functions_file: Annotated[Path, typer.Option()] = Path("functions.py"),
     application_name: Annotated[str, typer.Option()] = "Zen",
     is_async: Annotated[bool, typer.Option()] = False,
+    formatting: Annotated[bool, typer.Option("--format/--no-format")] = True,
+    watch: Annotated[bool, typer.Option()] = False,
+    types_file: Annotated[Path | None, typer.Option()] = None,
+    operations: Annotated[list[str] | None, typer.Option()] = None,
+    tags: Annotated[list[str] | None, typer.Option()] = None,
+    split_models: Annotated[bool, typer.Option()] = False,
+    validators: Annotated[bool, typer.Option()] = False,
+    profile: Annotated[bool, typer.Option()] = False,
+    profile_file: Annotated[Path | None, typer.Option()] = None,
 ) -> None:
     """Generate pure Python models and functions from AsyncAPI file.
 
@@ -62,17 +296,37 @@ def pure_python(
         functions_file: The path to the output file for the functions.
         application_name: The name of the application.
         is_async: Whether the generated functions should be async or not.
+        formatting: Whether the generated files should be formatted with ruff or not.
+        watch: Whether to keep running and regenerate the files when the AsyncAPI file changes.
+        types_file: A YAML file with additional mappings between Python and AsyncAPI types.
+        operations: The operations to generate, with the models they depend on. Repeat the option
+            or separate the names with commas. Defaults to every operation.
+        tags: Generate only the operations with one of these tags, and the models they depend on.
+        split_models: Whether to write the models as a package, one module per model, named
+            after the models file without its suffix.
+        validators: Whether to also write `validators.py` next to the models, with a validator
+            per model and per request payload.
+        profile: Whether to print the wall time, CPU time, memory peak and counts of every stage.
+            Ignored with watch.
+        profile_file: The JSON file where the profile is written, implies profile.
     """
-    print("Preparing to generate models and functions from the asyncapi file")
-    if asyncapi_file.is_file():
-        generator = Generator.pure_python_generator()
-        generator.generate_files_from_asyncapi(asyncapi_file, models_file, functions_file, application_name, is_async)
-    else:
-        print(
-            f":boom: :boom: [bold red]the source file '{asyncapi_file}' "
-            f"or the file '{functions_file}' is not a file![/bold red]"
-        )
-        raise typer.Abort()
+    generate_python(
+        Generator.pure_python_generator(),
+        asyncapi_file,
+        models_file,
+        functions_file,
+        application_name,
+        is_async,
+        formatting,
+        watch,
+        types_file,
+        operations,
+        tags,
+        split_models,
+        validators,
+        profile=profile,
+        profile_file=profile_file,
+    )
 
 
 @app.command()
@@ -82,6 +336,15 @@ def fastapi(
     functions_file: Annotated[Path, typer.Option()] = Path("functions.py"),
     application_name: Annotated[str, typer.Option()] = "Zen",
     is_async: Annotated[bool, typer.Option()] = False,
+    formatting: Annotated[bool, typer.Option("--format/--no-format")] = True,
+    watch: Annotated[bool, typer.Option()] = False,
+    types_file: Annotated[Path | None, typer.Option()] = None,
+    operations: Annotated[list[str] | None, typer.Option()] = None,
+    tags: Annotated[list[str] | None, typer.Option()] = None,
+    split_models: Annotated[bool, typer.Option()] = False,
+    validators: Annotated[bool, typer.Option()] = False,
+    profile: Annotated[bool, typer.Option()] = False,
+    profile_file: Annotated[Path | None, typer.Option()] = None,
 ) -> None:
     """Generate FastAPI models and functions from AsyncAPI file.
 
@@ -95,18 +358,252 @@ def fastapi(
         functions_file: The path to the output file for the functions.
         application_name: The name of the application.
         is_async: Whether the generated functions should be async or not.
+        formatting: Whether the generated files should be formatted with ruff or not.
+        watch: Whether to keep running and regenerate the files when the AsyncAPI file changes.
+        types_file: A YAML file with additional mappings between Python and AsyncAPI types.
+        operations: The operations to generate, with the models they depend on. Repeat the option
+            or separate the names with commas. Defaults to every operation.
+        tags: Generate only the operations with one of these tags, and the models they depend on.
+        split_models: Whether to write the models as a package, one module per model, named
+            after the models file without its suffix.
+        validators: Whether to also write `validators.py` next to the models, with a validator
+            per model and per request payload.
+        profile: Whether to print the wall time, CPU time, memory peak and counts of every stage.
+            Ignored with watch.
+        profile_file: The JSON file where the profile is written, implies profile.
 
     """
-    print("Preparing to generate models and functions from the asyncapi file")
-    if asyncapi_file.is_file():
-        generator = Generator.fastapi_generator()
-        generator.generate_files_from_asyncapi(asyncapi_file, models_file, functions_file, application_name, is_async)
-    else:
-        print(
-            f":boom: :boom: [bold red]the source file '{asyncapi_file}' "
-            f"or the file '{functions_file}' is not a file![/bold red]"
-        )
-        raise typer.Abort()
+    generate_python(
+        Generator.fastapi_generator(),
+        asyncapi_file,
+        models_file,
+        functions_file,
+        application_name,
+        is_async,
+        formatting,
+        watch,
+        types_file,
+        operations,
+        tags,
+        split_models,
+        validators,
+        profile=profile,
+        profile_file=profile_file,
+    )
+
+
+@app.command()
+def fastapi_post(
+    asyncapi_file: Annotated[Path, typer.Option()] = Path("asyncapi.yaml"),
+    models_file: Annotated[Path, typer.Option()] = Path("models.py"),
+    functions_file: Annotated[Path, typer.Option()] = Path("functions.py"),
+    application_name: Annotated[str, typer.Option()] = "Zen",
+    is_async: Annotated[bool, typer.Option()] = False,
+    async_operations: Annotated[list[str] | None, typer.Option()] = None,
+    orjson: Annotated[bool, typer.Option()] = False,
+    formatting: Annotated[bool, typer.Option("--format/--no-format")] = True,
+    watch: Annotated[bool, typer.Option()] = False,
+    types_file: Annotated[Path | None, typer.Option()] = None,
+    operations: Annotated[list[str] | None, typer.Option()] = None,
+    tags: Annotated[list[str] | None, typer.Option()] = None,
+    split_models: Annotated[bool, typer.Option()] = False,
+    validators: Annotated[bool, typer.Option()] = False,
+    profile: Annotated[bool, typer.Option()] = False,
+    profile_file: Annotated[Path | None, typer.Option()] = None,
+) -> None:
+    """Generate FastAPI POST routes, with body and response models, from AsyncAPI file.
+
+    Generate the models and functions from the AsyncAPI file in the asyncapi_file.
+    The output will be two files, one for the models and one for the functions,
+    saved in the models_file and functions_file respectively.
+
+    Every route takes its request payload as a body model, e.g. `GetOrderRequest`, and
+    declares its response payload as `response_model`. The routes are plain functions, run by
+    FastAPI in its threadpool, so blocking code doesn't stall the event loop; the routes that
+    only await should be listed in async_operations.
+
+    Args:
+        asyncapi_file: The path to the AsyncAPI file.
+        models_file: The path to the output file for the models.
+        functions_file: The path to the output file for the functions.
+        application_name: The name of the application.
+        is_async: Whether every generated route should be async or not.
+        async_operations: The operations generated as async routes. Repeat the option or
+            separate the names with commas.
+        orjson: Whether the responses should be serialized with `ORJSONResponse`, which needs orjson.
+        formatting: Whether the generated files should be formatted with ruff or not.
+        watch: Whether to keep running and regenerate the files when the AsyncAPI file changes.
+        types_file: A YAML file with additional mappings between Python and AsyncAPI types.
+        operations: The operations to generate, with the models they depend on. Repeat the option
+            or separate the names with commas. Defaults to every operation.
+        tags: Generate only the operations with one of these tags, and the models they depend on.
+        split_models: Whether to write the models as a package, one module per model, named
+            after the models file without its suffix.
+        validators: Whether to also write `validators.py` next to the models, with a validator
+            per model and per request payload.
+        profile: Whether to print the wall time, CPU time, memory peak and counts of every stage.
+            Ignored with watch.
+        profile_file: The JSON file where the profile is written, implies profile.
+
+    """
+    generate_python(
+        Generator.fastapi_post_generator(orjson),
+        asyncapi_file,
+        models_file,
+        functions_file,
+        application_name,
+        is_async,
+        formatting,
+        watch,
+        types_file,
+        operations,
+        tags,
+        split_models,
+        validators,
+        async_operations=async_operations,
+        profile=profile,
+        profile_file=profile_file,
+    )
+
+
+@app.command()
+def dataclasses(
+    asyncapi_file: Annotated[Path, typer.Option()] = Path("asyncapi.yaml"),
+    models_file: Annotated[Path, typer.Option()] = Path("models.py"),
+    functions_file: Annotated[Path, typer.Option()] = Path("functions.py"),
+    application_name: Annotated[str, typer.Option()] = "Zen",
+    is_async: Annotated[bool, typer.Option()] = False,
+    formatting: Annotated[bool, typer.Option("--format/--no-format")] = True,
+    watch: Annotated[bool, typer.Option()] = False,
+    types_file: Annotated[Path | None, typer.Option()] = None,
+    operations: Annotated[list[str] | None, typer.Option()] = None,
+    tags: Annotated[list[str] | None, typer.Option()] = None,
+    split_models: Annotated[bool, typer.Option()] = False,
+    validators: Annotated[bool, typer.Option()] = False,
+    codecs: Annotated[bool, typer.Option()] = False,
+    profile: Annotated[bool, typer.Option()] = False,
+    profile_file: Annotated[Path | None, typer.Option()] = None,
+) -> None:
+    """Generate slotted dataclass models and functions from AsyncAPI file.
+
+    Generate the models and functions from the AsyncAPI file in the asyncapi_file.
+    The output will be two files, one for the models and one for the functions,
+    saved in the models_file and functions_file respectively.
+
+    The models are frozen dataclasses with `__slots__`, which need less memory per instance
+    than dictionaries or pydantic models.
+
+    Args:
+        asyncapi_file: The path to the AsyncAPI file.
+        models_file: The path to the output file for the models.
+        functions_file: The path to the output file for the functions.
+        application_name: The name of the application.
+        is_async: Whether the generated functions should be async or not.
+        formatting: Whether the generated files should be formatted with ruff or not.
+        watch: Whether to keep running and regenerate the files when the AsyncAPI file changes.
+        types_file: A YAML file with additional mappings between Python and AsyncAPI types.
+        operations: The operations to generate, with the models they depend on. Repeat the option
+            or separate the names with commas. Defaults to every operation.
+        tags: Generate only the operations with one of these tags, and the models they depend on.
+        split_models: Whether to write the models as a package, one module per model, named
+            after the models file without its suffix.
+        validators: Whether to also write `validators.py` next to the models, with a validator
+            per model and per request payload.
+        codecs: Whether to generate the `<model>_to_dict` and `<model>_from_dict` functions of
+            every model, next to it.
+        profile: Whether to print the wall time, CPU time, memory peak and counts of every stage.
+            Ignored with watch.
+        profile_file: The JSON file where the profile is written, implies profile.
+
+    """
+    generate_python(
+        Generator.dataclass_generator(),
+        asyncapi_file,
+        models_file,
+        functions_file,
+        application_name,
+        is_async,
+        formatting,
+        watch,
+        types_file,
+        operations,
+        tags,
+        split_models,
+        validators,
+        codecs,
+        profile=profile,
+        profile_file=profile_file,
+    )
+
+
+@app.command()
+def msgspec(
+    asyncapi_file: Annotated[Path, typer.Option()] = Path("asyncapi.yaml"),
+    models_file: Annotated[Path, typer.Option()] = Path("models.py"),
+    functions_file: Annotated[Path, typer.Option()] = Path("functions.py"),
+    application_name: Annotated[str, typer.Option()] = "Zen",
+    is_async: Annotated[bool, typer.Option()] = False,
+    formatting: Annotated[bool, typer.Option("--format/--no-format")] = True,
+    watch: Annotated[bool, typer.Option()] = False,
+    types_file: Annotated[Path | None, typer.Option()] = None,
+    operations: Annotated[list[str] | None, typer.Option()] = None,
+    tags: Annotated[list[str] | None, typer.Option()] = None,
+    split_models: Annotated[bool, typer.Option()] = False,
+    validators: Annotated[bool, typer.Option()] = False,
+    codecs: Annotated[bool, typer.Option()] = False,
+    profile: Annotated[bool, typer.Option()] = False,
+    profile_file: Annotated[Path | None, typer.Option()] = None,
+) -> None:
+    """Generate msgspec Struct models and functions from AsyncAPI file.
+
+    Generate the models and functions from the AsyncAPI file in the asyncapi_file.
+    The output will be two files, one for the models and one for the functions,
+    saved in the models_file and functions_file respectively.
+
+    The models are frozen `msgspec.Struct` classes, compact to store and fast to build,
+    encode and decode. The generated code needs msgspec installed.
+
+    Args:
+        asyncapi_file: The path to the AsyncAPI file.
+        models_file: The path to the output file for the models.
+        functions_file: The path to the output file for the functions.
+        application_name: The name of the application.
+        is_async: Whether the generated functions should be async or not.
+        formatting: Whether the generated files should be formatted with ruff or not.
+        watch: Whether to keep running and regenerate the files when the AsyncAPI file changes.
+        types_file: A YAML file with additional mappings between Python and AsyncAPI types.
+        operations: The operations to generate, with the models they depend on. Repeat the option
+            or separate the names with commas. Defaults to every operation.
+        tags: Generate only the operations with one of these tags, and the models they depend on.
+        split_models: Whether to write the models as a package, one module per model, named
+            after the models file without its suffix.
+        validators: Whether to also write `validators.py` next to the models, with a validator
+            per model and per request payload.
+        codecs: Whether to generate the `<model>_to_dict` and `<model>_from_dict` functions of
+            every model, next to it.
+        profile: Whether to print the wall time, CPU time, memory peak and counts of every stage.
+            Ignored with watch.
+        profile_file: The JSON file where the profile is written, implies profile.
+
+    """
+    generate_python(
+        Generator.msgspec_generator(),
+        asyncapi_file,
+        models_file,
+        functions_file,
+        application_name,
+        is_async,
+        formatting,
+        watch,
+        types_file,
+        operations,
+        tags,
+        split_models,
+        validators,
+        codecs,
+        profile=profile,
+        profile_file=profile_file,
+    )
 
 
 @app.callback()
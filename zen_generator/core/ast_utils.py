@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from ast import (
     AST,
     AnnAssign,
@@ -21,105 +22,103 @@ from ast import (
     Tuple,
     arg,
     arguments,
+    dump,
     expr,
     fix_missing_locations,
     stmt,
     unparse,
-    walk,
 )
-from typing import Any, Sequence, TypeAlias
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Mapping, Sequence, TypeAlias, cast
 
-from zen_generator.core.formatting import format_python_code
+from zen_generator.core.cache import SchemaCache
+from zen_generator.core.formatting import RuffFormatter, get_default_formatter
+from zen_generator.core.symbols import ModuleIndex, build_module_index
 from zen_generator.core.type_system import (
-    convert_asyncapi_to_python,
-    convert_python_to_asyncapi,
+    DictOf,
+    ListOf,
+    NoneType,
+    Primitive,
+    Ref,
+    TypeNode,
+    Union,
+    default_type_registry,
+    named_type,
+    type_from_schema,
+    type_to_schema,
+    union_options,
 )
 
 AnnotationNode: TypeAlias = AST | Subscript | List | Name | BinOp | Constant | Tuple | Slice | None
-SCHEMA_PREFIX = "#/components/schemas/"
 
+_WORD_BOUNDARY_PATTERNS = (re.compile(r"([A-Z]+)([A-Z][a-z])"), re.compile(r"([a-z\d])([A-Z])"))
 
-def parse_type_annotation(
-    ast_annotation: AnnotationNode,
-) -> list[dict[str, Any]]:
-    """Parse an AST type annotation node into a list of type descriptions.
+
+def parse_type_annotation(ast_annotation: AnnotationNode) -> TypeNode | None:
+    """Parse an AST type annotation node into the type IR.
 
     Args:
         ast_annotation: The AST annotation node to parse (Subscript, Name, BinOp, etc.)
 
     Returns:
-        List of dictionaries describing the type structure, each containing:
-        - slice: The container type (list, dict, etc.) or None
-        - value: The contained type name or None
+        The type described by the annotation, or None if the annotation is not supported.
+        Unions are flattened, so `a | b | c` gives a single `Union` with three options.
     """
     match ast_annotation:
-        case Subscript():
-            kind = ast_annotation.value.id if hasattr(ast_annotation.value, "id") else None
-            if kind == "dict" and hasattr(ast_annotation.slice, "elts"):
-                value = [
-                    ast_annotation.slice.elts[0].id,
-                    ast_annotation.slice.elts[1].id,
-                ]
-            elif kind == "list":
-                if isinstance(ast_annotation.slice, (Tuple, Subscript)):
-                    value = parse_type_annotation(ast_annotation.slice)
-                elif hasattr(ast_annotation.slice, "id"):
-                    value = ast_annotation.slice.id
-                else:
-                    value = None
-            else:
-                value = ast_annotation.slice.id if hasattr(ast_annotation.slice, "id") else None
-            return [{"slice": kind, "value": value}]
-        case List():
-            return [{"slice": "list", "value": None}]
-        case Name():
-            return [{"slice": None, "value": ast_annotation.id}]
+        case Subscript(value=Name(id="dict"), slice=Tuple(elts=[key, value, *_])):
+            return DictOf(parse_type_annotation(key), parse_type_annotation(value))
+        case Subscript(value=Name(id="list"), slice=Tuple() | Subscript() as item):
+            return ListOf(parse_type_annotation(item) or Union(()))
+        case Subscript(value=Name(id="list"), slice=Name(id=item_name)):
+            return ListOf(named_type(item_name))
+        case Subscript(value=Name(id="list")):
+            return NoneType()
+        case Subscript(slice=Name(id=item_name)):
+            # typing generics other than list and dict (Optional[int], set[str], ...) are
+            # described by their parameter
+            return named_type(item_name)
+        case Subscript() | List():
+            return NoneType()
+        case Name(id=name):
+            return named_type(name)
         case BinOp():
-            left_type = parse_type_annotation(ast_annotation.left)
-            right_type = parse_type_annotation(ast_annotation.right)
-            return left_type + right_type
-        case Constant() if ast_annotation.value is None:
-            return [{"slice": None, "value": None}]
+            options = tuple(
+                option
+                for operand in _union_operands(ast_annotation)
+                for option in union_options(parse_type_annotation(operand))
+            )
+            return Union(options) if len(options) != 1 else options[0]
+        case Constant(value=None):
+            return NoneType()
         case _:
-            return []
+            return None
 
 
-def convert_annotations_to_asyncapi_schemas(
-    input_annotation: list[dict[str, Any]],
-) -> dict[str, Any]:
-    """Convert a list of dictionaries (result of `convert_ast_annotation_to_dict`) to an AsyncAPI schema.
+def _union_operands(annotation: BinOp) -> list[AnnotationNode]:
+    # `a | b | c` is nested on the left, the operands are collected in a loop instead of
+    # recursing once per operand
+    operands: list[AnnotationNode] = []
+    node: AnnotationNode = annotation
+    while isinstance(node, BinOp):
+        operands.append(node.right)
+        node = node.left
+    operands.append(node)
+    return operands[::-1]
+
+
+def convert_annotations_to_asyncapi_schemas(type_node: TypeNode | None) -> dict[str, Any]:
+    """Convert a type (result of `parse_type_annotation`) to an AsyncAPI schema.
 
     Args:
-        input_annotation: A list of dictionaries containing the annotation information.
+        type_node: The type to convert.
 
     Returns:
-        A dictionary containing the AsyncAPI schema.
+        A dictionary with the AsyncAPI schema in `properties`, and in `required` whether the
+        type doesn't accept None.
     """
-    required = True
-    schema_items: list[dict[str, Any]] = []
-
-    valid_annotations = [annotation for annotation in input_annotation if annotation["value"] is not None]
-
-    if len(valid_annotations) < len(input_annotation):
-        required = False
-
-    for annotation in valid_annotations:
-        if isinstance(annotation["value"], str):
-            primitive_type = convert_python_to_asyncapi(annotation["value"])
-            if primitive_type:
-                value = primitive_type
-                item_type = "type"
-            else:
-                value = f"{SCHEMA_PREFIX}{annotation['value']}"
-                item_type = "$ref"
-        else:
-            value = "object"
-            item_type = "type"
-
-        if annotation["slice"] == "list":
-            schema_items.append({"type": "array", "items": {item_type: value}})
-        else:
-            schema_items.append({item_type: str(value)})
+    options = union_options(type_node)
+    schema_items = [type_to_schema(option) for option in options if not isinstance(option, NoneType)]
+    required = len(schema_items) == len(options)
 
     properties: dict[str, Any] = (
         {} if not schema_items else schema_items[0] if len(schema_items) == 1 else {"oneOf": schema_items}
@@ -127,6 +126,86 @@ def convert_annotations_to_asyncapi_schemas(
     return {"required": required, "properties": properties}
 
 
+def annotation_fingerprint(node: AST | None) -> Hashable:
+    """Compute a hashable key describing the structure of an annotation node.
+
+    Two annotations have the same fingerprint when they are written the same way, regardless
+    of their position in the source.
+
+    Args:
+        node: The annotation node.
+
+    Returns:
+        The structural fingerprint of the node.
+    """
+    match node:
+        case None:
+            return None
+        case Name(id=name):
+            return name
+        case Constant(value=value):
+            return ("Constant", type(value).__name__, value)
+        case Subscript(value=value, slice=slice_node):
+            return ("Subscript", annotation_fingerprint(value), annotation_fingerprint(slice_node))
+        case BinOp(left=left, op=op, right=right):
+            return ("BinOp", type(op).__name__, annotation_fingerprint(left), annotation_fingerprint(right))
+        case Tuple(elts=elts) | List(elts=elts):
+            return (type(node).__name__, *(annotation_fingerprint(elt) for elt in elts))
+        case _:
+            return dump(node)
+
+
+@dataclass
+class AnnotationSchemaCache:
+    """Memoised conversion of annotation nodes to AsyncAPI schemas.
+
+    The schemas are interned: every occurrence of the same annotation gets the same schema
+    object. The schemas must be treated as read-only, callers that need to change a schema
+    copy it first. The entries are dropped whenever a type is registered in the type registry.
+
+    Attributes:
+        hits (int): The number of conversions served from the cache.
+        misses (int): The number of conversions computed.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    _entries: dict[Hashable, tuple[bool, dict[str, Any]]] = field(init=False, repr=False, default_factory=dict)
+    _registry_version: int = field(init=False, repr=False, default=-1)
+
+    def convert(self, annotation: AnnotationNode) -> tuple[bool, dict[str, Any]]:
+        """Convert an annotation node to an AsyncAPI schema.
+
+        Args:
+            annotation: The annotation node to convert.
+
+        Returns:
+            A tuple with whether the annotation doesn't accept None and the interned schema.
+        """
+        if self._registry_version != default_type_registry.version:
+            self._entries.clear()
+            self._registry_version = default_type_registry.version
+
+        key = annotation_fingerprint(annotation)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        conv = convert_annotations_to_asyncapi_schemas(parse_type_annotation(annotation))
+        entry = self._entries[key] = (conv["required"], conv["properties"])
+        return entry
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+annotation_schema_cache = AnnotationSchemaCache()
+
+
 def generate_class_schema(node: ClassDef) -> dict[str, Any]:
     """Generate a dictionary containing the AsyncAPI schema for a ClassDef node.
 
@@ -148,37 +227,43 @@ def generate_class_schema(node: ClassDef) -> dict[str, Any]:
     for class_element in node.body:
         if isinstance(class_element, AnnAssign) and isinstance(class_element.target, Name):
             property_name = class_element.target.id
-            items = parse_type_annotation(class_element.annotation)
-            conv = convert_annotations_to_asyncapi_schemas(items)
-            if conv.get("required"):
+            is_required, property_schema = annotation_schema_cache.convert(class_element.annotation)
+            if is_required:
                 required.append(property_name)
-                del conv["required"]
-            properties[property_name] = conv.get("properties")
+            properties[property_name] = property_schema
 
     schema["required"] = required
     schema["properties"] = properties
     return schema
 
 
-def generate_code_from_ast(ast_nodes: list[Any]) -> str:
+def generate_code_from_ast(ast_nodes: list[Any], formatter: RuffFormatter | None = None) -> str:
     """Converts an AST tree to a formatted string of Python code.
 
     Args:
         ast_nodes: A list of AST nodes to convert.
+        formatter: The formatter service to use. Defaults to the process wide formatter.
 
     Returns:
         A formatted string of Python code.
     """
     module = Module(body=ast_nodes, type_ignores=[])
     raw_code = unparse(fix_missing_locations(module))
-    return format_python_code(raw_code)
+    return (formatter or get_default_formatter()).format_code(raw_code)
 
 
-def generate_component_schemas(tree: AST | None) -> dict[str, Any]:
+def generate_component_schemas(
+    tree: AST | ModuleIndex | None,
+    source: str | None = None,
+    cache: SchemaCache | None = None,
+) -> dict[str, Any]:
     """Generates a dictionary containing the component schemas from an AST tree.
 
     Args:
-        tree: The AST tree to parse. If None, an empty dictionary is returned.
+        tree: The AST tree to parse, or its symbol index. If None, an empty dictionary is returned.
+            Only the classes defined at the top level of the module are converted.
+        source: The source code of the tree, required to look up the schemas in the cache.
+        cache: The cache of the schemas, keyed by the source segment of every class.
 
     Returns:
         A dictionary containing the component schemas.
@@ -187,13 +272,18 @@ def generate_component_schemas(tree: AST | None) -> dict[str, Any]:
     if not tree:
         return result
 
-    for node in walk(tree):
-        if isinstance(node, ClassDef):
+    index = tree if isinstance(tree, ModuleIndex) else build_module_index(cast(Module, tree), source)
+    for symbol in index.top_level_classes:
+        node = cast(ClassDef, symbol.node)
+        segment = index.segment(node) if cache is not None else None
+        if segment is not None and cache is not None:
+            result[node.name] = cache.get_or_build("class", segment, lambda node=node: generate_class_schema(node))
+        else:
             result[node.name] = generate_class_schema(node)
     return result
 
 
-def get_component_schemas(source: dict[str, Any] | None) -> dict[str, Any] | None:
+def get_component_schemas(source: Mapping[str, Any] | None) -> dict[str, Any] | None:
     """Gets the component schemas from an AsyncAPI dictionary.
 
     Args:
@@ -225,76 +315,71 @@ def generate_bin_op(
     if not values:
         return None
 
-    if len(values) == 1:
-        value = values[0]
-        if value is None:
-            return Constant(value=None)
-        elif isinstance(value, str):
-            return Name(id=value, ctx=Load())
-        else:
-            return value
-    else:
-        left = generate_bin_op(values[:-1])
-        right = generate_bin_op([values[-1]])
-        if left is not None and right is not None:
-            return BinOp(left=left, op=BitOr(), right=right)
-        else:
-            return left or right
+    # folded left to right, in a loop: the union of n values is built in linear time
+    # and doesn't recurse once per value
+    result = _bin_op_operand(values[0])
+    for value in values[1:]:
+        result = BinOp(left=result, op=BitOr(), right=_bin_op_operand(value))
+    return result
 
 
-def convert_asyncapi_property_to_ast_node(
-    pro: dict[str, Any] | None,
-) -> Name | Subscript | Constant | BinOp | None:
-    """Converts an AsyncAPI property to an AST node.
+def _bin_op_operand(value: str | Name | Subscript | Constant | BinOp | None) -> Name | Subscript | Constant | BinOp:
+    if value is None:
+        return Constant(value=None)
+    if isinstance(value, str):
+        return Name(id=value, ctx=Load())
+    return value
+
+
+def type_to_ast_node(type_node: TypeNode) -> Name | Subscript | Constant | BinOp | None:
+    """Converts a type of the IR to an AST annotation node.
 
     Args:
-        pro: The AsyncAPI property to convert
+        type_node: The type to convert
 
     Returns:
-        The AST node representing the property
+        The AST node representing the type
     """
-    match pro:
-        case None:
-            return Constant(value=None)
-        case {"type": "array"}:
-            return _generate_subscript_from_property(pro)
-        case {"type": type_value}:
-            return Name(id=convert_asyncapi_to_python(type_value), ctx=Load())
-        case {"$ref": ref_value}:
-            ref_name = ref_value.replace(SCHEMA_PREFIX, "")
-            return Name(id=convert_asyncapi_to_python(ref_name), ctx=Load())
-        case {"oneOf": one_of_values}:
-            type_nodes = [convert_asyncapi_property_to_ast_node(one_of) for one_of in one_of_values]
-            return generate_bin_op(type_nodes)
+    match type_node:
+        case Primitive(name) | Ref(name):
+            return Name(id=name, ctx=Load())
+        case ListOf(item):
+            return Subscript(value=Name(id="list", ctx=Load()), slice=type_to_ast_node(item), ctx=Load())
+        case DictOf(key, value):
+            elts = [type_to_ast_node(elt) if elt is not None else Name(id="object", ctx=Load()) for elt in (key, value)]
+            return Subscript(value=Name(id="dict", ctx=Load()), slice=Tuple(elts=elts, ctx=Load()), ctx=Load())
+        case Union(options):
+            return generate_bin_op([type_to_ast_node(option) for option in options])
         case _:
             return Constant(value=None)
 
 
-def _generate_subscript_from_property(pro: dict[str, Any]) -> Subscript:
-    """enerate a Subscript node representing a list type from an AsyncAPI array property.
+def snake_case(name: str) -> str:
+    """Convert the name of a model to snake case, e.g. `http_request` for `HTTPRequest`.
 
     Args:
-        pro: Dictionary describing the array property, which may include
-            a reference ($ref) or a type field in its "items" section.
+        name: The name to convert
 
     Returns:
-        The AST Subscript representing a list of the derived item type
-
+        The name in snake case, with the characters not allowed in identifiers replaced by `_`
     """
-    items = pro.get("items", {})
+    for pattern in _WORD_BOUNDARY_PATTERNS:
+        name = pattern.sub(r"\1_\2", name)
+    return re.sub(r"\W", "_", name).lower()
 
-    if "$ref" in items:
-        type_name = items.get("$ref").replace(SCHEMA_PREFIX, "")
-    else:
-        type_name = items.get("type", "")
 
-    item_type = convert_asyncapi_to_python(type_name)
+def convert_asyncapi_property_to_ast_node(
+    pro: dict[str, Any] | None,
+) -> Name | Subscript | Constant | BinOp | None:
+    """Converts an AsyncAPI property to an AST node.
 
-    return Subscript(
-        value=Name(id="list", ctx=Load()),
-        slice=Name(id=item_type, ctx=Load()),
-        ctx=Load(),
-    )
+    Args:
+        pro: The AsyncAPI property to convert
+
+    Returns:
+        The AST node representing the property
+    """
+    return type_to_ast_node(type_from_schema(pro))
 
 
 def create_ast_function_definition(
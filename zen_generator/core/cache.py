@@ -0,0 +1,244 @@
+"""This module contains a content-addressed cache stored on disk."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable
+
+from zen_generator.core.type_system import default_type_registry
+
+CACHE_DIR_ENV = "ZEN_GENERATOR_CACHE_DIR"
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+# bump whenever a change to zen-generator changes the schemas or the documents it generates: the
+# package version alone doesn't change between the commits of a development install
+SCHEMA_FORMAT_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def package_version() -> str:
+    """Return the installed version of zen-generator, part of the keys of the generated content.
+
+    Returns:
+        str: The version, or "unknown" if the package metadata is not available.
+    """
+    try:
+        return version("zen-generator")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def generator_version() -> str:
+    """Return the version of the generated content, part of the keys of the cached schemas and runs.
+
+    Returns:
+        str: The package version and `SCHEMA_FORMAT_VERSION`.
+    """
+    return f"{package_version()}+format.{SCHEMA_FORMAT_VERSION}"
+
+
+def default_cache_dir() -> Path:
+    """Return the directory where zen-generator stores its caches.
+
+    The directory can be overridden with the `ZEN_GENERATOR_CACHE_DIR` environment variable,
+    otherwise it lives in `$XDG_CACHE_HOME/zen-generator` (`~/.cache/zen-generator`).
+
+    Returns:
+        Path: The cache directory.
+    """
+    if override := os.environ.get(CACHE_DIR_ENV):
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "zen-generator"
+
+
+def content_hash(*parts: str) -> str:
+    """Hash the given strings into a cache key.
+
+    Args:
+        *parts: The strings that identify the cached content.
+
+    Returns:
+        str: The hex digest of the parts.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass
+class DiskCache:
+    """A size-bounded key/value cache of text entries stored on disk.
+
+    Every entry is a file named after its key. Reading an entry refreshes its modification
+    time, so when the total size exceeds `max_size` the least recently used entries are evicted.
+    The cache is best effort: I/O errors are treated as misses.
+
+    Attributes:
+        directory (Path): The directory that holds the entries.
+        max_size (int): The maximum size of the cache, in bytes.
+    """
+
+    directory: Path
+    max_size: int = DEFAULT_CACHE_SIZE
+    _size: int | None = field(init=False, repr=False, default=None)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> str | None:
+        """Read an entry from the cache.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            str | None: The cached value, or None if the key is not cached.
+        """
+        path = self._entry_path(key)
+        try:
+            value = path.read_text()
+            os.utime(path)
+        except OSError:
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store an entry in the cache, evicting old entries if the cache is full.
+
+        Args:
+            key (str): The key of the entry.
+            value (str): The value to store.
+        """
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+            tmp_path.write_text(value)
+            try:
+                # an overwritten entry no longer counts towards the size of the cache
+                replaced_size = path.stat().st_size
+            except FileNotFoundError:
+                replaced_size = 0
+            os.replace(tmp_path, path)
+            size = path.stat().st_size - replaced_size
+        except OSError:
+            return
+
+        if self._size is None:
+            self._size = self._current_size()
+        else:
+            self._size += size
+        if self._size > self.max_size:
+            self.evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _current_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in `max_size`."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+        self._size = 0
+
+
+def default_schema_cache() -> DiskCache:
+    """Return the on-disk cache of the schemas built from Python sources.
+
+    Returns:
+        DiskCache: The cache stored in the `schemas` folder of the cache directory.
+    """
+    return DiskCache(default_cache_dir() / "schemas")
+
+
+@dataclass
+class SchemaCache:
+    """Cache of the AsyncAPI schemas built from Python classes and functions.
+
+    Schemas are keyed by the source segment of the node they are built from, so only the
+    classes and functions that have been edited are converted again. The cache also records
+    the output of a whole run, so that a run on unchanged sources can be skipped entirely.
+
+    Attributes:
+        disk (DiskCache): The on-disk storage of the schemas, serialized as JSON.
+        hits (int): The number of schemas read from the cache.
+        misses (int): The number of schemas that had to be built.
+    """
+
+    disk: DiskCache = field(default_factory=default_schema_cache)
+    hits: int = 0
+    misses: int = 0
+
+    def get_or_build(self, kind: str, segment: str, build: Callable[[], Any]) -> Any:
+        """Return the cached schema of a node, building it on a miss.
+
+        Args:
+            kind (str): The kind of node, which keeps the schemas of classes and functions apart.
+            segment (str): The source segment of the node.
+            build (Callable[[], Any]): Builds the schema of the node, it must return JSON serializable data.
+
+        Returns:
+            Any: The schema of the node.
+        """
+        key = content_hash(generator_version(), default_type_registry.fingerprint(), kind, segment)
+        cached = self.disk.get(key)
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        self.misses += 1
+        value = build()
+        self.disk.set(key, json.dumps(value))
+        return value
+
+    def output_is_current(self, fingerprint: str, output: Path) -> bool:
+        """Check whether a run with the given fingerprint already produced `output`.
+
+        Args:
+            fingerprint (str): The fingerprint of the inputs of the run.
+            output (Path): The file written by the run.
+
+        Returns:
+            bool: True if `output` is still the file written by the last run with the same inputs.
+        """
+        recorded = self.disk.get(fingerprint)
+        return recorded is not None and output.is_file() and recorded == content_hash(output.read_text())
+
+    def record_output(self, fingerprint: str, output: Path) -> None:
+        """Record the file written by a run with the given fingerprint.
+
+        Args:
+            fingerprint (str): The fingerprint of the inputs of the run.
+            output (Path): The file written by the run.
+        """
+        self.disk.set(fingerprint, content_hash(output.read_text()))
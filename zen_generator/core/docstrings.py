@@ -0,0 +1,358 @@
+"""This module contains a parser for the docstrings of the functions.
+
+The parser understands the Google, NumPy and Sphinx styles. It finds the headers of the
+sections first, then reads every section with the reader of its style, and returns an
+immutable `ParsedDocstring`. The results are memoised by docstring, so the same docstring
+is only parsed once per process.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Literal, NamedTuple, TypeAlias
+
+DocstringStyle: TypeAlias = Literal["google", "numpy", "sphinx"]
+SectionKind: TypeAlias = Literal["params", "returns", "raises", "other"]
+
+DOCSTRING_CACHE_SIZE = 4096
+
+SECTION_KINDS: dict[str, SectionKind] = {
+    **dict.fromkeys(
+        [
+            "args",
+            "arguments",
+            "parameters",
+            "params",
+            "keyword args",
+            "keyword arguments",
+            "other parameters",
+        ],
+        "params",
+    ),
+    **dict.fromkeys(["returns", "return", "yields", "yield"], "returns"),
+    **dict.fromkeys(["raises", "raise", "exceptions", "except"], "raises"),
+    **dict.fromkeys(
+        [
+            "attributes",
+            "example",
+            "examples",
+            "note",
+            "notes",
+            "references",
+            "see also",
+            "todo",
+            "warning",
+            "warnings",
+            "warns",
+        ],
+        "other",
+    ),
+}
+
+_SECTION_NAMES = "|".join(sorted(map(re.escape, SECTION_KINDS), key=len, reverse=True))
+# `Args:` on its own line; `Returns: text` may also carry its text on the same line
+GOOGLE_SECTION_PATTERN = re.compile(
+    rf"^(?:(?P<name>{_SECTION_NAMES})\s*:|(?P<inline>returns?|yields?)\s*:\s*(?P<text>.+))\s*$", re.IGNORECASE
+)
+NUMPY_UNDERLINE_PATTERN = re.compile(r"^\s*-{3,}\s*$")
+INLINE_SECTIONS = frozenset(["returns", "return", "yields", "yield"])
+SPHINX_FIELDS = frozenset(
+    [
+        *["param", "parameter", "arg", "argument", "key", "keyword", "type"],
+        *["return", "returns", "rtype", "raise", "raises", "except", "exception"],
+    ]
+)
+# `:param type name: text`, the field must be one of `SPHINX_FIELDS`
+SPHINX_FIELD_PATTERN = re.compile(r"^:(?P<field>[a-z]+)(?:\s+(?P<arg>[^:]*))?:\s*(?P<text>.*)$")
+_SPACE = r"[^\S\n]*"
+# `name (type): description`, `name: description` and the legacy `name (): description`; the
+# entries are found in the whole text of a section, every line preceded by its newline, and
+# `(?![^\n])` is the end of the line
+GOOGLE_ENTRY_PATTERN = re.compile(
+    rf"\n(?P<indent>{_SPACE})\*{{0,2}}(?P<name>\w+){_SPACE}(?:\((?P<type>[^)\n]*)\))?{_SPACE}:"
+    r"(?:[^\S\n]+(?P<text>[^\n]*))?(?![^\n])"
+)
+# `name : type` or just `name`, several names can share the same type; matched in a stripped line
+NUMPY_ENTRY_PATTERN = re.compile(r"(?P<names>\*{0,2}\w+(?:\s*,\s*\*{0,2}\w+)*)\s*(?::\s*(?P<type>.*))?$")
+
+
+# the records are named tuples rather than frozen dataclasses: they are as immutable, and much
+# faster to create, which is most of the time spent parsing a docstring
+class DocstringParam(NamedTuple):
+    """A parameter documented in a docstring.
+
+    Attributes:
+        name (str): The name of the parameter.
+        type (str | None): The type written in the docstring, if any.
+        description (str): The description of the parameter.
+    """
+
+    name: str
+    type: str | None = None
+    description: str = ""
+
+
+class DocstringRaises(NamedTuple):
+    """An exception documented in a docstring.
+
+    Attributes:
+        type (str): The type of the exception.
+        description (str): When the exception is raised.
+    """
+
+    type: str
+    description: str = ""
+
+
+class ParsedDocstring(NamedTuple):
+    """The content of a docstring.
+
+    Attributes:
+        description (str): The text that precedes the first section.
+        params (tuple[DocstringParam, ...]): The parameters, in the order they are documented.
+        returns (str | None): The description of the return value, None if it isn't documented.
+        returns_type (str | None): The type of the return value written in the docstring, if any.
+        raises (tuple[DocstringRaises, ...]): The exceptions raised.
+        style (DocstringStyle | None): The style of the sections, None if the docstring has none.
+    """
+
+    description: str = ""
+    params: tuple[DocstringParam, ...] = ()
+    returns: str | None = None
+    returns_type: str | None = None
+    raises: tuple[DocstringRaises, ...] = ()
+    style: DocstringStyle | None = None
+
+    @property
+    def summary(self) -> str:
+        """The first paragraph of the description."""
+        return self.description.split("\n\n", 1)[0].strip()
+
+    @property
+    def param_descriptions(self) -> dict[str, str]:
+        """The description of every parameter, keyed by name."""
+        return {param.name: param.description for param in self.params}
+
+
+# the line of a header, the first line of its section, its kind, None for a Sphinx field, and
+# either the match of the Sphinx field or the text of `Returns: text`
+_Header: TypeAlias = "tuple[int, int, SectionKind | None, re.Match[str] | str | None]"
+# the name, the type and the description of an entry, whose description grows line by line
+_Entry: TypeAlias = "list[Any]"
+
+
+@dataclass
+class _Builder:
+    """Collect the entries of a docstring, in the order they are read."""
+
+    # keyed by name: a parameter documented twice keeps the position of its first entry
+    params: dict[str, DocstringParam] = field(default_factory=dict)
+    # the types of the Sphinx `:type name:` fields
+    param_types: dict[str, str] = field(default_factory=dict)
+    returns: list[str] | None = None
+    returns_type: str | None = None
+    raises: list[DocstringRaises] = field(default_factory=list)
+
+    def add_entries(self, kind: SectionKind, entries: list[_Entry]) -> None:
+        """Add the entries of a params or raises section."""
+        if kind == "params":
+            for name, type_, description in entries:
+                self.params[name] = DocstringParam(name, type_, description)
+        elif kind == "raises":
+            self.raises.extend(DocstringRaises(name, description) for name, _, description in entries)
+
+    def add_returns(self, lines: list[str], type_: str | None = None) -> None:
+        """Add lines, already stripped, to the description of the return value."""
+        self.returns = lines if self.returns is None else self.returns + lines
+        self.returns_type = self.returns_type or type_
+
+    def build(self, description: str, style: DocstringStyle | None) -> ParsedDocstring:
+        params = tuple(self.params.values())
+        if param_types := self.param_types:
+            params = tuple(param._replace(type=param.type or param_types.get(param.name)) for param in params)
+        returns = None if self.returns is None else "\n".join(self.returns).strip()
+        return ParsedDocstring(description, params, returns, self.returns_type, tuple(self.raises), style)
+
+
+def _read_sphinx_field(builder: _Builder, match: re.Match[str], lines: list[str]) -> None:
+    field_name, argument, text = match.groups()
+    argument = argument.strip() if argument else ""
+    continuation = [stripped for line in lines if (stripped := line.strip())] if lines else []
+    if field_name == "type":
+        builder.param_types[argument] = text
+    elif field_name == "rtype":
+        builder.returns_type = text
+        builder.returns = builder.returns or []
+    elif field_name in INLINE_SECTIONS:
+        builder.add_returns([text, *continuation])
+    elif field_name in ("raise", "raises", "except", "exception"):
+        if argument:
+            builder.raises.append(DocstringRaises(argument, " ".join([text, *continuation]).strip()))
+        else:
+            builder.raises.append(DocstringRaises(text, " ".join(continuation)))
+    else:
+        # `:param name:` or `:param type name:`
+        *type_words, name = argument.split() or [""]
+        if continuation:
+            text = " ".join([text, *continuation]).strip()
+        name = name.lstrip("*")
+        builder.params[name] = DocstringParam(name, " ".join(type_words) or None, text)
+
+
+def _entry_indent(lines: list[str]) -> int:
+    """Return the indentation of the first line that isn't blank, the entries can't be deeper."""
+    for line in lines:
+        if content := line.lstrip():
+            return len(line) - len(content)
+    return -1
+
+
+def _read_google_section(builder: _Builder, kind: SectionKind, lines: list[str]) -> None:
+    text = "\n" + "\n".join(lines)
+    entry_indent = _entry_indent(lines)
+    entries: list[_Entry] = []
+    end = 0
+    for match in GOOGLE_ENTRY_PATTERN.finditer(text):
+        indent, name, type_, description = match.groups()
+        if entries:
+            if len(indent) > entry_indent:
+                # a line of the description of the entry
+                continue
+            if match.start() > end:
+                _continue_google_entry(entries[-1], text[end : match.start()])
+        entries.append([name, type_.strip() or None if type_ else None, description.rstrip() if description else ""])
+        end = match.end()
+    if entries and end < len(text):
+        _continue_google_entry(entries[-1], text[end:])
+    builder.add_entries(kind, entries)
+
+
+def _continue_google_entry(entry: _Entry, between: str) -> None:
+    """Add the lines that follow an entry to its description."""
+    if between := between.strip():
+        lines = [stripped for line in between.split("\n") if (stripped := line.strip())]
+        entry[2] = " ".join([entry[2], *lines]).strip()
+
+
+def _numpy_entries(kind: SectionKind, lines: list[str]) -> list[_Entry]:
+    """Read the entries of a NumPy section, with the lines of their descriptions.
+
+    The description of a return value keeps its blank lines.
+    """
+    entries: list[_Entry] = []
+    entry_indent = -1
+    for line in lines:
+        content = line.lstrip()
+        if not content:
+            if kind == "returns" and entries:
+                entries[-1][2].append("")
+            continue
+        indent = len(line) - len(content)
+        if entry_indent < 0:
+            entry_indent = indent
+        if entries and indent > entry_indent:
+            entries[-1][2].append(content.rstrip())
+        elif kind == "returns":
+            # the type of the return value
+            entries.append([None, content.rstrip(), []])
+        elif match := NUMPY_ENTRY_PATTERN.match(content):
+            names, type_ = match.groups()
+            entries.append([names, type_.rstrip() or None if type_ else None, []])
+    return entries
+
+
+def _read_numpy_section(builder: _Builder, kind: SectionKind, lines: list[str]) -> None:
+    entries = _numpy_entries(kind, lines)
+    if kind == "returns":
+        for _, type_, description in entries:
+            builder.add_returns(description, type_)
+        return
+    if kind == "params":
+        # the names of an entry share its type and its description
+        entries = [[name.strip().lstrip("*"), *entry[1:]] for entry in entries for name in entry[0].split(",")]
+    builder.add_entries(kind, [[name, type_, " ".join(description)] for name, type_, description in entries])
+
+
+def _find_headers(lines: list[str]) -> list[_Header]:
+    """Find the lines that start a section or a Sphinx field.
+
+    Only the lines with a colon, and the underlines of the NumPy headers, can start a section,
+    every other line is skipped without being stripped.
+    """
+    headers: list[_Header] = []
+    for index, line in enumerate(lines):
+        if ":" not in line:
+            # the header of a NumPy section, underlined by at least three dashes
+            if (
+                "---" in line
+                and index
+                and not line.strip().strip("-")
+                and (kind := SECTION_KINDS.get(lines[index - 1].strip().lower()))
+            ):
+                headers.append((index - 1, index + 1, kind, None))
+            continue
+        stripped = line.strip()
+        first = stripped[0]
+        if first == ":":
+            if (match := SPHINX_FIELD_PATTERN.match(stripped)) and match["field"] in SPHINX_FIELDS:
+                headers.append((index, index + 1, None, match))
+        elif stripped[-1] == ":" and (kind := SECTION_KINDS.get(stripped[:-1].rstrip().lower())):
+            headers.append((index, index + 1, kind, None))
+        elif first in "RrYy":
+            name, _, text = stripped.partition(":")
+            if name.rstrip().lower() in INLINE_SECTIONS and (text := text.strip()):
+                headers.append((index, index + 1, "returns", text))
+    return headers
+
+
+def _parse(docstring: str) -> ParsedDocstring:
+    lines = docstring.expandtabs().splitlines()
+    headers = _find_headers(lines) if ":" in docstring or "---" in docstring else []
+    if not headers:
+        # no section, no field: the docstring is just a description
+        return ParsedDocstring("\n".join(lines).strip())
+
+    builder = _Builder()
+    # every section ends where the next header starts
+    ends = [header[0] for header in headers[1:]]
+    ends.append(len(lines))
+    for (index, start, kind, header), end in zip(headers, ends):
+        section = lines[start:end]
+        if kind is None:
+            _read_sphinx_field(builder, header, section)
+        elif kind == "other":
+            pass
+        elif start > index + 1:
+            _read_numpy_section(builder, kind, section)
+        elif header:
+            # `Returns: text`
+            builder.add_returns([header, *(line.strip() for line in section)])
+        elif kind == "returns":
+            # a Google returns section is free text
+            if section:
+                builder.add_returns([line.strip() for line in section])
+        else:
+            _read_google_section(builder, kind, section)
+
+    index, start, kind, _ = headers[0]
+    style: DocstringStyle = "sphinx" if kind is None else "numpy" if start > index + 1 else "google"
+    return builder.build("\n".join(lines[:index]).strip(), style)
+
+
+@lru_cache(maxsize=DOCSTRING_CACHE_SIZE)
+def parse_docstring(docstring: str) -> ParsedDocstring:
+    """Parse a Google, NumPy or Sphinx style docstring.
+
+    The results are cached by docstring: the returned object is immutable and shared by
+    every caller parsing the same docstring.
+
+    Args:
+        docstring (str): The docstring, as returned by `ast.get_docstring`.
+
+    Returns:
+        ParsedDocstring: The description, the parameters, the return value and the exceptions
+        documented in the docstring.
+    """
+    return _parse(docstring)
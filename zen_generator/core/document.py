@@ -0,0 +1,198 @@
+"""This module contains a lazy, read-only view over YAML documents.
+
+The YAML event stream is scanned once to index the sections of the document, and the
+sections are built into Python objects only when they are accessed. For an AsyncAPI
+document this means that, for example, `components.schemas` can be read without ever
+building `components.messages`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+import yaml
+from yaml.events import (
+    AliasEvent,
+    CollectionStartEvent,
+    DocumentStartEvent,
+    Event,
+    MappingEndEvent,
+    MappingStartEvent,
+    NodeEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    StreamEndEvent,
+)
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+from zen_generator.core.exception import InvalidFile
+from zen_generator.core.io import YamlLoader
+
+DEFAULT_LAZY_DEPTH = 2
+STRING_TAG = "tag:yaml.org,2002:str"
+_resolver = Resolver()
+
+
+class _NotIndexable(Exception):
+    """The document uses a feature that prevents building sections independently."""
+
+
+@dataclass(frozen=True)
+class _Span:
+    """The position of a node in the source text."""
+
+    start: int
+    end: int
+    column: int
+
+
+class LazyMapping(Mapping[Any, Any]):
+    """A read-only mapping whose values are built from the source text on first access.
+
+    Values that are themselves indexed are returned as nested `LazyMapping` objects,
+    every other value is built once with the YAML loader and then reused.
+    """
+
+    def __init__(self, text: str, children: dict[Any, _Span | LazyMapping]) -> None:
+        self._text = text
+        self._children = children
+        self._values: dict[Any, Any] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in self._values:
+            return self._values[key]
+        child = self._children[key]
+        value = child if isinstance(child, LazyMapping) else _load_span(self._text, child)
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._children)
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._children
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._children)!r})"
+
+    @property
+    def loaded_keys(self) -> list[Any]:
+        """The keys whose values have already been built."""
+        return list(self._values)
+
+    def to_dict(self) -> dict[Any, Any]:
+        """Build the whole mapping as plain Python objects.
+
+        Returns:
+            dict: The mapping with every nested `LazyMapping` converted to a dict.
+        """
+        return {key: value.to_dict() if isinstance(value, LazyMapping) else value for key, value in self.items()}
+
+
+def _load_span(text: str, span: _Span) -> Any:
+    # the node is re-indented to its original column, so that block collections
+    # spanning several lines keep a consistent indentation
+    return yaml.load(" " * span.column + text[span.start : span.end], Loader=YamlLoader)
+
+
+def _check_node(event: Event) -> None:
+    if isinstance(event, AliasEvent) or (isinstance(event, NodeEvent) and event.anchor is not None):
+        raise _NotIndexable("anchors and aliases can't be resolved across sections")
+
+
+def _skip_node(events: Iterator[Event], event: Event) -> int:
+    """Consume the events of the node started by `event` and return its end index."""
+    _check_node(event)
+    if not isinstance(event, CollectionStartEvent):
+        return event.end_mark.index
+
+    nesting = 1
+    while nesting:
+        event = next(events)
+        _check_node(event)
+        if isinstance(event, CollectionStartEvent):
+            nesting += 1
+        elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+            nesting -= 1
+    return event.end_mark.index
+
+
+def _load_key(text: str, event: Event) -> Any:
+    if not isinstance(event, ScalarEvent):
+        raise _NotIndexable("only scalar keys can be indexed")
+    tag = event.tag
+    if tag is None:
+        tag = _resolver.resolve(ScalarNode, event.value, event.implicit) if event.implicit[0] else STRING_TAG
+    if tag == STRING_TAG:
+        return event.value
+    return yaml.load(text[event.start_mark.index : event.end_mark.index], Loader=YamlLoader)
+
+
+def _index_mapping(text: str, events: Iterator[Event], depth: int) -> LazyMapping:
+    """Index the mapping whose start event has just been consumed."""
+    children: dict[Any, _Span | LazyMapping] = {}
+    while not isinstance(event := next(events), MappingEndEvent):
+        _check_node(event)
+        key = _load_key(text, event)
+        value_event = next(events)
+        if depth > 1 and isinstance(value_event, MappingStartEvent) and value_event.anchor is None:
+            children[key] = _index_mapping(text, events, depth - 1)
+        else:
+            end = _skip_node(events, value_event)
+            start_mark = value_event.start_mark
+            children[key] = _Span(start_mark.index, end, start_mark.column)
+    return LazyMapping(text, children)
+
+
+def load_lazy_yaml(text: str, depth: int = DEFAULT_LAZY_DEPTH) -> Any:
+    """Load a YAML document, building its sections only when they are accessed.
+
+    Args:
+        text: The YAML document.
+        depth: How many levels of nested mappings are indexed. The values below this depth
+            are built as a whole on first access.
+
+    Returns:
+        A `LazyMapping` if the document is a mapping, otherwise the loaded document. Documents
+        using anchors and aliases, or that can't be indexed, are loaded eagerly.
+    """
+    # the spans index the text, which must not start with the byte order mark the loader skips
+    text = text.removeprefix("\ufeff")
+    events = yaml.parse(text, Loader=YamlLoader)
+    try:
+        for event in events:
+            if isinstance(event, DocumentStartEvent) and event.tags:
+                raise _NotIndexable("tag directives apply to the whole document")
+            if isinstance(event, MappingStartEvent) and event.anchor is None:
+                return _index_mapping(text, events, depth)
+            if isinstance(event, (NodeEvent, StreamEndEvent)):
+                break
+    except (_NotIndexable, yaml.YAMLError):
+        # the eager loader raises the error again if the document is invalid
+        pass
+    return yaml.load(text, Loader=YamlLoader)
+
+
+def load_lazy_yaml_file(source: Path, depth: int = DEFAULT_LAZY_DEPTH) -> Any:
+    """Load a YAML file, building its sections only when they are accessed.
+
+    Args:
+        source: The path of the file to load.
+        depth: How many levels of nested mappings are indexed.
+
+    Returns:
+        The loaded YAML file, see `load_lazy_yaml`.
+    """
+    if source.is_file():
+        return load_lazy_yaml(source.read_text(encoding="utf-8-sig"), depth)
+    elif source.is_dir():
+        raise InvalidFile("The source is a directory", source)
+    elif not source.exists():
+        raise InvalidFile("The source doesn't exist", source)
+    return None
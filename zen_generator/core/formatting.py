@@ -2,9 +2,250 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
+from typing import Mapping, Sequence
+
+from zen_generator.core.cache import DiskCache, content_hash, default_cache_dir
+from zen_generator.core.hooks import Hook, stage
+
+RUFF_CONFIG_FILES = (".ruff.toml", "ruff.toml", "pyproject.toml")
+
+
+@lru_cache(maxsize=1)
+def find_ruff_binary() -> str:
+    """Resolve the ruff executable once per process.
+
+    The binary shipped with the `ruff` wheel is preferred, so that the formatter does not
+    depend on the shell `PATH`.
+
+    Returns:
+        str: The path of the ruff executable, or "ruff" if it can't be resolved.
+    """
+    try:
+        from ruff.__main__ import find_ruff_bin
+
+        return str(find_ruff_bin())
+    except (ImportError, FileNotFoundError):
+        return "ruff"
+
+
+def find_ruff_config(start: Path | None = None) -> Path | None:
+    """Find the ruff configuration file that applies to the generated code.
+
+    The lookup mirrors the one done by ruff for files outside a project: the current working
+    directory and its parents are searched for a `.ruff.toml`, `ruff.toml` or a `pyproject.toml`
+    with a `[tool.ruff]` section.
+
+    Args:
+        start (Path | None): The directory where the lookup starts. Defaults to the current working directory.
+
+    Returns:
+        Path | None: The configuration file, or None if no configuration is found.
+    """
+    directory = (start or Path.cwd()).resolve()
+    for candidate_dir in (directory, *directory.parents):
+        for file_name in RUFF_CONFIG_FILES:
+            candidate = candidate_dir / file_name
+            if not candidate.is_file():
+                continue
+            if file_name != "pyproject.toml" or "[tool.ruff" in candidate.read_text():
+                return candidate
+    return None
+
+
+def default_formatting_cache() -> DiskCache:
+    """Return the on-disk cache of formatted code.
+
+    Returns:
+        DiskCache: The cache stored in the `formatting` folder of the cache directory.
+    """
+    return DiskCache(default_cache_dir() / "formatting")
+
+
+@dataclass
+class RuffFormatter:
+    """Formatter service that runs ruff on the generated code.
+
+    The ruff binary and its configuration are resolved once, when the service is created.
+    Single snippets are formatted through stdin/stdout, while `write_files` formats every file
+    of a run with one `ruff check` and one `ruff format` invocation.
+
+    Formatted code is stored in a content-addressed cache keyed by the unformatted code, the
+    ruff version and the ruff configuration, so unchanged code is never formatted twice.
+
+    Attributes:
+        enabled (bool): Whether the code is formatted at all. When False the code is returned untouched.
+        ruff_bin (str): The ruff executable.
+        config_file (Path | None): The ruff configuration file passed to every invocation.
+        cache (DiskCache | None): The cache of formatted code. None disables caching.
+    """
+
+    enabled: bool = True
+    ruff_bin: str = field(default_factory=find_ruff_binary)
+    config_file: Path | None = field(default_factory=find_ruff_config)
+    cache: DiskCache | None = field(default_factory=default_formatting_cache)
+
+    @cached_property
+    def ruff_version(self) -> str:
+        """The version of ruff, part of every cache key."""
+        try:
+            return version("ruff")
+        except PackageNotFoundError:
+            try:
+                return self._run([self.ruff_bin, "--version"]).strip()
+            except (OSError, subprocess.CalledProcessError):
+                return ""
+
+    @cached_property
+    def config_text(self) -> str:
+        """The content of the ruff configuration, part of every cache key."""
+        return self.config_file.read_text() if self.config_file is not None else ""
+
+    def cache_key(self, code: str) -> str:
+        """Compute the cache key of a snippet of unformatted code.
+
+        Args:
+            code (str): The unformatted code.
+
+        Returns:
+            str: The cache key.
+        """
+        return content_hash(self.ruff_version, self.config_text, code)
+
+    def _cached(self, code: str) -> str | None:
+        return self.cache.get(self.cache_key(code)) if self.cache is not None else None
+
+    def _store(self, code: str, formatted: str) -> None:
+        if self.cache is not None:
+            self.cache.set(self.cache_key(code), formatted)
+
+    def _command(self, *args: str) -> list[str]:
+        command = [self.ruff_bin, *args]
+        if self.config_file is not None:
+            command.extend(["--config", str(self.config_file)])
+        return command
+
+    def _run(self, command: list[str], stdin: str | None = None) -> str:
+        result = subprocess.run(command, input=stdin, check=True, capture_output=True, text=True)
+        return result.stdout
+
+    def format_code(self, code: str) -> str:
+        """Format python code using Ruff.
+
+        Args:
+            code (str): Python code to format
+
+        Returns:
+            str: Formatted python code if successful, original code otherwise.
+        """
+        if not self.enabled:
+            return code
+
+        cached = self._cached(code)
+        if cached is not None:
+            return cached
+
+        try:
+            # https://docs.astral.sh/ruff/formatter/#line-breaks
+            # ruff check --select I --fix
+            sorted_code = self._run(
+                self._command("check", "--select", "I", "--fix", "--exit-zero", "--quiet", "-"),
+                stdin=code,
+            )
+            # ruff format
+            formatted_code = self._run(self._command("format", "--quiet", "-"), stdin=sorted_code)
+        except (OSError, subprocess.CalledProcessError):
+            return code
+
+        self._store(code, formatted_code)
+        return formatted_code
+
+    def format_files(self, paths: Sequence[Path]) -> bool:
+        """Format the given files in place with a single batched ruff run.
+
+        Args:
+            paths (Sequence[Path]): The files to format.
+
+        Returns:
+            bool: True if every file has been formatted, False otherwise.
+        """
+        if not self.enabled or not paths:
+            return False
+
+        files = [str(path) for path in paths]
+        try:
+            self._run(self._command("check", "--select", "I", "--fix", "--exit-zero", "--quiet", *files))
+            self._run(self._command("format", "--quiet", *files))
+        except (OSError, subprocess.CalledProcessError):
+            # the files have already been written unformatted, which is the same fallback as `format_code`
+            return False
+        return True
+
+    def write_files(self, sources: Mapping[Path, str], hooks: Sequence[Hook] = ()) -> None:
+        """Write the given sources to disk and format them.
+
+        Cached sources are written already formatted, the others are formatted together
+        with a single batched ruff run and then stored in the cache.
+
+        Args:
+            sources (Mapping[Path, str]): The python code to write, keyed by destination path.
+            hooks (Sequence[Hook]): The hooks of the "write" and "format" stages.
+        """
+        pending: dict[Path, str] = {}
+        with stage(hooks, "write", files=lambda: len(sources), cached=lambda: len(sources) - len(pending)):
+            for destination, code in sources.items():
+                cached = self._cached(code) if self.enabled else None
+                if cached is None:
+                    pending[destination] = code
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                with open(destination, mode="w") as f:
+                    f.write(code if cached is None else cached)
+
+        with stage(hooks, "format", files=lambda: len(pending) if self.enabled else 0):
+            if self.format_files(list(pending)):
+                for destination, code in pending.items():
+                    self._store(code, destination.read_text())
+
+    def format_sources(self, sources: Mapping[Path, str], hooks: Sequence[Hook] = ()) -> dict[Path, str]:
+        """Format the given sources in memory, without writing them to disk.
+
+        Every source is formatted with `format_code`, through the stdin of its own ruff
+        processes. The sources that aren't cached are formatted concurrently, and the same
+        code is formatted only once.
+
+        Args:
+            sources (Mapping[Path, str]): The python code to format, keyed by destination path.
+            hooks (Sequence[Hook]): The hooks of the "format" stage.
+
+        Returns:
+            dict[Path, str]: The formatted code, keyed by destination path.
+        """
+        codes = list(dict.fromkeys(sources.values()))
+        with stage(hooks, "format", files=lambda: len(codes) if self.enabled else 0):
+            if not self.enabled or len(codes) < 2:
+                formatted = [self.format_code(code) for code in codes]
+            else:
+                # ruff runs in subprocesses, the threads only wait for them
+                with ThreadPoolExecutor(max_workers=min(len(codes), os.cpu_count() or 1)) as executor:
+                    formatted = list(executor.map(self.format_code, codes))
+        by_code = dict(zip(codes, formatted))
+        return {destination: by_code[code] for destination, code in sources.items()}
+
+
+@lru_cache(maxsize=1)
+def get_default_formatter() -> RuffFormatter:
+    """Return the formatter service shared by the whole process.
+
+    Returns:
+        RuffFormatter: The default formatter service.
+    """
+    return RuffFormatter()
 
 
 def format_python_code(code: str) -> str:
@@ -18,29 +259,4 @@ def format_python_code(code: str) -> str:
     Returns:
         str: Formatted python code if successful, original code otherwise.
     """
-    with tempfile.NamedTemporaryFile(suffix=".py", mode="w+", delete=False) as tmp:
-        tmp.write(code)
-        tmp_path = Path(tmp.name)
-
-    try:
-        # https://docs.astral.sh/ruff/formatter/#line-breaks
-        # ruff check --select I --fix
-        subprocess.run(
-            ["ruff", "check", "--select", "I", "--fix", str(tmp_path)],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        # ruff format
-        subprocess.run(
-            ["ruff", "format", str(tmp_path)],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        formatted_code: str = tmp_path.read_text()
-        return formatted_code
-    except subprocess.CalledProcessError:
-        return code
-    finally:
-        tmp_path.unlink(missing_ok=True)
+    return get_default_formatter().format_code(code)
@@ -0,0 +1,165 @@
+"""This module contains the hooks that observe the runs of the generators.
+
+A run of a generator is made of stages, e.g. "load" or "format", and a stage emits items, e.g.
+the class of a schema or the function of an operation. A hook is told when every run, stage and
+item starts and ends. The generators take a sequence of hooks, and don't build any event when
+the sequence is empty.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterator, Mapping, Sequence
+
+# returned instead of a new context manager when there are no hooks, it can be entered many times
+NO_HOOKS: ContextManager[None] = nullcontext()
+
+
+class Hook:
+    """The base class of the hooks, every method does nothing.
+
+    The events of a run are nested: a run contains stages, and a stage contains items. A stage
+    run inside another one, e.g. the "write" stage of `RuffFormatter.write_files`, is nested too.
+    The end events are sent even when the run, the stage or the item raises, a stage that raises
+    ends without counts.
+    """
+
+    def run_start(self, name: str) -> None:
+        """Called when a run starts.
+
+        Args:
+            name (str): The name of the application the run generates.
+        """
+
+    def run_end(self, name: str) -> None:
+        """Called when a run ends.
+
+        Args:
+            name (str): The name of the application the run generates.
+        """
+
+    def stage_start(self, name: str) -> None:
+        """Called when a stage starts.
+
+        Args:
+            name (str): The name of the stage, e.g. "load" or "format".
+        """
+
+    def stage_end(self, name: str, counts: Mapping[str, int]) -> None:
+        """Called when a stage ends.
+
+        Args:
+            name (str): The name of the stage.
+            counts (Mapping[str, int]): What the stage processed, e.g. the number of schemas, see
+                `StageCounts`.
+        """
+
+    def item_start(self, kind: str, name: str) -> None:
+        """Called when a stage starts emitting an item.
+
+        Args:
+            kind (str): The kind of the item, "schema" or "operation".
+            name (str): The name of the schema or of the operation.
+        """
+
+    def item_end(self, kind: str, name: str) -> None:
+        """Called when a stage has emitted an item.
+
+        Args:
+            kind (str): The kind of the item, "schema" or "operation".
+            name (str): The name of the schema or of the operation.
+        """
+
+
+def run(hooks: Sequence[Hook], name: str) -> ContextManager[None]:
+    """Send the start and end events of the run of the `with` statement to the hooks.
+
+    Args:
+        hooks (Sequence[Hook]): The hooks.
+        name (str): The name of the application the run generates.
+
+    Returns:
+        ContextManager[None]: The context manager that sends the events.
+    """
+    return _events(hooks, "run", name) if hooks else NO_HOOKS
+
+
+def stage(hooks: Sequence[Hook], name: str, **counts: Callable[[], int]) -> ContextManager[None]:
+    """Send the start and end events of the stage of the `with` statement to the hooks.
+
+    Args:
+        hooks (Sequence[Hook]): The hooks.
+        name (str): The name of the stage.
+        **counts (Callable[[], int]): The counts of the stage, computed when a hook reads them
+            after the stage ends, and only if there are hooks.
+
+    Returns:
+        ContextManager[None]: The context manager that sends the events.
+    """
+    return _stage(hooks, name, counts) if hooks else NO_HOOKS
+
+
+def item(hooks: Sequence[Hook], kind: str, name: str) -> ContextManager[None]:
+    """Send the start and end events of the item emitted in the `with` statement to the hooks.
+
+    Args:
+        hooks (Sequence[Hook]): The hooks.
+        kind (str): The kind of the item, "schema" or "operation".
+        name (str): The name of the schema or of the operation.
+
+    Returns:
+        ContextManager[None]: The context manager that sends the events.
+    """
+    return _events(hooks, "item", kind, name) if hooks else NO_HOOKS
+
+
+@contextmanager
+def _events(hooks: Sequence[Hook], event: str, *args: str) -> Iterator[None]:
+    for hook in hooks:
+        getattr(hook, f"{event}_start")(*args)
+    try:
+        yield
+    finally:
+        # the hooks are closed in the reverse order, like nested `with` statements
+        for hook in reversed(hooks):
+            getattr(hook, f"{event}_end")(*args)
+
+
+class StageCounts(Mapping[str, int]):
+    """The counts of a stage, computed once, on first access.
+
+    A hook that measures the stage should read its clocks before the counts, so that counting
+    isn't part of the measure.
+    """
+
+    def __init__(self, counts: Mapping[str, Callable[[], int]]) -> None:
+        self._counts = counts
+        self._values: dict[str, int] | None = None
+
+    def _computed(self) -> dict[str, int]:
+        if self._values is None:
+            self._values = {key: count() for key, count in self._counts.items()}
+        return self._values
+
+    def __getitem__(self, key: str) -> int:
+        return self._computed()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._computed())
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+@contextmanager
+def _stage(hooks: Sequence[Hook], name: str, counts: Mapping[str, Callable[[], int]]) -> Iterator[None]:
+    for hook in hooks:
+        hook.stage_start(name)
+    # what a stage that raises counts may not exist
+    values = StageCounts({})
+    try:
+        yield
+        values = StageCounts(counts)
+    finally:
+        for hook in reversed(hooks):
+            hook.stage_end(name, values)
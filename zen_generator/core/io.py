@@ -5,26 +5,46 @@ from __future__ import annotations
 import json
 from ast import Module, fix_missing_locations, parse, unparse
 from pathlib import Path
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, Mapping, Sequence
 
 import yaml
 
 from zen_generator.core.exception import InvalidFile
-from zen_generator.core.formatting import format_python_code
+from zen_generator.core.formatting import RuffFormatter, get_default_formatter
+from zen_generator.core.hooks import Hook, stage
+from zen_generator.core.profiling import count_lines
 
+try:
+    # libyaml bindings are an order of magnitude faster than the pure Python implementation
+    from yaml import CSafeDumper as BaseYamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML has been built
+    from yaml import SafeDumper as BaseYamlDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as YamlLoader  # type: ignore[assignment]
+
+
+class YamlDumper(BaseYamlDumper):
+    """YAML dumper that writes shared objects in full instead of using anchors and aliases.
+
+    Schemas built from the same annotation are shared, but the generated document must
+    spell out every one of them.
+    """
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return True
 
-def parse_python_file_to_ast(source: Path) -> Module | None:
-    """Parse a Python file to its AST.
+
+def read_source_file(source: Path) -> str | None:
+    """Read a source file as text.
 
     Args:
-        source: The path of the file to parse.
+        source: The path of the file to read.
 
     Returns:
-        The parsed AST or None if the file is a directory or doesn't exist.
+        The content of the file or None if the file can't be read.
     """
     if source.is_file():
-        source_text = source.read_text()
-        return parse(source_text)
+        return source.read_text()
     elif source.is_dir():
         raise InvalidFile("The source is a directory", source)
     elif not source.exists():
@@ -32,6 +52,19 @@ def parse_python_file_to_ast(source: Path) -> Module | None:
     return None
 
 
+def parse_python_file_to_ast(source: Path) -> Module | None:
+    """Parse a Python file to its AST.
+
+    Args:
+        source: The path of the file to parse.
+
+    Returns:
+        The parsed AST or None if the file is a directory or doesn't exist.
+    """
+    source_text = read_source_file(source)
+    return parse(source_text) if source_text is not None else None
+
+
 def load_yaml(source: Path) -> dict[str, Any] | None:
     """Load a YAML file as a dictionary.
 
@@ -44,7 +77,7 @@ def load_yaml(source: Path) -> dict[str, Any] | None:
     """
     if source.is_file():
         with open(source, "r") as file:
-            return yaml.safe_load(file)
+            return yaml.load(file, Loader=YamlLoader)
     elif source.is_dir():
         raise InvalidFile("The source is a directory", source)
     elif not source.exists():
@@ -71,13 +104,14 @@ def write_asyncapi_schema(
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     if format_type == "yaml":
-        content = yaml.dump(schema, default_flow_style=False)
         file_path = output_path.with_suffix(".yaml")
+        with open(file_path, mode="w") as f:
+            yaml.dump(schema, f, Dumper=YamlDumper, default_flow_style=False)
     else:
-        content = json.dumps(schema, indent=2)
         file_path = output_path.with_suffix(".json")
+        with open(file_path, mode="w") as f:
+            json.dump(schema, f, indent=2)
 
-    file_path.write_text(content)
     print(f"Schema AsyncAPI generato: {file_path}")
 
 
@@ -93,16 +127,29 @@ def save_yaml_file(async_api_content: dict[str, Any] | None, destination: Path,
         destination: The path of the file to write.
         app_name: The name of the application.
     """
-    async_api_content = async_api_content or {}
     if destination.is_dir():
         destination = destination / Path(f"{app_name}.yml")
 
-    dumped = yaml.dump(async_api_content, default_flow_style=False, sort_keys=False)
     with open(destination, mode="w") as f:
-        f.write(dumped)
+        # the document is streamed to the file, it is never built as a whole string
+        yaml.dump(async_api_content or {}, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
+
+
+def dump_yaml(async_api_content: dict[str, Any] | None) -> str:
+    """Dump the AsyncAPI content as YAML text, in the order of its keys.
+
+    This is the in-memory counterpart of `save_yaml_file`, which streams the dump to the file.
+
+    Args:
+        async_api_content: The AsyncAPI content to dump.
+
+    Returns:
+        The YAML text.
+    """
+    return yaml.dump(async_api_content or {}, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
 
 
-def save_python_file(function_body: list[Any], destination: Path) -> None:
+def save_python_file(function_body: list[Any], destination: Path, formatter: RuffFormatter | None = None) -> None:
     """Save the Python code to a file.
 
     Save the provided Python code to the specified destination file. The code
@@ -111,9 +158,60 @@ def save_python_file(function_body: list[Any], destination: Path) -> None:
     Args:
         function_body: The Python code to write.
         destination: The path of the file to write.
+        formatter: The formatter service to use. Defaults to the process wide formatter.
     """
-    python_module = Module(body=function_body, type_ignores=[])
-    python_file_content = unparse(fix_missing_locations(python_module))
-    python_file_content = format_python_code(python_file_content)
-    with open(destination, mode="w") as f:
-        f.write(python_file_content)
+    save_python_files({destination: function_body}, formatter)
+
+
+def save_python_files(
+    modules: Mapping[Path, list[Any]],
+    formatter: RuffFormatter | None = None,
+    hooks: Sequence[Hook] = (),
+) -> None:
+    """Save several Python modules and format them with a single formatter run.
+
+    Args:
+        modules: The Python code to write, keyed by destination path.
+        formatter: The formatter service to use. Defaults to the process wide formatter.
+        hooks: The hooks of the "unparse", "write" and "format" stages.
+    """
+    formatter = formatter or get_default_formatter()
+    formatter.write_files(unparse_modules(modules, hooks), hooks)
+
+
+def render_python_files(
+    modules: Mapping[Path, list[Any]],
+    formatter: RuffFormatter | None = None,
+    hooks: Sequence[Hook] = (),
+) -> dict[Path, str]:
+    """Return the formatted code of several Python modules, without writing them to disk.
+
+    Args:
+        modules: The Python code to render, keyed by destination path.
+        formatter: The formatter service to use. Defaults to the process wide formatter.
+        hooks: The hooks of the "unparse" and "format" stages.
+
+    Returns:
+        The formatted code, keyed by destination path.
+    """
+    formatter = formatter or get_default_formatter()
+    return formatter.format_sources(unparse_modules(modules, hooks), hooks)
+
+
+def unparse_modules(modules: Mapping[Path, list[Any]], hooks: Sequence[Hook] = ()) -> dict[Path, str]:
+    """Return the unformatted code of several Python modules.
+
+    Args:
+        modules: The statements of every module, keyed by destination path.
+        hooks: The hooks of the "unparse" stage.
+
+    Returns:
+        The code, keyed by destination path.
+    """
+    sources: dict[Path, str] = {}
+    with stage(hooks, "unparse", files=lambda: len(sources), lines=lambda: count_lines(sources.values())):
+        sources = {
+            destination: unparse(fix_missing_locations(Module(body=body, type_ignores=[])))
+            for destination, body in modules.items()
+        }
+    return sources
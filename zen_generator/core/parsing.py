@@ -7,16 +7,17 @@ and are used to generate Python code from AsyncAPI specifications.
 
 from __future__ import annotations
 
-import re
-from ast import AsyncFunctionDef, FunctionDef, Module, get_docstring, walk
-from typing import Any
+from ast import AsyncFunctionDef, FunctionDef, Module, get_docstring
+from typing import Any, cast
 
-from zen_generator.core.ast_utils import convert_annotations_to_asyncapi_schemas, parse_type_annotation
+from zen_generator.core.ast_utils import annotation_schema_cache
+from zen_generator.core.cache import SchemaCache
+from zen_generator.core.docstrings import parse_docstring
+from zen_generator.core.symbols import build_module_index
 
-# Define regular expressions for Args and Returns sections
-ARGS_PATTERN = re.compile(r"Args:(.*?)(?:Returns|$)", re.DOTALL)
-RETURNS_PATTERN = re.compile(r"Returns:(.*?)$", re.DOTALL)
-ARGS_DESCRIPTION_PATTERN = r"\s*([\w_]+)\s*\(\)\s*:\s*([^(\n)]+)"
+# marks the payload of a response that is never None; `format: required` is used when the type of
+# the payload has no format of its own, which the marker would override
+REQUIRED_RESPONSE_KEY = "x-required"
 
 
 def function_to_asyncapi_schemas(
@@ -32,17 +33,10 @@ def function_to_asyncapi_schemas(
     """
     name = function_node.name
     docstring = get_docstring(function_node) or ""
+    parsed_docstring = parse_docstring(docstring)
 
-    args_match = ARGS_PATTERN.search(docstring)
-    returns_match = RETURNS_PATTERN.search(docstring)
-
-    parameters_description = {}
-    if args_match:
-        args_section = args_match.group(1).strip()
-        parameters_description = dict(re.findall(ARGS_DESCRIPTION_PATTERN, args_section))
-
-    request_schema = _create_request_schema(function_node, name, docstring, parameters_description)
-    response_schema = _create_response_schema(function_node, name, docstring, returns_match)
+    request_schema = _create_request_schema(function_node, name, docstring, parsed_docstring.param_descriptions)
+    response_schema = _create_response_schema(function_node, name, parsed_docstring.returns or "")
 
     return request_schema, response_schema
 
@@ -79,16 +73,14 @@ def _create_request_schema(
 
     for param in function_node.args.args:
         property_name = param.arg
-        items = parse_type_annotation(param.annotation)
-        conv = convert_annotations_to_asyncapi_schemas(items)
+        is_required, property_schema = annotation_schema_cache.convert(param.annotation)
         description = parameters_description.get(param.arg, "")
 
-        if conv.get("required"):
+        if is_required:
             request_payload["required"].append(property_name)
-            del conv["required"]
 
-        request_payload["properties"][property_name] = conv.get("properties")
-        request_payload["properties"][property_name]["description"] = description
+        # the schema is shared by every occurrence of the annotation: copy it before adding the description
+        request_payload["properties"][property_name] = {**property_schema, "description": description}
 
     return request_schema
 
@@ -96,49 +88,49 @@ def _create_request_schema(
 def _create_response_schema(
     function_node: FunctionDef | AsyncFunctionDef,
     name: str,
-    docstring: str,
-    returns_match: re.Match | None,
+    response_description: str,
 ) -> dict[str, Any]:
     """Convert a function definition to AsyncAPI response schema.
 
     Args:
         function_node: The function definition node
         name: The name of the function
-        docstring: The docstring of the function
-        returns_match: A regular expression match object for the "Returns" section
+        response_description: The description of the return value, from the docstring
 
     Returns:
         A dictionary representing the response schema
     """
-    response_description = ""
-    if returns_match:
-        response_description = returns_match.group(1).strip()
-    elif "Returns:" in docstring:
-        start_returns = docstring.find("Returns:") + len("Returns:")
-        response_description = docstring[start_returns:].strip()
-
     response_schema = {
         "title": f"Response params for {name}",
         "summary": "",
         "description": response_description,
     }
 
-    return_type = parse_type_annotation(function_node.returns)
-    properties = convert_annotations_to_asyncapi_schemas(return_type)
-    response_payload = properties.get("properties", {})
+    is_required, response_payload = annotation_schema_cache.convert(function_node.returns)
+    if is_required:
+        # the schema is shared by every occurrence of the annotation: copy it before marking it as required.
+        # Types with a format of their own (datetime, UUID, ...) keep it and are marked with a key of their own
+        marker = {REQUIRED_RESPONSE_KEY: True} if "format" in response_payload else {"format": "required"}
+        response_payload = {**response_payload, **marker}
     response_schema["payload"] = response_payload
 
-    if properties.get("required") and isinstance(response_payload, dict):
-        response_payload["format"] = "required"
-
     return response_schema
 
 
-def function_content_reader(tree: Module | None) -> tuple[str | None, dict[str, Any]]:
+def function_content_reader(
+    tree: Module | None,
+    source: str | None = None,
+    cache: SchemaCache | None = None,
+) -> tuple[str | None, dict[str, Any]]:
     """Read function content from a tree of nodes.
 
     Args:
         tree: The root node of the tree
+        source: The source code of the tree, required to look up the schemas in the cache
+        cache: The cache of the schemas, keyed by the source segment of every function
+
+    Only the functions defined at the top level of the module are read: methods and nested
+    helpers are not operations.
 
     Returns:
         A tuple containing the docstring of the tree and a dictionary of functions
@@ -148,10 +140,16 @@ def function_content_reader(tree: Module | None) -> tuple[str | None, dict[str,
     functions_docstring = get_docstring(tree) if tree else ""
     functions_to_async: dict[str, Any] = {}
 
-    if tree is not None:
-        for node in walk(tree):
-            if isinstance(node, (FunctionDef, AsyncFunctionDef)):
-                request, response = function_to_asyncapi_schemas(node)
-                functions_to_async.update({f"{node.name}": {"request": request, "response": response}})
+    index = build_module_index(tree, source)
+    for symbol in index.functions.values():
+        node = cast(FunctionDef | AsyncFunctionDef, symbol.node)
+        segment = index.segment(node) if cache is not None else None
+        if segment is not None and cache is not None:
+            request, response = cache.get_or_build(
+                "function", segment, lambda node=node: function_to_asyncapi_schemas(node)
+            )
+        else:
+            request, response = function_to_asyncapi_schemas(node)
+        functions_to_async.update({f"{node.name}": {"request": request, "response": response}})
 
     return functions_docstring, functions_to_async
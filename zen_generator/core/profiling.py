@@ -0,0 +1,162 @@
+"""This module contains the hooks that profile the stages of the generators."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from ast import walk
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from zen_generator.core.hooks import Hook
+
+
+@dataclass
+class StageProfile:
+    """The measures of a stage of a generator.
+
+    Attributes:
+        name (str): The name of the stage, e.g. "load" or "format".
+        wall_time (float): The elapsed time, in seconds.
+        cpu_time (float): The CPU time of the process, in seconds. The time spent by child
+            processes, e.g. ruff or the workers of the scan, isn't included.
+        memory_peak (int): The peak of the memory allocated during the stage, in bytes.
+        counts (dict[str, int]): What the stage processed, e.g. the number of schemas or of AST nodes.
+    """
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    memory_peak: int = 0
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class Profiler(Hook):
+    """Collect the wall time, the CPU time and the memory peak of the stages of a run.
+
+    The memory is traced with `tracemalloc` during the stages, which slows them down: the
+    times are comparable between runs with the profiler, not with runs without it. A stage
+    that runs inside another one doesn't measure its memory peak.
+
+    Attributes:
+        trace_memory (bool): Whether to measure the memory peak of the stages.
+        stages (list[StageProfile]): The stages measured so far, in the order they ended.
+    """
+
+    trace_memory: bool = True
+    stages: list[StageProfile] = field(default_factory=list)
+    _running: list[tuple[StageProfile, bool, float, float]] = field(init=False, repr=False, default_factory=list)
+
+    def stage_start(self, name: str) -> None:
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        self._running.append((StageProfile(name), tracing, time.perf_counter(), time.process_time()))
+
+    def stage_end(self, name: str, counts: Mapping[str, int]) -> None:
+        wall, cpu = time.perf_counter(), time.process_time()
+        profile, tracing, wall_start, cpu_start = self._running.pop()
+        profile.wall_time = wall - wall_start
+        profile.cpu_time = cpu - cpu_start
+        if tracing:
+            profile.memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        profile.counts = dict(counts)
+        self.stages.append(profile)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the measures of the stages and their totals, ready to be dumped as JSON.
+
+        Returns:
+            dict[str, Any]: The stages, in the order they ended, and the total wall and CPU time.
+        """
+        return {
+            "stages": [asdict(stage) for stage in self.stages],
+            "total": {
+                "wall_time": sum(stage.wall_time for stage in self.stages),
+                "cpu_time": sum(stage.cpu_time for stage in self.stages),
+            },
+        }
+
+
+@dataclass
+class ChromeTrace(Hook):
+    """Record the runs, stages and items as Chrome trace events, and write them as JSON.
+
+    The file is written at the end of every run, with the events of all the runs so far, and
+    can be opened with `chrome://tracing` or https://ui.perfetto.dev. The stages carry their
+    counts as arguments.
+
+    Attributes:
+        path (Path): The JSON file to write.
+        events (list[dict[str, Any]]): The trace events recorded so far.
+    """
+
+    path: Path
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+    def _event(self, phase: str, category: str, name: str, args: Mapping[str, int] | None = None) -> None:
+        # the timestamp is taken first, the counts of a stage are computed when they are read
+        event: dict[str, Any] = {
+            "name": name,
+            "cat": category,
+            "ph": phase,
+            "ts": time.perf_counter_ns() / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = dict(args)
+        self.events.append(event)
+
+    def run_start(self, name: str) -> None:
+        self._event("B", "run", name)
+
+    def run_end(self, name: str) -> None:
+        self._event("E", "run", name)
+        self.write()
+
+    def stage_start(self, name: str) -> None:
+        self._event("B", "stage", name)
+
+    def stage_end(self, name: str, counts: Mapping[str, int]) -> None:
+        self._event("E", "stage", name, counts)
+
+    def item_start(self, kind: str, name: str) -> None:
+        self._event("B", kind, name)
+
+    def item_end(self, kind: str, name: str) -> None:
+        self._event("E", kind, name)
+
+    def write(self) -> None:
+        """Write the events recorded so far to `path`, in the JSON object format of the trace events."""
+        self.path.write_text(json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}) + "\n")
+
+
+def count_nodes(modules: Iterable[Sequence[Any]]) -> int:
+    """Return the number of AST nodes of the given modules.
+
+    Args:
+        modules (Iterable[Sequence[Any]]): The statements of every module.
+
+    Returns:
+        int: The number of nodes.
+    """
+    return sum(1 for body in modules for statement in body for _ in walk(statement))
+
+
+def count_lines(texts: Iterable[str]) -> int:
+    """Return the number of lines of the given texts.
+
+    Args:
+        texts (Iterable[str]): The texts, e.g. the generated modules.
+
+    Returns:
+        int: The number of lines.
+    """
+    return sum(text.count("\n") for text in texts)
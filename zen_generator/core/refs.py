@@ -0,0 +1,545 @@
+"""This module contains the graph of the references of an AsyncAPI document.
+
+Every `$ref` of the document is resolved once and memoised, so the generators look up a
+schema, a message, a channel or an operation in constant time, and never rely on naming
+conventions such as `{operation}_request`. The dependencies between the schemas
+give the order in which the models are defined, with the cycles reported.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Literal, Mapping, TypeAlias
+
+from zen_generator.core.exception import ZenException
+
+MessageKind: TypeAlias = Literal["request", "response"]
+
+SCHEMA_PREFIX = "#/components/schemas/"
+# the sections whose entries are nodes of the graph
+SECTIONS = (
+    ("components", "schemas"),
+    ("components", "messages"),
+    ("components", "channels"),
+    ("components", "operations"),
+    ("channels",),
+    ("operations",),
+)
+
+
+class DanglingReference(ZenException):
+    def __init__(self, ref: str, location: str) -> None:
+        """Constructor of DanglingReference exception.
+
+        Args:
+            ref: The reference that can't be resolved.
+            location: The JSON pointer of the object that contains the reference.
+        """
+        self.message = f"The reference '{ref}' in '{location}' doesn't point to any object of the document"
+        self.ref = ref
+        self.location = location
+        super().__init__(self.message)
+
+
+class UnknownOperation(ZenException):
+    def __init__(self, name: str) -> None:
+        """Constructor of UnknownOperation exception.
+
+        Args:
+            name: The name of the operation missing from the document.
+        """
+        self.message = f"The operation '{name}' isn't defined in the document"
+        self.name = name
+        super().__init__(self.message)
+
+
+@dataclass(frozen=True, slots=True)
+class OperationMessages:
+    """The messages exchanged by an operation.
+
+    Attributes:
+        request (str | None): The JSON pointer of the request message.
+        response (str | None): The JSON pointer of the response message, from the reply of the operation.
+    """
+
+    request: str | None = None
+    response: str | None = None
+
+
+def _escape(part: str) -> str:
+    return part.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(part: str) -> str:
+    return part.replace("~1", "/").replace("~0", "~")
+
+
+def _find_refs(value: Any, location: str) -> Iterator[tuple[str, str]]:
+    """Yield the location and the target of every `$ref` nested in a value."""
+    stack = [(value, location)]
+    while stack:
+        value, location = stack.pop()
+        if isinstance(value, Mapping):
+            ref = value.get("$ref")
+            if isinstance(ref, str):
+                yield location, ref
+            stack.extend((item, f"{location}/{_escape(str(key))}") for key, item in value.items() if key != "$ref")
+        elif isinstance(value, list):
+            stack.extend((item, f"{location}/{index}") for index, item in enumerate(value))
+
+
+@dataclass
+class RefGraph:
+    """The objects of an AsyncAPI document and the references between them.
+
+    Every part of the graph is built on first use and kept, so a generator that only reads
+    the schemas never loads the other sections of a lazily loaded document.
+
+    Attributes:
+        document (Mapping[str, Any]): The AsyncAPI document.
+        schemas (Mapping[str, Any] | None): The component schemas, if they are loaded apart from
+            the document. Defaults to `components.schemas` of the document.
+    """
+
+    document: Mapping[str, Any] = field(repr=False)
+    schemas: Mapping[str, Any] | None = field(default=None, repr=False)
+    _targets: dict[str, str] = field(init=False, repr=False, default_factory=dict)
+    _values: dict[str, Any] = field(init=False, repr=False, default_factory=dict)
+    _nodes: dict[str, Any] | None = field(init=False, repr=False, default=None)
+    _dependencies: dict[str, list[str]] = field(init=False, repr=False, default_factory=dict)
+    _operations: dict[str, OperationMessages] = field(init=False, repr=False, default_factory=dict)
+    _positions: dict[str, int] | None = field(init=False, repr=False, default=None)
+    _unresolved: tuple[list[tuple[str, str]], list[tuple[str, str]]] | None = field(
+        init=False, repr=False, default=None
+    )
+    _order: tuple[list[str], list[list[str]]] | None = field(init=False, repr=False, default=None)
+
+    @property
+    def nodes(self) -> dict[str, Any]:
+        """The schemas, messages, channels and operations, keyed by JSON pointer."""
+        if self._nodes is None:
+            self._nodes = {
+                f"#/{'/'.join(path)}/{_escape(str(name))}": value
+                for path in SECTIONS
+                for name, value in self._section(path).items()
+            }
+        return self._nodes
+
+    @property
+    def schema_dependencies(self) -> dict[str, list[str]]:
+        """The names of the schemas referenced by every schema, in document order."""
+        return {name: self.dependencies(name) for name in self._schema_positions()}
+
+    @property
+    def operations(self) -> dict[str, OperationMessages]:
+        """The messages of every operation of `components.operations`."""
+        operations = self._section(("components", "operations"))
+        return {str(name): self.operation_messages(str(name)) for name in operations}
+
+    def dependencies(self, schema: str) -> list[str]:
+        """Return the names of the schemas a schema references.
+
+        Args:
+            schema (str): The name of the schema.
+
+        Returns:
+            list[str]: The referenced schemas, in reference order.
+        """
+        if schema not in self._dependencies:
+            dependencies: dict[str, None] = {}
+            value = self._section(("components", "schemas")).get(schema)
+            for _, ref in _find_refs(value, f"{SCHEMA_PREFIX}{_escape(schema)}"):
+                if ref.startswith(SCHEMA_PREFIX) and self._resolve(ref) is not None:
+                    dependencies[_unescape(ref[len(SCHEMA_PREFIX) :].split("/", 1)[0])] = None
+            self._dependencies[schema] = list(dependencies)
+        return self._dependencies[schema]
+
+    def operation_messages(self, operation: str) -> OperationMessages:
+        """Return the messages of an operation of `components.operations`.
+
+        Args:
+            operation (str): The name of the operation.
+
+        Returns:
+            OperationMessages: The pointers of the request and the response, None if the operation
+            or the messages aren't in the document.
+        """
+        if operation not in self._operations:
+            value = self._section(("components", "operations")).get(operation)
+            messages = OperationMessages()
+            if isinstance(value, Mapping):
+                reply = value.get("reply")
+                replies = reply.get("messages") if isinstance(reply, Mapping) else None
+                messages = OperationMessages(
+                    request=self._message_pointer(operation, "request", value.get("messages")),
+                    response=self._message_pointer(operation, "response", replies),
+                )
+            self._operations[operation] = messages
+        return self._operations[operation]
+
+    def operation_tags(self, operation: str) -> list[str]:
+        """Return the names of the tags of an operation of `components.operations`.
+
+        Args:
+            operation (str): The name of the operation.
+
+        Returns:
+            list[str]: The names of the tags, written inline or as references.
+        """
+        value = self._section(("components", "operations")).get(operation)
+        tags = value.get("tags") if isinstance(value, Mapping) else None
+        names = []
+        for tag in tags if isinstance(tags, list) else []:
+            if isinstance(tag, Mapping) and isinstance(tag.get("$ref"), str):
+                tag = (self._resolve(tag["$ref"]) or ("", None))[1]
+            if isinstance(tag, Mapping) and isinstance(tag.get("name"), str):
+                names.append(tag["name"])
+        return names
+
+    def select_operations(self, names: Iterable[str] = (), tags: Iterable[str] = ()) -> list[str]:
+        """Return the operations selected by name or by tag, in document order.
+
+        Args:
+            names (Iterable[str]): The names of the operations.
+            tags (Iterable[str]): The tags, an operation with at least one of them is selected.
+
+        Returns:
+            list[str]: The selected operations.
+
+        Raises:
+            UnknownOperation: If one of the names isn't an operation of the document.
+        """
+        operations = [str(name) for name in self._section(("components", "operations"))]
+        selected = set(names)
+        if unknown := selected.difference(operations):
+            raise UnknownOperation(sorted(unknown)[0])
+        if tags := set(tags):
+            selected.update(name for name in operations if tags.intersection(self.operation_tags(name)))
+        return [name for name in operations if name in selected]
+
+    def reachable_schemas(self, operations: Iterable[str]) -> list[str]:
+        """Return the schemas the messages of the given operations depend on, directly or not.
+
+        Only the messages of the operations and the schemas they reach are read.
+
+        Args:
+            operations (Iterable[str]): The names of the operations.
+
+        Returns:
+            list[str]: The reachable schemas, ordered like `schema_order`.
+        """
+        pending: list[str] = []
+        for operation in operations:
+            for kind in ("request", "response"):
+                for _, ref in _find_refs(self.message(operation, kind), "#"):
+                    if ref.startswith(SCHEMA_PREFIX) and self._resolve(ref) is not None:
+                        pending.append(_unescape(ref[len(SCHEMA_PREFIX) :].split("/", 1)[0]))
+        reached: set[str] = set()
+        while pending:
+            schema = pending.pop()
+            if schema not in reached:
+                reached.add(schema)
+                pending.extend(self.dependencies(schema))
+        return self.schema_order(reached)
+
+    @property
+    def dangling(self) -> list[tuple[str, str]]:
+        """The location and the target of the references that can't be resolved."""
+        return self._find_unresolved()[0]
+
+    @property
+    def external(self) -> list[tuple[str, str]]:
+        """The location and the target of the references to other documents, or to a section missing
+        from the document, e.g. the schemas of a document that only describes the operations."""
+        return self._find_unresolved()[1]
+
+    def resolve(self, ref: str) -> Any:
+        """Return the object a reference points to.
+
+        Args:
+            ref (str): The reference, e.g. `#/components/schemas/User`.
+
+        Returns:
+            Any: The referenced object, after following the references it is made of.
+
+        Raises:
+            DanglingReference: If the reference doesn't point to any object of the document.
+        """
+        resolved = self._resolve(ref)
+        if resolved is None:
+            raise DanglingReference(ref, "#")
+        return resolved[1]
+
+    def target(self, ref: str) -> str | None:
+        """Return the JSON pointer of the object a reference points to.
+
+        Args:
+            ref (str): The reference.
+
+        Returns:
+            str | None: The pointer, or None if the reference can't be resolved.
+        """
+        resolved = self._resolve(ref)
+        return resolved[0] if resolved is not None else None
+
+    def message(self, operation: str, kind: MessageKind) -> Mapping[str, Any]:
+        """Return the request or the response message of an operation.
+
+        Args:
+            operation (str): The name of the operation.
+            kind (MessageKind): Whether to return the request or the response.
+
+        Returns:
+            Mapping[str, Any]: The message, empty if the operation doesn't have one.
+        """
+        pointer = getattr(self.operation_messages(operation), kind)
+        return self._values.get(pointer, {}) if pointer is not None else {}
+
+    def check(self, operations: Iterable[str] | None = None) -> None:
+        """Raise an error on the first reference that can't be resolved.
+
+        The references to other documents, or to a section missing from the document, are not
+        errors: they point to objects described by another document.
+
+        Args:
+            operations (Iterable[str] | None): Check only the references of these operations, of
+                their messages and of the schemas they depend on. Defaults to the whole document.
+
+        Raises:
+            DanglingReference: If a reference doesn't point to any object of the document.
+        """
+        if operations is None:
+            dangling = self.dangling
+        else:
+            operations = list(operations)
+            refs = [
+                ref
+                for pointer in self._operation_pointers(operations)
+                for ref in _find_refs(self._values.get(pointer), pointer)
+            ]
+            dangling = self._classify(refs)[0]
+        if dangling:
+            location, ref = dangling[0]
+            raise DanglingReference(ref, location)
+
+    def schema_order(self, schemas: Iterable[str] | None = None) -> list[str]:
+        """Return the schemas in an order where every schema follows the schemas it references.
+
+        The document order is kept whenever the references allow it. The schemas of a cycle
+        can't be ordered: they are kept together, in document order, see `cycles`.
+
+        Args:
+            schemas (Iterable[str] | None): The schemas to sort, every schema of the document by default.
+
+        Returns:
+            list[str]: The names of the schemas.
+        """
+        if schemas is None:
+            return self._sorted()[0]
+        positions = self._schema_positions()
+        selected = sorted(set(schemas).intersection(positions), key=positions.__getitem__)
+        names = set(selected)
+        dependencies = {name: [other for other in self.dependencies(name) if other in names] for name in selected}
+        return _topological_order(dependencies)[0]
+
+    @property
+    def cycles(self) -> list[list[str]]:
+        """The groups of schemas that reference each other, directly or not, in document order."""
+        return self._sorted()[1]
+
+    def _sorted(self) -> tuple[list[str], list[list[str]]]:
+        if self._order is None:
+            self._order = _topological_order(self.schema_dependencies)
+        return self._order
+
+    def _schema_positions(self) -> dict[str, int]:
+        if self._positions is None:
+            schemas = self._section(("components", "schemas"))
+            self._positions = {str(name): position for position, name in enumerate(schemas)}
+        return self._positions
+
+    def _section(self, path: tuple[str, ...]) -> Mapping[str, Any]:
+        if self.schemas is not None and path == ("components", "schemas"):
+            return self.schemas
+        return _section(self.document, path)
+
+    def _find_unresolved(self) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+        if self._unresolved is None:
+            document = self.document
+            if self.schemas is not None:
+                document = {**document, "components": {**_section(document, ("components",)), "schemas": self.schemas}}
+            self._unresolved = self._classify(_find_refs(document, "#"))
+        return self._unresolved
+
+    def _classify(self, refs: Iterable[tuple[str, str]]) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+        """Split the references that can't be resolved into dangling and external references."""
+        dangling: list[tuple[str, str]] = []
+        external: list[tuple[str, str]] = []
+        for location, ref in refs:
+            if self._resolve(ref) is None:
+                missing = not ref.startswith("#/") or not self._section(_section_of(ref))
+                (external if missing else dangling).append((location, ref))
+        return sorted(dangling), sorted(external)
+
+    def _operation_pointers(self, operations: list[str]) -> list[str]:
+        """Return the pointers of the operations, of their messages and of the schemas they depend on."""
+        pointers = []
+        for operation in operations:
+            pointers.append(f"#/components/operations/{_escape(operation)}")
+            messages = self.operation_messages(operation)
+            pointers.extend(pointer for pointer in (messages.request, messages.response) if pointer is not None)
+        pointers.extend(f"{SCHEMA_PREFIX}{_escape(schema)}" for schema in self.reachable_schemas(operations))
+        for pointer in pointers:
+            self._resolve(pointer)
+        return list(dict.fromkeys(pointers))
+
+    def _message_pointer(self, operation: str, kind: MessageKind, messages: Any) -> str | None:
+        """Return the pointer of the first message of an operation.
+
+        The documents that describe only the operations, without their channels, can't be followed
+        to the messages: the message named after the operation, as written by `asyncapi-documentation`,
+        is used instead.
+        """
+        if isinstance(messages, list) and messages and isinstance(messages[0], Mapping):
+            ref = messages[0].get("$ref")
+            if isinstance(ref, str) and (resolved := self._resolve(ref)) is not None:
+                return resolved[0]
+        resolved = self._resolve(f"#/components/messages/{_escape(operation)}_{kind}")
+        return resolved[0] if resolved is not None else None
+
+    def _resolve(self, ref: str, visiting: frozenset[str] = frozenset()) -> tuple[str, Any] | None:
+        """Follow a reference and the references it is made of, memoising every result."""
+        if ref in self._targets:
+            return self._targets[ref], self._values[ref]
+        if not ref.startswith("#/") or ref in visiting:
+            return None
+        visiting |= {ref}
+        pointer, value, parts = "#", self.document, ref[2:].split("/")
+        if self.schemas is not None and ref.startswith(SCHEMA_PREFIX):
+            pointer, value, parts = SCHEMA_PREFIX.rstrip("/"), self.schemas, parts[2:]
+        for part in parts:
+            resolved = self._follow(pointer, value, visiting)
+            if resolved is None:
+                return None
+            pointer, value = resolved
+            key = _unescape(part)
+            if isinstance(value, Mapping) and key in value:
+                value = value[key]
+            elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+                value = value[int(key)]
+            else:
+                return None
+            pointer = f"{pointer}/{part}"
+        resolved = self._follow(pointer, value, visiting)
+        if resolved is not None:
+            for key in (ref, resolved[0]):
+                self._targets[key], self._values[key] = resolved
+        return resolved
+
+    def _follow(self, pointer: str, value: Any, visiting: frozenset[str]) -> tuple[str, Any] | None:
+        if isinstance(value, Mapping) and isinstance(value.get("$ref"), str):
+            return self._resolve(value["$ref"], visiting)
+        return pointer, value
+
+
+@dataclass
+class _Tarjan:
+    """Group the schemas that reference each other, with the Tarjan algorithm, without recursion."""
+
+    dependencies: Mapping[str, list[str]]
+    index: dict[str, int] = field(default_factory=dict)
+    lowlink: dict[str, int] = field(default_factory=dict)
+    stack: list[str] = field(default_factory=list)
+    on_stack: set[str] = field(default_factory=set)
+    work: list[tuple[str, Iterator[str]]] = field(default_factory=list)
+    components: list[list[str]] = field(default_factory=list)
+
+    def enter(self, node: str) -> None:
+        self.index[node] = self.lowlink[node] = len(self.index)
+        self.stack.append(node)
+        self.on_stack.add(node)
+        self.work.append((node, iter(self.dependencies[node])))
+
+    def leave(self, node: str) -> None:
+        self.work.pop()
+        if self.work:
+            parent = self.work[-1][0]
+            self.lowlink[parent] = min(self.lowlink[parent], self.lowlink[node])
+        if self.lowlink[node] == self.index[node]:
+            component = [self.stack.pop()]
+            while component[-1] != node:
+                component.append(self.stack.pop())
+            self.on_stack.difference_update(component)
+            self.components.append(component)
+
+    def run(self) -> list[list[str]]:
+        for root in self.dependencies:
+            if root not in self.index:
+                self.enter(root)
+            while self.work:
+                node, children = self.work[-1]
+                child = next(children, None)
+                if child is None:
+                    self.leave(node)
+                elif child not in self.index:
+                    self.enter(child)
+                elif child in self.on_stack:
+                    self.lowlink[node] = min(self.lowlink[node], self.index[child])
+        return self.components
+
+
+def _topological_order(dependencies: Mapping[str, list[str]]) -> tuple[list[str], list[list[str]]]:
+    """Sort the schemas after the schemas they reference, breaking ties by document order."""
+    position = {name: number for number, name in enumerate(dependencies)}
+    components = [sorted(component, key=position.__getitem__) for component in _Tarjan(dependencies).run()]
+    component_of = {name: number for number, component in enumerate(components) for name in component}
+    cycles = [component for component in components if len(component) > 1 or component[0] in dependencies[component[0]]]
+
+    dependents: list[set[int]] = [set() for _ in components]
+    pending = [0] * len(components)
+    for name, referenced in dependencies.items():
+        for dependency in set(referenced):
+            source, target = component_of[dependency], component_of[name]
+            if source != target and target not in dependents[source]:
+                dependents[source].add(target)
+                pending[target] += 1
+
+    ready = [(position[component[0]], number) for number, component in enumerate(components) if not pending[number]]
+    heapq.heapify(ready)
+    order: list[str] = []
+    while ready:
+        _, number = heapq.heappop(ready)
+        order.extend(components[number])
+        for dependent in dependents[number]:
+            pending[dependent] -= 1
+            if not pending[dependent]:
+                heapq.heappush(ready, (position[components[dependent][0]], dependent))
+    return order, sorted(cycles, key=lambda component: position[component[0]])
+
+
+def _section(document: Mapping[str, Any], path: Iterable[str]) -> Mapping[str, Any]:
+    value: Any = document
+    for key in path:
+        value = value.get(key) if isinstance(value, Mapping) else None
+    return value if isinstance(value, Mapping) else {}
+
+
+def _section_of(ref: str) -> tuple[str, ...]:
+    """Return the path of the section a reference points into, e.g. `("components", "schemas")`."""
+    parts = tuple(_unescape(part) for part in ref[2:].split("/"))
+    return parts[:2] if parts[0] == "components" else parts[:1]
+
+
+def build_ref_graph(document: Mapping[str, Any], schemas: Mapping[str, Any] | None = None) -> RefGraph:
+    """Build the graph of the references of an AsyncAPI document.
+
+    Args:
+        document (Mapping[str, Any]): The AsyncAPI document.
+        schemas (Mapping[str, Any] | None): The component schemas, if they are loaded apart from
+            the document. Defaults to `components.schemas` of the document.
+
+    Returns:
+        RefGraph: The graph of the references of the document.
+    """
+    return RefGraph(document, schemas)
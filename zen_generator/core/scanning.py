@@ -0,0 +1,205 @@
+"""This module contains utilities for scanning many Python modules in parallel.
+
+Every module is parsed and converted to schemas on its own, in a pool of worker processes,
+and the results are merged in the order of the modules, so the generated document doesn't
+depend on the number of workers.
+"""
+
+from __future__ import annotations
+
+import os
+from ast import parse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from glob import glob, has_magic
+from pathlib import Path
+from typing import Any, Iterable, Literal, Sequence, TypeAlias
+
+from zen_generator.core.ast_utils import generate_component_schemas
+from zen_generator.core.cache import SchemaCache
+from zen_generator.core.exception import InvalidFile, ZenException
+from zen_generator.core.io import read_source_file
+from zen_generator.core.parsing import function_content_reader
+from zen_generator.core.signatures import parse_signatures
+from zen_generator.core.type_system import TypeMapping, default_type_registry
+
+ModuleKind: TypeAlias = Literal["models", "functions"]
+SourcePattern: TypeAlias = Path | str
+
+
+class NameCollision(ZenException):
+    def __init__(self, kind: str, name: str, first: Path, second: Path) -> None:
+        """Constructor of NameCollision exception.
+
+        Args:
+            kind: What the name refers to, "schema" or "function".
+            name: The name defined in both modules.
+            first: The module where the name was defined first.
+            second: The module where the name is defined again.
+        """
+        self.message = f"The {kind} '{name}' is defined in both '{first}' and '{second}'"
+        self.name = name
+        self.first = first
+        self.second = second
+        super().__init__(self.message)
+
+
+@dataclass
+class ModuleScan:
+    """The schemas built from a single module.
+
+    Attributes:
+        path (Path): The path of the module.
+        schemas (dict[str, Any]): The component schemas of the classes defined in a models module.
+        description (str | None): The docstring of a functions module.
+        functions (dict[str, Any]): The request and response schemas of the functions of a functions module.
+    """
+
+    path: Path
+    schemas: dict[str, Any] = field(default_factory=dict)
+    description: str | None = None
+    functions: dict[str, Any] = field(default_factory=dict)
+
+
+def expand_sources(patterns: Iterable[SourcePattern]) -> list[Path]:
+    """Expand files, directories and glob patterns into the list of Python modules to scan.
+
+    Directories are searched recursively for `*.py` files. The modules matched by a directory or
+    a pattern are sorted, and every module is listed once, in the order of the patterns.
+
+    Args:
+        patterns (Iterable[SourcePattern]): The files, directories and glob patterns.
+
+    Returns:
+        list[Path]: The Python modules.
+    """
+    modules: dict[Path, None] = {}
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_file():
+            matches = [path]
+        elif path.is_dir():
+            matches = sorted(path.rglob("*.py"))
+        elif has_magic(str(pattern)):
+            matches = sorted(Path(match) for match in glob(str(pattern), recursive=True) if Path(match).is_file())
+            if not matches:
+                raise InvalidFile("The pattern doesn't match any file", path)
+        else:
+            raise InvalidFile("The source doesn't exist", path)
+        modules.update(dict.fromkeys(matches))
+    return list(modules)
+
+
+def scan_module(
+    path: Path,
+    source: str,
+    kind: ModuleKind,
+    cache: SchemaCache | None = None,
+    fast: bool = False,
+) -> ModuleScan:
+    """Parse a module and build its schemas.
+
+    Args:
+        path (Path): The path of the module, used to report errors.
+        source (str): The source code of the module.
+        kind (ModuleKind): Whether the module defines models or functions.
+        cache (SchemaCache | None): The cache of the schemas.
+        fast (bool): Whether to parse only the signatures of the module, see `parse_signatures`.
+
+    Returns:
+        ModuleScan: The schemas of the module.
+    """
+    if fast:
+        tree, source = parse_signatures(source)
+    else:
+        tree = parse(source, filename=str(path))
+    if kind == "models":
+        return ModuleScan(path, schemas=generate_component_schemas(tree, source, cache))
+    description, functions = function_content_reader(tree, source, cache)
+    return ModuleScan(path, description=description, functions=functions)
+
+
+def _scan_module(task: tuple[Path, str, ModuleKind, SchemaCache | None, bool]) -> ModuleScan:
+    return scan_module(*task)
+
+
+def _init_worker(mappings: list[TypeMapping]) -> None:
+    # workers started with "spawn" don't inherit the types registered by the parent process
+    for mapping in mappings:
+        if default_type_registry.get_python_mapping(mapping.python_type) != mapping:
+            default_type_registry.register(mapping)
+
+
+def scan_modules(
+    modules: Sequence[tuple[Path, str, ModuleKind]],
+    jobs: int | None = 1,
+    cache: SchemaCache | None = None,
+    fast: bool = False,
+) -> list[ModuleScan]:
+    """Build the schemas of many modules, in parallel when `jobs` is greater than one.
+
+    Args:
+        modules (Sequence[tuple[Path, str, ModuleKind]]): The path, the source code and the kind of every module.
+        jobs (int | None): The number of worker processes. None uses one worker per CPU, 1 scans
+            the modules in the current process.
+        cache (SchemaCache | None): The cache of the schemas.
+        fast (bool): Whether to parse only the signatures of the modules.
+
+    Returns:
+        list[ModuleScan]: The schemas of every module, in the same order as `modules`.
+    """
+    tasks = [(path, source, kind, cache, fast) for path, source, kind in modules]
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        return [_scan_module(task) for task in tasks]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(default_type_registry.mappings(),)
+    ) as executor:
+        return list(executor.map(_scan_module, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+
+
+def merge_scans(scans: Iterable[ModuleScan]) -> tuple[dict[str, Any], str | None, dict[str, Any]]:
+    """Merge the schemas of many modules into the content of a single document.
+
+    Args:
+        scans (Iterable[ModuleScan]): The schemas of the modules, in the order they are merged.
+
+    Returns:
+        tuple[dict[str, Any], str | None, dict[str, Any]]: The component schemas, the description
+        of the API, made of the docstrings of the functions modules, and the functions.
+
+    Raises:
+        NameCollision: If two modules define a schema or a function with the same name.
+    """
+    schemas: dict[str, Any] = {}
+    functions: dict[str, Any] = {}
+    descriptions: list[str] = []
+    schema_paths: dict[str, Path] = {}
+    function_paths: dict[str, Path] = {}
+    for scan in scans:
+        for kind, merged, paths, names in (
+            ("schema", schemas, schema_paths, scan.schemas),
+            ("function", functions, function_paths, scan.functions),
+        ):
+            for name, value in names.items():
+                if name in paths:
+                    raise NameCollision(kind, name, paths[name], scan.path)
+                paths[name] = scan.path
+                merged[name] = value
+        if scan.description:
+            descriptions.append(scan.description)
+    return schemas, "\n\n".join(descriptions) or None, functions
+
+
+def read_modules(paths: Iterable[Path], kind: ModuleKind) -> list[tuple[Path, str, ModuleKind]]:
+    """Read the source code of the given modules.
+
+    Args:
+        paths (Iterable[Path]): The paths of the modules.
+        kind (ModuleKind): Whether the modules define models or functions.
+
+    Returns:
+        list[tuple[Path, str, ModuleKind]]: The path, the source code and the kind of every module.
+    """
+    return [(path, read_source_file(path) or "", kind) for path in paths]
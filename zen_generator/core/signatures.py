@@ -0,0 +1,190 @@
+"""This module contains a fast scanner that reads only the signatures of a Python module.
+
+Building the AsyncAPI schemas only needs the module docstring, the headers and docstrings
+of the top-level functions, and the annotated assignments in the body of the top-level
+classes. The scanner extracts these parts into a much smaller skeleton module, which is
+then parsed with `ast.parse`:
+
+- the top-level statements are found by looking for the lines that start at column 0, and
+  the candidates inside strings, brackets or line continuations are discarded;
+- the header and the docstring of every definition are read with `tokenize`, which stops
+  right after the docstring of functions, so function bodies are never tokenized nor parsed.
+
+The readers of the schemas accept the skeleton as they accept the full module, and build
+the same schemas.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+import tokenize
+from ast import Module, parse
+from typing import Iterator
+
+_INDENT = "    "
+# a line that starts at column 0 with something other than a comment or a closing bracket
+_TOP_LEVEL_LINE_PATTERN = re.compile(r"^(?=[^\s#)\]}])", re.MULTILINE)
+# the tokens that can hide a column 0 line: strings, comments and brackets
+_SKIP_PATTERN = re.compile(
+    r"""
+    (?P<string>[rRbBuUfF]{0,2}(?:
+        \"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"
+        |'''(?:[^'\\]|\\.|'(?!''))*'''
+        |"(?:[^"\\\n]|\\.)*"
+        |'(?:[^'\\\n]|\\.)*'
+    ))
+    |(?P<comment>\#[^\n]*)
+    |(?P<open>[\[({])
+    |(?P<close>[\])}])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_DEFINITION_PATTERN = re.compile(r"(?:async\s+)?def\b|class\b")
+_STRING_START_PATTERN = re.compile(r"[rRuU]?(?:\"|')")
+
+
+def _top_level_statements(source: str) -> Iterator[str]:
+    """Yield the source code of the top-level statements of a module."""
+    starts = []
+    skipped = _SKIP_PATTERN.finditer(source)
+    match = next(skipped, None)
+    depth = 0
+    for line in _TOP_LEVEL_LINE_PATTERN.finditer(source):
+        start = line.start()
+        while match is not None and match.end() <= start:
+            if match.lastgroup == "open":
+                depth += 1
+            elif match.lastgroup == "close":
+                depth = max(depth - 1, 0)
+            match = next(skipped, None)
+        inside_token = match is not None and match.start() < start
+        continued = source.endswith("\\\n", 0, start) or source.endswith("\\\r\n", 0, start)
+        if not (depth or inside_token or continued):
+            starts.append(start)
+    for start, end in zip(starts, [*starts[1:], len(source)]):
+        yield source[start:end]
+
+
+def _offsets(text: str) -> list[int]:
+    """Return the offset of the start of every line, to convert token positions to offsets."""
+    offsets = [0]
+    for line in io.StringIO(text):
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def _read_header(tokens: Iterator[tokenize.TokenInfo]) -> tuple[str, tuple[int, int]] | None:
+    """Consume the tokens up to the colon that ends the header of a definition.
+
+    Returns the keyword of the definition, `def` or `class`, and the end of the header.
+    """
+    depth = 0
+    keyword = None
+    for token in tokens:
+        if token.type == tokenize.NAME and token.string in ("def", "class") and keyword is None:
+            keyword = token.string
+        elif token.type == tokenize.OP and token.string in "([{":
+            depth += 1
+        elif token.type == tokenize.OP and token.string in ")]}":
+            depth -= 1
+        elif token.type == tokenize.OP and token.string == ":" and depth == 0 and keyword is not None:
+            return keyword, token.end
+    return None
+
+
+def _logical_lines(tokens: Iterator[tokenize.TokenInfo]) -> Iterator[tuple[int, list[tokenize.TokenInfo]]]:
+    """Group the tokens of a body into logical lines, with their indentation level.
+
+    The statements separated by semicolons are yielded as separate lines.
+    """
+    level = 0
+    line: list[tokenize.TokenInfo] = []
+    for token in tokens:
+        if token.type == tokenize.INDENT:
+            level += 1
+        elif token.type == tokenize.DEDENT:
+            level -= 1
+        elif token.type == tokenize.NEWLINE or token.type == tokenize.OP and token.string == ";":
+            if line:
+                yield level, line
+            line = []
+        elif token.type not in (tokenize.NL, tokenize.COMMENT, tokenize.ENDMARKER):
+            line.append(token)
+
+
+def _is_docstring(line: list[tokenize.TokenInfo]) -> bool:
+    return all(token.type == tokenize.STRING for token in line)
+
+
+def _definition_skeleton(text: str) -> str:
+    """Reduce a function to its header and docstring, and a class to its fields and docstring."""
+    tokens = tokenize.generate_tokens(io.StringIO(text).readline)
+    header = _read_header(tokens)
+    next_token = next((token for token in tokens if token.type != tokenize.COMMENT), None)
+    if header is None or next_token is None or next_token.type != tokenize.NEWLINE:
+        # single line definitions are already small
+        return text
+    keyword, header_end = header
+
+    offsets = _offsets(text)
+
+    def segment(first: tokenize.TokenInfo, last: tokenize.TokenInfo) -> str:
+        return text[offsets[first.start[0] - 1] + first.start[1] : offsets[last.end[0] - 1] + last.end[1]]
+
+    body = []
+    for index, (level, line) in enumerate(_logical_lines(tokens)):
+        if level != 1:
+            continue
+        if index == 0 and _is_docstring(line):
+            body.append(segment(line[0], line[-1]))
+        if keyword == "def":
+            # stop before the rest of the function is tokenized
+            break
+        if len(line) > 1 and line[0].type == tokenize.NAME and line[1].string == ":":
+            body.append(segment(line[0], line[-1]))
+    body.append("...")
+    header_text = text[: offsets[header_end[0] - 1] + header_end[1]]
+    return header_text + "".join(f"\n{_INDENT}{statement}" for statement in body) + "\n"
+
+
+def scan_signatures(source: str) -> str:
+    """Extract the parts of a module needed to build its schemas.
+
+    Args:
+        source (str): The source code of the module.
+
+    Returns:
+        str: A skeleton module made of the module docstring, the top-level definitions with
+        their docstrings and, for classes, their annotated assignments.
+    """
+    skeleton: list[str] = []
+    decorators: list[str] = []
+    for index, statement in enumerate(_top_level_statements(source)):
+        if statement.startswith("@"):
+            decorators.append(statement)
+        elif _DEFINITION_PATTERN.match(statement):
+            skeleton.append(_definition_skeleton("".join([*decorators, statement])))
+            decorators = []
+        else:
+            if index == 0 and _STRING_START_PATTERN.match(statement):
+                skeleton.append(statement)
+            decorators = []
+    return "".join(statement if statement.endswith("\n") else f"{statement}\n" for statement in skeleton)
+
+
+def parse_signatures(source: str) -> tuple[Module, str]:
+    """Parse the signatures of a module, see `scan_signatures`.
+
+    Args:
+        source (str): The source code of the module.
+
+    Returns:
+        tuple[Module, str]: The parsed skeleton and its source code. If the module can't be
+        scanned, the whole module and its source code.
+    """
+    try:
+        skeleton = scan_signatures(source)
+        return parse(skeleton), skeleton
+    except (SyntaxError, tokenize.TokenError):
+        return parse(source), source
@@ -0,0 +1,143 @@
+"""This module contains an index of the symbols defined in a Python module.
+
+The index is built in a single pass over the statements of the module and of its classes,
+without visiting function bodies or expressions, so its cost depends on the number of
+definitions rather than on the size of the code.
+"""
+
+from __future__ import annotations
+
+import re
+from ast import AST, AsyncFunctionDef, ClassDef, FunctionDef, Module
+from dataclasses import dataclass, field
+from typing import Literal, TypeAlias
+
+SymbolKind: TypeAlias = Literal["function", "class", "method"]
+
+# the lines as split by the Python parser, which unlike str.splitlines only breaks on \r and \n
+_LINE_PATTERN = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+
+
+@dataclass(frozen=True, slots=True)
+class Symbol:
+    """A function, a class or a method defined in a module.
+
+    Attributes:
+        name (str): The qualified name of the symbol, `Class.method` for methods and nested classes.
+        kind (SymbolKind): Whether the symbol is a top-level function, a class or a method.
+        node (FunctionDef | AsyncFunctionDef | ClassDef): The definition of the symbol.
+        start (int): The first line of the definition, decorators included.
+        end (int): The last line of the definition.
+    """
+
+    name: str
+    kind: SymbolKind
+    node: FunctionDef | AsyncFunctionDef | ClassDef
+    start: int
+    end: int
+
+
+@dataclass
+class ModuleIndex:
+    """The symbols defined in a module.
+
+    Attributes:
+        functions (dict[str, Symbol]): The top-level functions, in definition order.
+        classes (dict[str, Symbol]): The classes, top-level and nested, in definition order.
+        methods (dict[str, Symbol]): The functions defined in the body of a class.
+        source (str | None): The source code of the module, required by `segment`.
+    """
+
+    functions: dict[str, Symbol] = field(default_factory=dict)
+    classes: dict[str, Symbol] = field(default_factory=dict)
+    methods: dict[str, Symbol] = field(default_factory=dict)
+    source: str | None = field(default=None, repr=False)
+    _lines: list[str] | None = field(init=False, repr=False, default=None)
+
+    @property
+    def top_level_classes(self) -> list[Symbol]:
+        """The classes defined in the body of the module."""
+        return [symbol for symbol in self.classes.values() if "." not in symbol.name]
+
+    def symbol_at(self, line: int) -> Symbol | None:
+        """Return the innermost symbol whose definition spans the given line.
+
+        Args:
+            line (int): The line number, starting from 1.
+
+        Returns:
+            Symbol | None: The symbol, or None if the line is outside every definition.
+        """
+        spans = [
+            symbol
+            for symbols in (self.functions, self.classes, self.methods)
+            for symbol in symbols.values()
+            if symbol.start <= line <= symbol.end
+        ]
+        return min(spans, key=lambda symbol: symbol.end - symbol.start, default=None)
+
+    def segment(self, node: AST) -> str | None:
+        """Return the source code of a node, like `ast.get_source_segment`.
+
+        The source is split into lines once, instead of once per node.
+
+        Args:
+            node (AST): A node of the module.
+
+        Returns:
+            str | None: The source code of the node, or None if the source or the position of the node is unknown.
+        """
+        end_lineno, end_col_offset = getattr(node, "end_lineno", None), getattr(node, "end_col_offset", None)
+        if self.source is None or end_lineno is None or end_col_offset is None:
+            return None
+        if self._lines is None:
+            self._lines = _LINE_PATTERN.findall(self.source)
+
+        lineno, col_offset = node.lineno - 1, node.col_offset  # type: ignore[attr-defined]
+        end_lineno -= 1
+        if end_lineno == lineno:
+            return self._lines[lineno].encode()[col_offset:end_col_offset].decode()
+        first = self._lines[lineno].encode()[col_offset:].decode()
+        last = self._lines[end_lineno].encode()[:end_col_offset].decode()
+        return "".join([first, *self._lines[lineno + 1 : end_lineno], last])
+
+
+def _span(node: FunctionDef | AsyncFunctionDef | ClassDef) -> tuple[int, int]:
+    start = min([node.lineno, *(decorator.lineno for decorator in node.decorator_list)])
+    return start, node.end_lineno or node.lineno
+
+
+def _index_class(index: ModuleIndex, node: ClassDef, prefix: str) -> None:
+    name = f"{prefix}{node.name}"
+    index.classes[name] = Symbol(name, "class", node, *_span(node))
+    for statement in node.body:
+        if isinstance(statement, (FunctionDef, AsyncFunctionDef)):
+            method_name = f"{name}.{statement.name}"
+            index.methods[method_name] = Symbol(method_name, "method", statement, *_span(statement))
+        elif isinstance(statement, ClassDef):
+            _index_class(index, statement, f"{name}.")
+
+
+def build_module_index(tree: Module | None, source: str | None = None) -> ModuleIndex:
+    """Index the functions, classes and methods defined in a module.
+
+    Only the body of the module and the bodies of its classes are visited: functions nested
+    in other functions are not symbols of the module. A name defined twice keeps the position
+    of its first definition and refers to the last one, as it does at runtime.
+
+    Args:
+        tree (Module | None): The parsed module.
+        source (str | None): The source code of the module, used to extract the source of the symbols.
+
+    Returns:
+        ModuleIndex: The symbols of the module.
+    """
+    index = ModuleIndex(source=source)
+    if tree is None:
+        return index
+    for statement in tree.body:
+        if isinstance(statement, (FunctionDef, AsyncFunctionDef)):
+            index.functions[statement.name] = Symbol(statement.name, "function", statement, *_span(statement))
+        elif isinstance(statement, ClassDef):
+            _index_class(index, statement, "")
+    return index
@@ -1,12 +1,184 @@
+"""This module contains the type system shared by the Python and the AsyncAPI generators.
+
+Type annotations are converted to a small intermediate representation (IR) made of
+immutable, slotted nodes. The same IR is built from Python annotations and from AsyncAPI
+properties, and converted back to AsyncAPI schemas and to Python annotations.
+"""
+
 from __future__ import annotations
 
-ASYNCAPI_TO_PYTHON_TYPES: dict[str, str] = {
-    "string": "str",
-    "integer": "int",
-    "boolean": "bool",
-    "array": "list",
-    "object": "object",
-}
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import yaml
+
+from zen_generator.core.exception import InvalidFile
+
+SCHEMA_PREFIX = "#/components/schemas/"
+
+
+@dataclass(frozen=True, slots=True)
+class TypeMapping:
+    """The mapping between a Python type and an AsyncAPI type.
+
+    Attributes:
+        python_type (str): The name of the Python type.
+        asyncapi_type (str): The AsyncAPI (JSON schema) type.
+        format (str | None): The AsyncAPI format that tells apart Python types sharing the same AsyncAPI type.
+        module (str | None): The module the Python type must be imported from, None for builtins.
+    """
+
+    python_type: str
+    asyncapi_type: str
+    format: str | None = None
+    module: str | None = None
+
+    @property
+    def schema(self) -> dict[str, Any]:
+        """The AsyncAPI schema of the type."""
+        if self.format is None:
+            return {"type": self.asyncapi_type}
+        return {"type": self.asyncapi_type, "format": self.format}
+
+
+DEFAULT_TYPE_MAPPINGS: tuple[TypeMapping, ...] = (
+    TypeMapping("str", "string"),
+    TypeMapping("int", "integer"),
+    TypeMapping("bool", "boolean"),
+    TypeMapping("list", "array"),
+    TypeMapping("object", "object"),
+    TypeMapping("float", "number"),
+    TypeMapping("datetime", "string", "date-time", "datetime"),
+    TypeMapping("date", "string", "date", "datetime"),
+    TypeMapping("UUID", "string", "uuid", "uuid"),
+    TypeMapping("Decimal", "string", "decimal", "decimal"),
+    TypeMapping("bytes", "string", "binary"),
+)
+
+
+class TypeRegistry:
+    """Bidirectional registry of the mappings between Python and AsyncAPI types.
+
+    Both directions are stored in precomputed tables, so a lookup is a single dict access.
+    Registering a mapping for a Python type, or for an AsyncAPI type and format, replaces
+    the previous one.
+
+    Attributes:
+        version (int): Incremented on every change, so that the caches built on top of the
+            registry know when to invalidate their entries.
+    """
+
+    def __init__(self, mappings: Iterable[TypeMapping] = DEFAULT_TYPE_MAPPINGS) -> None:
+        self._by_python: dict[str, TypeMapping] = {}
+        self._by_asyncapi: dict[tuple[str, str | None], TypeMapping] = {}
+        self.version = 0
+        for mapping in mappings:
+            self.register(mapping)
+
+    def register(self, mapping: TypeMapping) -> None:
+        """Add a mapping to the registry.
+
+        Args:
+            mapping (TypeMapping): The mapping to add.
+        """
+        self._by_python[mapping.python_type] = mapping
+        self._by_asyncapi[(mapping.asyncapi_type, mapping.format)] = mapping
+        self.version += 1
+
+    def load_config(self, source: Path) -> None:
+        """Register the mappings defined in a YAML file.
+
+        The file maps the name of every Python type to its AsyncAPI `type`, and optionally to
+        its `format` and to the `module` it is imported from:
+
+            Decimal:
+              type: number
+              module: decimal
+
+        Args:
+            source (Path): The path of the configuration file.
+        """
+        if not source.is_file():
+            raise InvalidFile("The types configuration is not a file", source)
+        config = yaml.safe_load(source.read_text()) or {}
+        if not isinstance(config, dict):
+            raise InvalidFile("The types configuration must be a mapping", source)
+        for python_type, options in config.items():
+            if not isinstance(options, dict) or "type" not in options:
+                raise InvalidFile(f"The type '{python_type}' has no AsyncAPI type", source)
+            self.register(TypeMapping(python_type, options["type"], options.get("format"), options.get("module")))
+
+    def get_python_mapping(self, python_type: str) -> TypeMapping | None:
+        """Return the mapping of a Python type.
+
+        Args:
+            python_type (str): The name of the Python type.
+
+        Returns:
+            TypeMapping | None: The mapping, or None if the type isn't registered.
+        """
+        return self._by_python.get(python_type)
+
+    def to_python(self, asyncapi_type: str, format: str | None = None) -> str:
+        """Convert an AsyncAPI type, and optionally its format, to the Python type name.
+
+        Args:
+            asyncapi_type (str): The AsyncAPI type.
+            format (str | None): The AsyncAPI format. Unknown formats are ignored.
+
+        Returns:
+            str: The Python type name, or `asyncapi_type` itself if the type isn't registered.
+        """
+        mapping = self._by_asyncapi.get((asyncapi_type, format)) or self._by_asyncapi.get((asyncapi_type, None))
+        return mapping.python_type if mapping is not None else asyncapi_type
+
+    def to_asyncapi(self, python_type: str) -> str | None:
+        """Convert a Python type name to the AsyncAPI type.
+
+        Args:
+            python_type (str): The Python type name.
+
+        Returns:
+            str | None: The AsyncAPI type, or None if the type isn't registered.
+        """
+        mapping = self._by_python.get(python_type)
+        return mapping.asyncapi_type if mapping is not None else None
+
+    def imports_for(self, python_types: Iterable[str]) -> dict[str, list[str]]:
+        """Return the imports needed by the given Python types.
+
+        Args:
+            python_types (Iterable[str]): The Python type names used by the generated code.
+
+        Returns:
+            dict[str, list[str]]: The sorted names to import, keyed by module.
+        """
+        imports: dict[str, set[str]] = {}
+        for python_type in python_types:
+            mapping = self._by_python.get(python_type)
+            if mapping is not None and mapping.module is not None:
+                imports.setdefault(mapping.module, set()).add(python_type)
+        return {module: sorted(names) for module, names in sorted(imports.items())}
+
+    def mappings(self) -> list[TypeMapping]:
+        """Return the registered mappings.
+
+        Returns:
+            list[TypeMapping]: The mappings, sorted by Python type.
+        """
+        return sorted(self._by_python.values(), key=lambda mapping: mapping.python_type)
+
+    def fingerprint(self) -> str:
+        """Describe the registered mappings, so that persistent caches can tell registries apart.
+
+        Returns:
+            str: A string that changes whenever the mappings change.
+        """
+        return repr(self.mappings())
+
+
+default_type_registry = TypeRegistry()
 
 
 def convert_asyncapi_to_python(asyncapi_type: str) -> str:
@@ -18,7 +190,7 @@ def convert_asyncapi_to_python(asyncapi_type: str) -> str:
     Returns:
         str: The corresponding Python type
     """
-    return ASYNCAPI_TO_PYTHON_TYPES.get(asyncapi_type, asyncapi_type)
+    return default_type_registry.to_python(asyncapi_type)
 
 
 def convert_python_to_asyncapi(python_type: str) -> str | None:
@@ -30,5 +202,140 @@ def convert_python_to_asyncapi(python_type: str) -> str | None:
     Returns:
         str | None: The corresponding AsyncAPI type
     """
-    reverse_mapping = {py: asyncapi for asyncapi, py in ASYNCAPI_TO_PYTHON_TYPES.items()}
-    return reverse_mapping.get(python_type)
+    return default_type_registry.to_asyncapi(python_type)
+
+
+@dataclass(frozen=True, slots=True)
+class TypeNode:
+    """Base class of the nodes of the type IR."""
+
+
+@dataclass(frozen=True, slots=True)
+class Primitive(TypeNode):
+    """A primitive type, identified by its Python name (`str`, `int`, ...)."""
+
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class Ref(TypeNode):
+    """A reference to a model defined in `components.schemas`."""
+
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class ListOf(TypeNode):
+    """A list whose items have the given type."""
+
+    item: TypeNode
+
+
+@dataclass(frozen=True, slots=True)
+class DictOf(TypeNode):
+    """A dictionary with the given key and value types."""
+
+    key: TypeNode | None
+    value: TypeNode | None
+
+
+@dataclass(frozen=True, slots=True)
+class Union(TypeNode):
+    """A union of types, in declaration order."""
+
+    options: tuple[TypeNode, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class NoneType(TypeNode):
+    """The `None` type, which makes a property or a parameter optional."""
+
+
+def named_type(name: str, registry: TypeRegistry | None = None) -> Primitive | Ref:
+    """Build the IR node of a Python type name.
+
+    Args:
+        name (str): The Python type name.
+        registry (TypeRegistry | None): The type registry. Defaults to `default_type_registry`.
+
+    Returns:
+        Primitive | Ref: A primitive if the name is a registered type, a reference to a model otherwise.
+    """
+    registry = registry or default_type_registry
+    return Primitive(name) if registry.get_python_mapping(name) is not None else Ref(name)
+
+
+def union_options(type_node: TypeNode | None) -> tuple[TypeNode, ...]:
+    """Return the options of a type, a single option for types that aren't unions.
+
+    Args:
+        type_node (TypeNode | None): The type. None stands for an unknown type, with no options.
+
+    Returns:
+        tuple[TypeNode, ...]: The options of the type.
+    """
+    if type_node is None:
+        return ()
+    if isinstance(type_node, Union):
+        return type_node.options
+    return (type_node,)
+
+
+def _item_schema(item: TypeNode, registry: TypeRegistry) -> dict[str, Any]:
+    match item:
+        case Primitive(name):
+            mapping = registry.get_python_mapping(name)
+            return mapping.schema if mapping is not None else {"type": name}
+        case Ref(name):
+            return {"$ref": f"{SCHEMA_PREFIX}{name}"}
+        case _:
+            return {"type": "object"}
+
+
+def type_to_schema(type_node: TypeNode, registry: TypeRegistry | None = None) -> dict[str, Any]:
+    """Convert a type, which is not a union, to an AsyncAPI schema.
+
+    Args:
+        type_node (TypeNode): The type to convert.
+        registry (TypeRegistry | None): The type registry. Defaults to `default_type_registry`.
+
+    Returns:
+        dict[str, Any]: The AsyncAPI schema.
+    """
+    registry = registry or default_type_registry
+    match type_node:
+        case ListOf(item):
+            return {"type": "array", "items": _item_schema(item, registry)}
+        case Primitive() | Ref():
+            return _item_schema(type_node, registry)
+        case _:
+            return {"type": "object"}
+
+
+def type_from_schema(schema: Mapping[str, Any] | None, registry: TypeRegistry | None = None) -> TypeNode:
+    """Convert an AsyncAPI property to a type.
+
+    Args:
+        schema (Mapping[str, Any] | None): The AsyncAPI property.
+        registry (TypeRegistry | None): The type registry. Defaults to `default_type_registry`.
+
+    Returns:
+        TypeNode: The type of the property.
+    """
+    registry = registry or default_type_registry
+    match schema:
+        case None:
+            return NoneType()
+        case {"type": "array"}:
+            items = schema.get("items", {})
+            if "$ref" in items:
+                return ListOf(Ref(registry.to_python(items["$ref"].replace(SCHEMA_PREFIX, ""))))
+            return ListOf(Primitive(registry.to_python(items.get("type", ""), items.get("format"))))
+        case {"type": type_value}:
+            return Primitive(registry.to_python(type_value, schema.get("format")))
+        case {"$ref": ref_value}:
+            return Ref(registry.to_python(ref_value.replace(SCHEMA_PREFIX, "")))
+        case {"oneOf": one_of_values}:
+            return Union(tuple(type_from_schema(one_of, registry) for one_of in one_of_values))
+        case _:
+            return NoneType()
@@ -0,0 +1,75 @@
+"""This module contains utilities for watching the input files of the generators."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Sequence, TypeAlias
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+FileState: TypeAlias = tuple[int, int] | None
+
+
+def file_state(path: Path) -> FileState:
+    """Return the modification time and size of a file, or None if it doesn't exist.
+
+    Args:
+        path (Path): The file to inspect.
+
+    Returns:
+        FileState: The modification time in nanoseconds and the size of the file.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass
+class FileWatcher:
+    """Poll a set of files and report the ones that changed.
+
+    Polling only stats the watched files, so it is cheap for the handful of inputs of a
+    generator and doesn't need any platform specific notification API.
+
+    Attributes:
+        paths (Sequence[Path]): The files to watch.
+        interval (float): The time between two polls, in seconds.
+    """
+
+    paths: Sequence[Path]
+    interval: float = DEFAULT_POLL_INTERVAL
+    _states: dict[Path, FileState] = field(init=False, repr=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._states = {path: file_state(path) for path in self.paths}
+
+    def poll(self) -> set[Path]:
+        """Return the files that changed since the previous poll.
+
+        Returns:
+            set[Path]: The changed files.
+        """
+        changed = set()
+        for path in self.paths:
+            state = file_state(path)
+            if state != self._states[path]:
+                self._states[path] = state
+                changed.add(path)
+        return changed
+
+    def run(self, on_change: Callable[[set[Path]], None], stop: threading.Event | None = None) -> None:
+        """Call `on_change` with the changed files until `stop` is set.
+
+        Args:
+            on_change (Callable[[set[Path]], None]): Called with the files changed since the previous call.
+            stop (threading.Event | None): Stops the watcher when set. Without it the watcher runs
+                until the process is interrupted.
+        """
+        stop = stop or threading.Event()
+        while not stop.wait(self.interval):
+            if changed := self.poll():
+                on_change(changed)
@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Mapping, Sequence
 
-from zen_generator.core.ast_utils import convert_annotations_to_asyncapi_schemas, generate_component_schemas
-from zen_generator.core.io import parse_python_file_to_ast, save_yaml_file
-from zen_generator.core.parsing import function_content_reader
+from zen_generator.core.cache import SchemaCache, content_hash, generator_version
+from zen_generator.core.hooks import Hook, item, run, stage
+from zen_generator.core.io import dump_yaml, save_yaml_file
+from zen_generator.core.scanning import (
+    ModuleKind,
+    ModuleScan,
+    SourcePattern,
+    expand_sources,
+    merge_scans,
+    read_modules,
+    scan_module,
+    scan_modules,
+)
+from zen_generator.core.type_system import default_type_registry
 
 
 def create_async_api_content(
@@ -15,6 +27,7 @@ def create_async_api_content(
     models_schema: dict[str, Any],
     api_description: str | None,
     functions_parsed: dict[str, Any],
+    hooks: Sequence[Hook] = (),
 ):
     """Generate the AsyncAPI document from the provided models and functions content.
 
@@ -25,8 +38,17 @@ def create_async_api_content(
     :param models_schema: The models schema
     :param api_description: The api docstring
     :param functions_parsed: The functions parsed content
+    :param hooks: The hooks told of every schema and operation added to the document
     :return: The generated AsyncAPI document
     """
+    if hooks:
+        # the schemas have been built by the scan, possibly in other processes, the events only
+        # tell when they are added to the document
+        schemas: dict[str, Any] = {}
+        for name, schema in models_schema.items():
+            with item(hooks, "schema", name):
+                schemas[name] = schema
+        models_schema = schemas
     channels = {}
     operations = {}
     components = {
@@ -36,36 +58,37 @@ def create_async_api_content(
         "schemas": models_schema,
     }
     for func, content in functions_parsed.items():
-        # channels
-        channels[func] = {"$ref": f"#/components/channels/{func}"}
+        with item(hooks, "operation", func):
+            # channels
+            channels[func] = {"$ref": f"#/components/channels/{func}"}
 
-        # operations
-        operations[func] = {"$ref": f"#/components/operations/{func}"}
+            # operations
+            operations[func] = {"$ref": f"#/components/operations/{func}"}
 
-        # components.channels
-        components["channels"][func] = {
-            "messages": {
-                "request": {"$ref": f"#/components/messages/{func}_request"},
-                "response": {"$ref": f"#/components/messages/{func}_response"},
+            # components.channels
+            components["channels"][func] = {
+                "messages": {
+                    "request": {"$ref": f"#/components/messages/{func}_request"},
+                    "response": {"$ref": f"#/components/messages/{func}_response"},
+                }
             }
-        }
-
-        # components.operations
-        components["operations"][func] = {
-            "action": "receive",
-            # The description is now sourced from the 'request' object for better clarity.
-            "description": content.get("request", {}).get("description", ""),
-            "channel": {"$ref": f"#/channels/{func}"},
-            "messages": [{"$ref": f"#/channels/{func}/messages/request"}],
-            "reply": {
+
+            # components.operations
+            components["operations"][func] = {
+                "action": "receive",
+                # The description is now sourced from the 'request' object for better clarity.
+                "description": content.get("request", {}).get("description", ""),
                 "channel": {"$ref": f"#/channels/{func}"},
-                "messages": [{"$ref": f"#/channels/{func}/messages/response"}],
-            },
-        }
+                "messages": [{"$ref": f"#/channels/{func}/messages/request"}],
+                "reply": {
+                    "channel": {"$ref": f"#/channels/{func}"},
+                    "messages": [{"$ref": f"#/channels/{func}/messages/response"}],
+                },
+            }
 
-        # components.messages
-        components["messages"][f"{func}_request"] = content.get("request")
-        components["messages"][f"{func}_response"] = content.get("response")
+            # components.messages
+            components["messages"][f"{func}_request"] = content.get("request")
+            components["messages"][f"{func}_response"] = content.get("response")
 
     async_api_content: dict[str, Any] = {
         "asyncapi": "3.0.0",
@@ -81,24 +104,228 @@ def create_async_api_content(
     return async_api_content
 
 
-def generate_asyncapi_from_files(models_file: Path, functions_file: Path, output_path: Path, app_name: str) -> None:
+def generate_asyncapi_from_files(
+    models_file: SourcePattern | Sequence[SourcePattern],
+    functions_file: SourcePattern | Sequence[SourcePattern],
+    output_path: Path,
+    app_name: str,
+    cache: SchemaCache | None = None,
+    jobs: int | None = 1,
+    fast: bool = False,
+    hooks: Sequence[Hook] = (),
+) -> None:
     """Generate an AsyncAPI document from the provided model and function definitions.
 
     Args:
-        models_file (Path): The path to the file containing the model definitions.
-        functions_file (Path): The path to the file containing the function definitions.
+        models_file (SourcePattern | Sequence[SourcePattern]): The files, directories or glob patterns
+            of the modules containing the model definitions.
+        functions_file (SourcePattern | Sequence[SourcePattern]): The files, directories or glob patterns
+            of the modules containing the function definitions.
         output_path (Path): The path where the generated AsyncAPI document will be saved.
         app_name (str): The name of the application.
+        cache (SchemaCache | None): The cache of the schemas. When given, only the classes and
+            functions edited since the last run are converted, and a run on unchanged sources
+            doesn't write anything.
+        jobs (int | None): The number of processes that scan the modules. None uses one process per CPU.
+        fast (bool): Whether to parse only the signatures, docstrings and class fields of the modules,
+            which is much faster on large modules and builds the same schemas.
+        hooks (Sequence[Hook]): The hooks told of the run, of the "load", "scan", "document" and "write"
+            stages, and of every schema and operation added to the document. The modules are parsed and
+            their schemas built in the "scan" stage.
 
     Returns:
         None
+
+    Raises:
+        NameCollision: If two modules define a schema or a function with the same name.
+    """
+    with run(hooks, app_name):
+        modules: list[tuple[Path, str, ModuleKind]] = []
+        with stage(
+            hooks, "load", modules=lambda: len(modules), characters=lambda: sum(len(source) for _, source, _ in modules)
+        ):
+            modules = read_modules(expand_sources(as_patterns(models_file)), "models")
+            modules += read_modules(expand_sources(as_patterns(functions_file)), "functions")
+
+        destination = output_path / f"{app_name}.yml" if output_path.is_dir() else output_path
+        fingerprint = content_hash(
+            generator_version(),
+            default_type_registry.fingerprint(),
+            "asyncapi",
+            app_name,
+            str(destination.resolve()),
+            *(part for path, source, kind in modules for part in (kind, str(path), source)),
+        )
+        if cache is not None and cache.output_is_current(fingerprint, destination):
+            return
+
+        async_api_content = build_asyncapi_content(modules, app_name, cache, jobs, fast, hooks)
+        with stage(hooks, "write", bytes=lambda: destination.stat().st_size):
+            save_yaml_file(async_api_content, destination, app_name)
+        if cache is not None:
+            cache.record_output(fingerprint, destination)
+
+
+def generate_asyncapi_from_sources(
+    models_sources: Mapping[str, str],
+    functions_sources: Mapping[str, str],
+    app_name: str,
+    output_name: str = "asyncapi.yaml",
+    jobs: int | None = 1,
+    fast: bool = False,
+    hooks: Sequence[Hook] = (),
+) -> dict[str, str]:
+    """Generate an AsyncAPI document from the source code of the modules, without reading or writing files.
+
+    The schemas aren't cached on disk, every call scans the modules again.
+
+    Args:
+        models_sources (Mapping[str, str]): The source code of the modules containing the model
+            definitions, keyed by a name that identifies the module in the errors, e.g. its path.
+        functions_sources (Mapping[str, str]): The source code of the modules containing the function
+            definitions, keyed the same way.
+        app_name (str): The name of the application.
+        output_name (str): The name of the document in the returned mapping.
+        jobs (int | None): The number of processes that scan the modules. None uses one process per CPU.
+        fast (bool): Whether to parse only the signatures, docstrings and class fields of the modules.
+        hooks (Sequence[Hook]): The hooks told of the run, of the "scan", "document" and "dump" stages,
+            and of every schema and operation added to the document.
+
+    Returns:
+        dict[str, str]: The YAML text of the document, keyed by `output_name`.
+
+    Raises:
+        NameCollision: If two modules define a schema or a function with the same name.
+    """
+    modules: list[tuple[Path, str, ModuleKind]] = [
+        *((Path(name), source, "models") for name, source in models_sources.items()),
+        *((Path(name), source, "functions") for name, source in functions_sources.items()),
+    ]
+    with run(hooks, app_name):
+        async_api_content = build_asyncapi_content(modules, app_name, None, jobs, fast, hooks)
+        text = ""
+        with stage(hooks, "dump", bytes=lambda: len(text.encode())):
+            text = dump_yaml(async_api_content)
+    return {output_name: text}
+
+
+def build_asyncapi_content(
+    modules: Sequence[tuple[Path, str, ModuleKind]],
+    app_name: str,
+    cache: SchemaCache | None = None,
+    jobs: int | None = 1,
+    fast: bool = False,
+    hooks: Sequence[Hook] = (),
+) -> dict[str, Any]:
+    """Build the AsyncAPI document of the given modules.
+
+    Args:
+        modules (Sequence[tuple[Path, str, ModuleKind]]): The path, the source code and the kind of every module.
+        app_name (str): The name of the application.
+        cache (SchemaCache | None): The cache of the schemas.
+        jobs (int | None): The number of processes that scan the modules. None uses one process per CPU.
+        fast (bool): Whether to parse only the signatures, docstrings and class fields of the modules.
+        hooks (Sequence[Hook]): The hooks of the "scan" and "document" stages.
+
+    Returns:
+        dict[str, Any]: The AsyncAPI document.
+
+    Raises:
+        NameCollision: If two modules define a schema or a function with the same name.
     """
-    models_ast = parse_python_file_to_ast(models_file)
-    models_schema = generate_component_schemas(models_ast)
+    scans: list[ModuleScan] = []
+    with stage(hooks, "scan", modules=lambda: len(scans)):
+        scans = scan_modules(modules, jobs, cache, fast)
+
+    with stage(hooks, "document", schemas=lambda: len(models_schema), operations=lambda: len(functions_parsed)):
+        models_schema, api_description, functions_parsed = merge_scans(scans)
+        return create_async_api_content(app_name, models_schema, api_description, functions_parsed, hooks)
+
+
+def as_patterns(sources: SourcePattern | Sequence[SourcePattern]) -> list[SourcePattern]:
+    """Normalize a single source, or a sequence of sources, to a list.
+
+    Args:
+        sources (SourcePattern | Sequence[SourcePattern]): The files, directories or glob patterns.
+
+    Returns:
+        list[SourcePattern]: The sources.
+    """
+    return [sources] if isinstance(sources, (str, Path)) else list(sources)
+
+
+@dataclass
+class IncrementalAsyncAPIGenerator:
+    """Generate an AsyncAPI document and keep it up to date as the sources change.
+
+    The schemas built from every module are kept in memory, so when a module changes only
+    that module is built again.
+
+    Attributes:
+        models_file (SourcePattern | Sequence[SourcePattern]): The modules containing the model definitions.
+        functions_file (SourcePattern | Sequence[SourcePattern]): The modules containing the function definitions.
+        output_path (Path): The path where the generated AsyncAPI document will be saved.
+        app_name (str): The name of the application.
+        cache (SchemaCache | None): The cache of the schemas.
+        fast (bool): Whether to parse only the signatures, docstrings and class fields of the modules.
+    """
+
+    models_file: SourcePattern | Sequence[SourcePattern]
+    functions_file: SourcePattern | Sequence[SourcePattern]
+    output_path: Path
+    app_name: str
+    cache: SchemaCache | None = None
+    fast: bool = False
+    scans: dict[Path, ModuleScan] = field(init=False, repr=False, default_factory=dict)
+
+    @property
+    def models_files(self) -> list[Path]:
+        """The modules containing the model definitions."""
+        return expand_sources(as_patterns(self.models_file))
+
+    @property
+    def functions_files(self) -> list[Path]:
+        """The modules containing the function definitions."""
+        return expand_sources(as_patterns(self.functions_file))
+
+    def _load(self, paths: Iterable[Path], kind: ModuleKind) -> None:
+        for path, source, _ in read_modules(paths, kind):
+            self.scans[path] = scan_module(path, source, kind, self.cache, self.fast)
+
+    def load_models(self, paths: Iterable[Path] | None = None) -> None:
+        """Build the component schemas from the models modules.
+
+        Args:
+            paths (Iterable[Path] | None): The modules to build. None builds every models module.
+        """
+        self._load(self.models_files if paths is None else paths, "models")
+
+    def load_functions(self, paths: Iterable[Path] | None = None) -> None:
+        """Build the request and response schemas from the functions modules.
+
+        Args:
+            paths (Iterable[Path] | None): The modules to build. None builds every functions module.
+        """
+        self._load(self.functions_files if paths is None else paths, "functions")
 
-    functions_ast = parse_python_file_to_ast(functions_file)
-    api_description, functions_parsed = function_content_reader(functions_ast)
+    def generate(self, changed: set[Path] | None = None) -> None:
+        """Build the changed modules and write the document.
 
-    async_api_content = create_async_api_content(app_name, models_schema, api_description, functions_parsed)
+        Args:
+            changed (set[Path] | None): The modules that changed. None builds every module.
+        """
+        models_files, functions_files = self.models_files, self.functions_files
+        if changed is None:
+            self.load_models()
+            self.load_functions()
+        else:
+            if changed_models := [path for path in models_files if path in changed]:
+                self.load_models(changed_models)
+            if changed_functions := [path for path in functions_files if path in changed]:
+                self.load_functions(changed_functions)
 
-    save_yaml_file(async_api_content, output_path, app_name)
+        models_schema, api_description, functions_parsed = merge_scans(
+            self.scans[path] for path in [*models_files, *functions_files] if path in self.scans
+        )
+        async_api_content = create_async_api_content(self.app_name, models_schema, api_description, functions_parsed)
+        save_yaml_file(async_api_content, self.output_path, self.app_name)
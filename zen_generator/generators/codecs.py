@@ -0,0 +1,177 @@
+"""This module contains utilities for generating the codecs of the models.
+
+Every model gets a `<model>_to_dict` encoder and a `<model>_from_dict` decoder, which convert
+between the model and the dictionary sent on the wire. The field accesses are unrolled when
+the code is generated, so nothing is looked up by reflection when a payload is converted:
+
+- the fields that refer to another model call its codec, also for every item of a list;
+- the fields whose type has a string representation on the wire, e.g. `datetime`, are converted;
+- the other fields are copied as they are.
+
+A `oneOf` field is encoded with the codec of the model it is an instance of, and decoded only
+when a single option is a model, since the options can't be told apart otherwise. The models
+must expose their fields as attributes and accept them as keyword arguments, as dataclasses,
+`msgspec.Struct` and pydantic models do.
+"""
+
+from __future__ import annotations
+
+import re
+from ast import parse, stmt
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from zen_generator.core.ast_utils import snake_case
+from zen_generator.core.type_system import (
+    ListOf,
+    Primitive,
+    Ref,
+    TypeNode,
+    TypeRegistry,
+    Union,
+    default_type_registry,
+    type_from_schema,
+)
+
+_VALUE_PATTERN = re.compile(r"\bvalue\b")
+
+# the encoder and the decoder of the types sent as strings, `{value}` is the converted expression
+TYPE_CONVERSIONS = {
+    "datetime": ("{value}.isoformat()", "datetime.fromisoformat({value})"),
+    "date": ("{value}.isoformat()", "date.fromisoformat({value})"),
+    "UUID": ("str({value})", "UUID({value})"),
+    "Decimal": ("str({value})", "Decimal({value})"),
+}
+
+
+@dataclass
+class CodecBuilder:
+    """Build the source code of the codecs of the models.
+
+    Attributes:
+        schemas (Mapping[str, Any]): The models, from `components.schemas`. The fields that refer
+            to a model that isn't part of `schemas` are copied as they are.
+        registry (TypeRegistry): The type registry.
+        function_names (dict[str, tuple[str, str]]): The encoder and the decoder of every model.
+    """
+
+    schemas: Mapping[str, Any]
+    registry: TypeRegistry = field(default_factory=lambda: default_type_registry)
+    function_names: dict[str, tuple[str, str]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        taken: set[str] = set(self.schemas)
+        for name in self.schemas:
+            unique = base = snake_case(name)
+            suffix = 1
+            while f"{unique}_to_dict" in taken or f"{unique}_from_dict" in taken:
+                suffix += 1
+                unique = f"{base}_{suffix}"
+            self.function_names[name] = (f"{unique}_to_dict", f"{unique}_from_dict")
+            taken.update(self.function_names[name])
+
+    def codecs_ast(self, name: str) -> list[stmt]:
+        """Build the encoder and the decoder of a model.
+
+        Args:
+            name (str): The name of the model.
+
+        Returns:
+            list[stmt]: The two functions.
+        """
+        schema = self.schemas[name]
+        encoder, decoder = self.function_names[name]
+        required = schema.get("required") or []
+        encoded: list[str] = []
+        decoded: list[str] = []
+        for prop_name, prop in (schema.get("properties") or {}).items():
+            type_node = type_from_schema(prop, self.registry)
+            optional = prop_name not in required
+            value = f"obj.{prop_name}"
+            converted = self.encode(type_node, value)
+            if converted != value and optional and not isinstance(type_node, Union):
+                converted = f"None if {value} is None else {converted}"
+            encoded.append(f"{prop_name!r}: {converted}")
+
+            value = f"data.get({prop_name!r})" if optional else f"data[{prop_name!r}]"
+            converted = self.decode(type_node, "value")
+            if converted == "value":
+                converted = value
+            elif not optional and len(_VALUE_PATTERN.findall(converted)) == 1:
+                converted = self.decode(type_node, value)
+            else:
+                # the value is looked up once, and None is passed through
+                converted = f"None if (value := {value}) is None else {converted}"
+            decoded.append(f"{prop_name}={converted}")
+        source = f"""
+def {encoder}(obj: {name}) -> dict[str, Any]:
+    return {{{", ".join(encoded)}}}
+
+
+def {decoder}(data: dict[str, Any]) -> {name}:
+    return {name}({", ".join(decoded)})
+"""
+        return parse(source).body
+
+    def encode(self, type_node: TypeNode, value: str) -> str:
+        """Return the expression that encodes a value.
+
+        Args:
+            type_node (TypeNode): The type of the value.
+            value (str): The expression of the value.
+
+        Returns:
+            str: The encoded expression, `value` itself when nothing is converted.
+        """
+        match type_node:
+            case Ref(name) if name in self.function_names:
+                return f"{self.function_names[name][0]}({value})"
+            case Primitive(name) if name in TYPE_CONVERSIONS:
+                return TYPE_CONVERSIONS[name][0].format(value=value)
+            case ListOf(item):
+                item_encoded = self.encode(item, "item")
+                if item_encoded == "item":
+                    return value
+                return f"[{item_encoded} for item in {value}]"
+            case Union(options):
+                encoded = value
+                for option in reversed(options):
+                    option_encoded = self.encode(option, value)
+                    if option_encoded != value and isinstance(option, Ref | Primitive):
+                        encoded = f"{option_encoded} if isinstance({value}, {option.name}) else {encoded}"
+                return encoded
+        return value
+
+    def decode(self, type_node: TypeNode, value: str) -> str:
+        """Return the expression that decodes a value, see `encode`."""
+        match type_node:
+            case Ref(name) if name in self.function_names:
+                return f"{self.function_names[name][1]}({value})"
+            case Primitive(name) if name in TYPE_CONVERSIONS:
+                return TYPE_CONVERSIONS[name][1].format(value=value)
+            case ListOf(item):
+                item_decoded = self.decode(item, "item")
+                if item_decoded == "item":
+                    return value
+                return f"[{item_decoded} for item in {value}]"
+            case Union(options):
+                # a model is sent as an object, which tells it apart only from options that aren't objects
+                objects = [option for option in options if isinstance(option, Ref) or option == Primitive("object")]
+                if len(objects) == 1 and isinstance(objects[0], Ref) and objects[0].name in self.function_names:
+                    decoded = self.decode(objects[0], value)
+                    return f"{decoded} if isinstance({value}, dict) else {value}"
+        return value
+
+
+def build_codecs_ast(schemas: Mapping[str, Any], registry: TypeRegistry | None = None) -> list[stmt]:
+    """Build the codecs of the models, see `CodecBuilder`.
+
+    Args:
+        schemas (Mapping[str, Any]): The models, from `components.schemas`.
+        registry (TypeRegistry | None): The type registry. Defaults to `default_type_registry`.
+
+    Returns:
+        list[stmt]: The encoder and the decoder of every model.
+    """
+    builder = CodecBuilder(schemas, registry or default_type_registry)
+    return [node for name in schemas for node in builder.codecs_ast(name)]
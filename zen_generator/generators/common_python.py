@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from ast import (
+    AST,
     AnnAssign,
     Assign,
     Attribute,
@@ -12,6 +13,7 @@ from ast import (
     ClassDef,
     Constant,
     Expr,
+    If,
     Import,
     ImportFrom,
     Load,
@@ -21,20 +23,242 @@ from ast import (
     alias,
     arg,
     expr,
+    iter_fields,
+    keyword,
     parse,
     stmt,
     unparse,
+    walk,
 )
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from keyword import iskeyword
 from pathlib import Path
-from typing import Any, Sequence, cast
+from typing import Any, Callable, Iterable, Mapping, Sequence, cast
 
 from zen_generator.core.ast_utils import (
     convert_asyncapi_property_to_ast_node,
     create_ast_function_definition,
     get_component_schemas,
+    snake_case,
 )
-from zen_generator.core.io import load_yaml, save_python_file
+from zen_generator.core.docstrings import GOOGLE_SECTION_PATTERN, NUMPY_UNDERLINE_PATTERN, SECTION_KINDS
+from zen_generator.core.document import DEFAULT_LAZY_DEPTH, load_lazy_yaml_file
+from zen_generator.core.formatting import RuffFormatter, get_default_formatter
+from zen_generator.core.hooks import Hook, item, run, stage
+from zen_generator.core.io import render_python_files, save_python_files
+from zen_generator.core.parsing import REQUIRED_RESPONSE_KEY
+from zen_generator.core.profiling import count_nodes
+from zen_generator.core.refs import RefGraph, UnknownOperation, build_ref_graph
+from zen_generator.core.type_system import default_type_registry
+from zen_generator.generators.codecs import CodecBuilder
+from zen_generator.generators.validators import build_validators_ast
+
+# the depth of `components.schemas.<name>`, to load only the selected schemas
+SELECTION_LAZY_DEPTH = 3
+
+MODELS_INIT_TEMPLATE = '''\
+"""The generated models, every model is imported from its module on first access."""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+_MODULES = {modules!r}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}") from None
+    value = getattr(import_module(f".{{module}}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({{*globals(), *_MODULES}})
+'''
+
+
+def type_imports(nodes: Sequence[stmt]) -> list[stmt]:
+    """Build the imports of the registered types that the given nodes refer to.
+
+    Args:
+        nodes (Sequence[stmt]): The generated statements.
+
+    Returns:
+        list[stmt]: One `from module import name` statement per module, e.g. `from datetime import datetime`.
+    """
+    # the names that are read: the annotations, the decorators and the expressions, not the
+    # targets, e.g. a field called `date`, nor the arguments, which aren't `Name` nodes
+    names = {
+        node.id
+        for statement in nodes
+        for node in walk(statement)
+        if isinstance(node, Name) and isinstance(node.ctx, Load)
+    }
+    return [
+        ImportFrom(module=module, names=[alias(name=name) for name in imported], level=0)
+        for module, imported in default_type_registry.imports_for(names).items()
+    ]
+
+
+def model_groups(schemas: Sequence[str], cycles: Sequence[Sequence[str]]) -> list[list[str]]:
+    """Group the models that reference each other, keeping the order of the models.
+
+    Args:
+        schemas (Sequence[str]): The models, in definition order.
+        cycles (Sequence[Sequence[str]]): The groups of models that reference each other.
+
+    Returns:
+        list[list[str]]: The groups, a model that isn't part of a cycle is a group on its own.
+    """
+    cycle_of = {name: list(cycle) for cycle in cycles for name in cycle}
+    selected = set(schemas)
+    groups: list[list[str]] = []
+    grouped: set[str] = set()
+    for name in schemas:
+        if name not in grouped:
+            group = [member for member in cycle_of.get(name, [name]) if member in selected]
+            grouped.update(group)
+            groups.append(group)
+    return groups
+
+
+def unique_module_name(class_name: str, taken: set[str]) -> str:
+    """Return the snake case name of the module of a model, e.g. `http_request` for `HTTPRequest`.
+
+    Args:
+        class_name (str): The name of the model.
+        taken (set[str]): The names of the modules already generated.
+
+    Returns:
+        str: A valid module name, not in `taken`.
+    """
+    name = snake_case(class_name)
+    if iskeyword(name) or not name.isidentifier() or name == "__init__":
+        name = f"{name}_"
+    unique, suffix = name, 1
+    while unique in taken:
+        suffix += 1
+        unique = f"{name}_{suffix}"
+    return unique
+
+
+def models_init_ast(module_of: Mapping[str, str]) -> list[stmt]:
+    """Build the `__init__` module of a models package.
+
+    Args:
+        module_of (Mapping[str, str]): The module of every model.
+
+    Returns:
+        list[stmt]: The module, which imports the models lazily and exposes them to type checkers.
+    """
+    body = parse(MODELS_INIT_TEMPLATE.format(modules=dict(module_of))).body
+    imported: dict[str, list[str]] = {}
+    for name, module in module_of.items():
+        imported.setdefault(module, []).append(name)
+    if imported:
+        imports: list[stmt] = [
+            ImportFrom(module=module, names=[alias(name=name) for name in names], level=1)
+            for module, names in imported.items()
+        ]
+        # after the docstring and the imports
+        body.insert(4, If(test=Name(id="TYPE_CHECKING", ctx=Load()), body=imports, orelse=[]))
+    return body
+
+
+def replace_func_name(node: Any, func_name: str) -> Any:
+    """Copy an AST node, replacing the `/{func_name}` placeholder of its strings.
+
+    The node is copied field by field, which is faster than unparsing and parsing it again.
+
+    Args:
+        node (Any): The node, a list of nodes or the value of a field.
+        func_name (str): The name of the function.
+
+    Returns:
+        Any: The copy.
+    """
+    if isinstance(node, list):
+        return [replace_func_name(child, func_name) for child in node]
+    if isinstance(node, Constant) and isinstance(node.value, str):
+        return Constant(value=node.value.replace("/{func_name}", f"/{func_name}"))
+    if isinstance(node, AST):
+        return type(node)(**{name: replace_func_name(value, func_name) for name, value in iter_fields(node)})
+    return node
+
+
+def body_docstring(docstring: str, body_type: str) -> str:
+    """Replace the parameters documented in a docstring with the `body` argument of a route.
+
+    The Google and NumPy parameters sections are replaced with a section documenting `body`,
+    and the Sphinx `:param:` and `:type:` fields with a `:param body:` field. A docstring
+    without parameters is returned unchanged.
+
+    Args:
+        docstring (str): The docstring of the operation.
+        body_type (str): The annotation of the `body` argument.
+
+    Returns:
+        str: The docstring of the route.
+    """
+    lines = docstring.splitlines()
+    kept: list[str] = []
+    # whether the `:param body:` field has been written
+    documented = False
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+        indent = line[: len(line) - len(line.lstrip())]
+        next_line = lines[index + 1] if index + 1 < len(lines) else ""
+        match = GOOGLE_SECTION_PATTERN.match(stripped)
+        if match and match["name"] and SECTION_KINDS[match["name"].lower()] == "params":
+            # the entries are indented below the header
+            index = _section_end(lines, index + 1, _indented_below(lines, len(indent)))
+            kept.extend([line, f"{indent}    body ({body_type}): The request payload."])
+        elif SECTION_KINDS.get(stripped.lower()) == "params" and NUMPY_UNDERLINE_PATTERN.match(next_line):
+            # the section ends at the next header, a line followed by its underline
+            index = _section_end(
+                lines, index + 2, lambda at: at + 1 >= len(lines) or not NUMPY_UNDERLINE_PATTERN.match(lines[at + 1])
+            )
+            kept.extend([line, next_line, f"{indent}body : {body_type}", f"{indent}    The request payload."])
+        elif stripped.startswith((":param", ":type", ":parameter", ":arg", ":key")):
+            # the continuation lines of the field
+            index = _section_end(lines, index + 1, lambda at: not lines[at].strip().startswith(":"))
+            if not documented:
+                kept.append(f"{indent}:param body: The request payload.")
+                documented = True
+        else:
+            kept.append(line)
+            index += 1
+    return "\n".join(kept) + ("\n" if docstring.endswith("\n") else "")
+
+
+def _indented_below(lines: Sequence[str], depth: int) -> Callable[[int], bool]:
+    """Return whether the line at an index is indented more than `depth`."""
+    return lambda index: len(lines[index]) - len(lines[index].lstrip()) > depth
+
+
+def _section_end(lines: Sequence[str], start: int, continues: Callable[[int], bool]) -> int:
+    """Return the index after the last line of the section starting at `start`.
+
+    The section goes on while its non-blank lines satisfy `continues`. The blank lines after
+    its last line aren't part of it.
+    """
+    end = index = start
+    while index < len(lines):
+        if lines[index].strip():
+            if not continues(index):
+                break
+            end = index + 1
+        index += 1
+    return end
 
 
 @dataclass
@@ -48,9 +272,37 @@ class BasePythonGenerator:
         output_file (Path): The path to the generated Python file.
         models_file (Path): The path to the generated models file.
         override_base_class (str | None): The base class to override in the generated code.
+            An empty string generates the models without base class.
         decorator_list (Sequence[expr]): A list of decorators to apply to the generated class.
+        model_decorator_list (Sequence[expr]): The decorators of the generated models.
+        model_keywords (Sequence[keyword]): The keyword arguments of the class definition of the models,
+            e.g. `frozen=True` for `msgspec.Struct`.
+        optional_defaults (bool): Whether the optional fields of the models default to None. The models
+            must accept the fields with a default before the required ones, e.g. with `kw_only=True`.
         additional_imports (Sequence[stmt | ImportFrom]): Additional imports to include in the generated code.
         extra_assignments (Sequence[stmt]): Additional assignments to include in the generated code.
+        formatter (RuffFormatter): The formatter service used for the generated files.
+        operations (Sequence[str] | None): The operations to generate, with the models they depend on.
+        tags (Sequence[str] | None): The tags of the operations to generate. Every operation is
+            generated when neither `operations` nor `tags` are given.
+        split_models (bool): Whether to generate the models as a package, one module per model,
+            instead of a single module.
+        runtime_model_imports (bool): Whether the modules of the models package import the models
+            they refer to at runtime, as required by pydantic, instead of under `TYPE_CHECKING`.
+        codecs (bool): Whether to generate the `<model>_to_dict` and `<model>_from_dict` functions
+            of every model next to it, see `CodecBuilder`. The models of a package are then imported
+            at runtime by the modules that refer to them.
+        validators (bool): Whether to generate the validators of the models and of the request
+            payloads, in the `validators.py` module next to the models, see `build_validators_ast`.
+        request_body_models (bool): Whether every function takes its request payload as a single
+            `body` argument, typed with a model generated next to the others, e.g. `GetOrderRequest`
+            for `get_order`, instead of one argument per property.
+        response_models (bool): Whether the decorators of the functions that are calls get the return
+            annotation as `response_model` keyword argument.
+        async_operations (Sequence[str] | None): The operations generated as async functions, even
+            when `is_async` isn't set.
+        hooks (Sequence[Hook]): The hooks told of the run and of the stages of `generate_files_from_asyncapi`,
+            and of every schema and operation emitted, see `zen_generator.core.hooks`.
     """
 
     models_ast: list[stmt] = field(init=False, repr=False, default_factory=list)
@@ -59,9 +311,29 @@ class BasePythonGenerator:
     extra_assignments: Sequence[stmt] = field(default_factory=list)
     override_base_class: str | None = None
     decorator_list: Sequence[expr] = field(default_factory=list)
-    source_content: dict[str, Any] = field(init=False, repr=False, default_factory=dict)
+    model_decorator_list: Sequence[expr] = field(default_factory=list)
+    model_keywords: Sequence[keyword] = field(default_factory=list)
+    optional_defaults: bool = False
+    source_content: Mapping[str, Any] = field(init=False, repr=False, default_factory=dict)
     component_schemas: dict[str, Any] = field(init=False, repr=False, default_factory=dict)
     is_async: bool = False
+    formatter: RuffFormatter = field(default_factory=get_default_formatter)
+    operations: Sequence[str] | None = None
+    tags: Sequence[str] | None = None
+    split_models: bool = False
+    runtime_model_imports: bool = False
+    codecs: bool = False
+    validators: bool = False
+    request_body_models: bool = False
+    response_models: bool = False
+    async_operations: Sequence[str] | None = None
+    hooks: Sequence[Hook] = field(default_factory=list)
+    models_package: dict[str, list[stmt]] = field(init=False, repr=False, default_factory=dict)
+    validators_ast: list[stmt] = field(init=False, repr=False, default_factory=list)
+    _generated: bool = field(init=False, repr=False, default=False)
+    _ref_graph: RefGraph | None = field(init=False, repr=False, default=None)
+    _ref_graph_sources: tuple[Any, ...] = field(init=False, repr=False, default=())
+    _request_bodies: tuple[Any, ...] = field(init=False, repr=False, default=())
 
     def __post__init__(self) -> None:
         """Generate Python files from an AsyncAPI specification.
@@ -103,19 +375,229 @@ class BasePythonGenerator:
             None
         """
         self.is_async = is_async
+        with run(self.hooks, app_name):
+            with stage(self.hooks, "load"):
+                self.load_asyncapi_content(source_file)
+            modules = self._generate_modules(app_name, models_file, functions_file)
+            save_python_files(modules, self.formatter, self.hooks)
+
+    def generate_artifacts(
+        self,
+        content: Mapping[str, Any],
+        app_name: str,
+        models_module: str = "models",
+        functions_module: str = "functions",
+        is_async: bool = False,
+        formatter: RuffFormatter | None = None,
+    ) -> dict[str, str]:
+        """Generate the Python modules from an AsyncAPI document in memory, without reading or writing files.
+
+        Args:
+            content: The AsyncAPI document.
+            app_name: The name of the application.
+            models_module: The name of the models module, or package with `split_models`.
+            functions_module: The name of the functions module.
+            is_async: Whether the generated code should be asynchronous.
+            formatter: The formatter of the generated code. Defaults to the formatter of the generator
+                without its cache, so that the formatted code isn't stored on disk; a formatter with a
+                `DiskCache` reuses the code formatted by previous runs.
+
+        Returns:
+            dict[str, str]: The formatted code of every module, keyed by its path relative to the
+            output directory, e.g. "models.py", "functions.py" or "models/__init__.py".
+        """
+        self.is_async = is_async
+        with run(self.hooks, app_name):
+            self.source_content = content
+            modules = self._generate_modules(app_name, Path(f"{models_module}.py"), Path(f"{functions_module}.py"))
+            formatter = formatter or replace(self.formatter, cache=None)
+            sources = render_python_files(modules, formatter, self.hooks)
+        return {path.as_posix(): code for path, code in sources.items()}
+
+    def _generate_modules(self, app_name: str, models_file: Path, functions_file: Path) -> dict[Path, list[stmt]]:
+        """Generate the modules of the loaded document, keyed by destination path."""
+        with stage(
+            self.hooks,
+            "schemas",
+            schemas=lambda: len(self.component_schemas),
+            operations=lambda: len(self.selected_operations()),
+        ):
+            self.load_component_schemas()
+            self._check_references()
+
+        modules: dict[Path, list[stmt]] = {}
+        with stage(self.hooks, "ast", modules=lambda: len(modules), nodes=lambda: count_nodes(modules.values())):
+            self._generate_models()
+            self.functions_ast = []
+            self.generate_function_ast(app_name, models_file.stem)
+            if self.validators:
+                self.generate_validators_ast()
+            modules = {
+                **self.models_modules(models_file),
+                functions_file: self.functions_ast,
+                **self.validators_modules(models_file),
+            }
+        return modules
+
+    def regenerate_files_from_asyncapi(
+        self,
+        source_file: Path,
+        models_file: Path,
+        functions_file: Path,
+        app_name: str,
+    ) -> list[Path]:
+        """Regenerate only the Python files affected by the changes of the AsyncAPI specification.
+
+        The sections of the specification used by the previous call are kept in memory: the
+        models file is regenerated when `components.schemas` changes, the functions file when
+        the operations, the messages, the description or the names of the models change, and
+        the validators when any of them changes. With `request_body_models`, the models file is also
+        regenerated when the functions file is. The first call generates every file.
+
+        Args:
+            source_file: The path to the AsyncAPI file.
+            models_file: The path to the generated models file.
+            functions_file: The path to the generated functions file.
+            app_name: The name of the application.
+
+        Returns:
+            list[Path]: The files that have been written.
+        """
+        previous_schemas = self.component_schemas
+        previous_functions_inputs = self._functions_inputs()
         self.load_asyncapi_content(source_file)
         self.load_component_schemas()
+        self._check_references()
+
+        modules: dict[Path, list[stmt]] = {}
+        schemas_changed = not self._generated or self.component_schemas != previous_schemas
+        functions_changed = not self._generated or self._functions_inputs() != previous_functions_inputs
+        if schemas_changed or (self.request_body_models and functions_changed):
+            self._generate_models()
+            modules.update(self.models_modules(models_file))
+        if functions_changed:
+            self.functions_ast = []
+            self.generate_function_ast(app_name, models_file.stem)
+            modules[functions_file] = self.functions_ast
+        if self.validators and (schemas_changed or functions_changed):
+            self.generate_validators_ast()
+            modules.update(self.validators_modules(models_file))
+
+        save_python_files(modules, self.formatter)
+        self._generated = True
+        return list(modules)
+
+    def _functions_inputs(self) -> tuple[Any, ...]:
+        """Return the sections of the specification the functions file is generated from."""
+        components = self.source_content.get("components", {})
+        info = self.source_content.get("info", {})
+        return (
+            info.get("description"),
+            components.get("operations"),
+            components.get("messages"),
+            components.get("channels"),
+            self.source_content.get("channels"),
+            list(self.component_schemas),
+        )
+
+    @property
+    def _selects_operations(self) -> bool:
+        return self.operations is not None or self.tags is not None
 
-        self.generate_models_ast()
-        save_python_file(self.models_ast, models_file)
-        self.generate_function_ast(app_name, models_file.stem)
-        save_python_file(self.functions_ast, functions_file)
+    def selected_operations(self) -> list[str]:
+        """Return the operations to generate, every operation unless `operations` or `tags` are given.
+
+        Returns:
+            list[str]: The names of the operations, in document order.
+
+        Raises:
+            UnknownOperation: If one of `operations` isn't defined in the document.
+        """
+        if not self._selects_operations:
+            return [str(name) for name in self.source_content.get("components", {}).get("operations", {})]
+        return self.ref_graph.select_operations(self.operations or (), self.tags or ())
+
+    def selected_schemas(self) -> list[str]:
+        """Return the models to generate, in definition order.
+
+        When operations are selected, only the models their messages depend on are generated.
+
+        Returns:
+            list[str]: The names of the models.
+        """
+        if not self._selects_operations:
+            return self.ref_graph.schema_order()
+        return self.ref_graph.reachable_schemas(self.selected_operations())
+
+    @property
+    def ref_graph(self) -> RefGraph:
+        """The graph of the references of the loaded document, built once per document."""
+        sources = (self.source_content, self.component_schemas)
+        if self._ref_graph is None or any(old is not new for old, new in zip(self._ref_graph_sources, sources)):
+            self._ref_graph = build_ref_graph(self.source_content, self.component_schemas)
+            self._ref_graph_sources = sources
+        return self._ref_graph
 
     def load_component_schemas(self) -> None:
         self.component_schemas = get_component_schemas(self.source_content) or {}
 
     def load_asyncapi_content(self, source_file) -> None:
-        self.source_content = load_yaml(source_file) or {}
+        # the document is loaded lazily: only the sections read by the generator are built,
+        # down to the single schemas and messages when only some operations are generated
+        depth = SELECTION_LAZY_DEPTH if self._selects_operations else DEFAULT_LAZY_DEPTH
+        self.source_content = load_lazy_yaml_file(source_file, depth) or {}
+
+    def _check_references(self) -> None:
+        """Check the references the generated files depend on, see `RefGraph.check`.
+
+        Raises:
+            UnknownOperation: If one of `async_operations` isn't defined in the document.
+        """
+        self.ref_graph.check(self.selected_operations() if self._selects_operations else None)
+        defined = self.source_content.get("components", {}).get("operations", {})
+        unknown = [name for name in self.async_operations or () if name not in defined]
+        if unknown:
+            raise UnknownOperation(unknown[0])
+
+    def request_body_names(self) -> dict[str, str]:
+        """Return the name of the body model of every selected operation with a request payload.
+
+        The payloads that refer to a model with `$ref` and the payloads without properties get no
+        body model. The name is the one of the request message in CamelCase, e.g. `GetOrderRequest`
+        for `get_order`, followed by a number when a model has the same name.
+
+        Returns:
+            dict[str, str]: The name of the body model, by operation.
+        """
+        graph = self.ref_graph
+        cached = self._request_bodies
+        if cached and cached[0] is graph and cached[1:3] == (self.operations, self.tags):
+            return cached[3]
+
+        taken = set(self.component_schemas)
+        names: dict[str, str] = {}
+        for operation in self.selected_operations():
+            payload = self.ref_graph.message(operation, "request").get("payload", {})
+            if "$ref" in payload or not payload.get("properties"):
+                continue
+            unique = base = "".join(part[:1].upper() + part[1:] for part in f"{operation}_request".split("_"))
+            suffix = 1
+            while unique in taken:
+                suffix += 1
+                unique = f"{base}{suffix}"
+            names[operation] = unique
+            taken.add(unique)
+        self._request_bodies = (graph, self.operations, self.tags, names)
+        return names
+
+    def _request_body_classes(self) -> list[stmt]:
+        """Build the body models of the request payloads, nothing if `request_body_models` isn't set."""
+        if not self.request_body_models:
+            return []
+        return [
+            self._build_model_class(name, self.ref_graph.message(operation, "request")["payload"])
+            for operation, name in self.request_body_names().items()
+        ]
 
     def _add_logger_setup(self, app_name: str) -> None:
         """Add logger setup to the module.
@@ -170,8 +652,14 @@ class BasePythonGenerator:
         Returns:
             None
         """
-        if self.component_schemas.items():
-            names = [alias(name=f"{model}") for model in self.component_schemas]
+        models = list(self.component_schemas)
+        if self._selects_operations:
+            selected = set(self.selected_schemas())
+            models = [model for model in models if model in selected]
+        if self.request_body_models:
+            models.extend(self.request_body_names().values())
+        if models:
+            names = [alias(name=f"{model}") for model in models]
             import_from = ImportFrom(
                 module=f".{module_name}",
                 names=names,
@@ -184,23 +672,55 @@ class BasePythonGenerator:
 
         This method generates the models as a sequence of AST nodes, which
         correspond to the classes defined in the `models` module. The classes are
-        generated from the `components/schemas` field of the AsyncAPI document.
+        generated from the `components/schemas` field of the AsyncAPI document, and every
+        class is defined after the classes it refers to. The body models of the request
+        payloads follow, when `request_body_models` is set.
 
         Returns:
             None
         """
-        if not self.component_schemas:
+        body_classes = self._request_body_classes()
+        if not self.component_schemas and not body_classes:
             return
 
         self.models_ast.extend(self.extra_imports)
+        imports_index = len(self.models_ast)
 
-        for class_name, schema in self.component_schemas.items():
+        schemas = self.selected_schemas()
+        for class_name in schemas:
+            self.models_ast.append(self._build_model_class(class_name, self.component_schemas[class_name]))
+        self.models_ast.extend(body_classes)
+        if self.codecs:
+            codecs = self._codec_builder(schemas)
+            self.models_ast.insert(imports_index, ImportFrom(module="typing", names=[alias(name="Any")], level=0))
+            self.models_ast.extend(node for name in schemas for node in codecs.codecs_ast(name))
+            imports_index += 1
+
+        self.models_ast[imports_index:imports_index] = type_imports(self.models_ast[imports_index:])
+
+    def _codec_builder(self, schemas: Sequence[str]) -> CodecBuilder:
+        return CodecBuilder({name: self.component_schemas[name] for name in schemas})
+
+    def _build_model_class(self, class_name: str, schema: Mapping[str, Any]) -> ClassDef:
+        """Generate the class of a model from its schema.
+
+        Args:
+            class_name (str): The name of the model.
+            schema (Mapping[str, Any]): The schema of the model, from `components/schemas`.
+
+        Returns:
+            ClassDef: The class of the model.
+        """
+        with item(self.hooks, "schema", class_name):
             class_body: list[stmt] = []
-            base_class_id = self.override_base_class or schema.get("base_class", "object")
+            base_class_id = (
+                schema.get("base_class", "object") if self.override_base_class is None else self.override_base_class
+            )
             if schema.get("properties"):
                 for prop_name, prop_value in schema["properties"].items():
                     annotation = convert_asyncapi_property_to_ast_node(prop_value)
-                    if annotation is not None and prop_name not in schema.get("required", []):
+                    optional = prop_name not in schema.get("required", [])
+                    if annotation is not None and optional:
                         annotation = BinOp(
                             left=cast(expr, annotation),
                             op=BitOr(),
@@ -211,20 +731,157 @@ class BasePythonGenerator:
                             AnnAssign(
                                 target=Name(id=prop_name, ctx=Store()),
                                 annotation=cast(expr, annotation),
+                                value=Constant(value=None) if optional and self.optional_defaults else None,
                                 simple=1,
                             )
                         )
             else:
                 class_body = [Pass()]
 
-            klass = ClassDef(
+            return ClassDef(
                 name=class_name,
-                bases=[Name(id=base_class_id, ctx=Load())],
+                bases=[Name(id=base_class_id, ctx=Load())] if base_class_id else [],
                 body=class_body,
-                decorator_list=[],
-                keywords=[],
+                decorator_list=list(self.model_decorator_list),
+                keywords=list(self.model_keywords),
             )
-            self.models_ast.append(klass)
+
+    def generate_models_package_ast(self) -> None:
+        """Generate the models as a package, one module per model.
+
+        The models that reference each other are defined in the same module. The models a
+        module refers to are imported under `TYPE_CHECKING`, or at runtime when
+        `runtime_model_imports` or `codecs` are set, and the `__init__` module imports every model,
+        and its codecs, lazily, on first access, with a module level `__getattr__` (PEP 562).
+        The body models of the request payloads are defined together in their own module.
+
+        Returns:
+            None
+        """
+        self.models_package = {}
+        body_classes = self._request_body_classes()
+        if not self.component_schemas and not body_classes:
+            return
+
+        schemas = self.selected_schemas()
+        groups = model_groups(schemas, self.ref_graph.cycles)
+        codecs = self._codec_builder(schemas) if self.codecs else None
+        module_of: dict[str, str] = {}
+        for group in groups:
+            module = unique_module_name(group[0], set(self.models_package))
+            module_of.update(dict.fromkeys(group, module))
+
+            classes: list[stmt] = [self._build_model_class(name, self.component_schemas[name]) for name in group]
+            if codecs is not None:
+                classes.extend(node for name in group for node in codecs.codecs_ast(name))
+                module_of.update(
+                    dict.fromkeys((codec for name in group for codec in codecs.function_names[name]), module)
+                )
+            referenced: dict[str, dict[str, None]] = {}
+            for name in group:
+                for dependency in self.ref_graph.dependencies(name):
+                    if dependency in module_of and module_of[dependency] != module:
+                        imported = referenced.setdefault(module_of[dependency], {})
+                        imported[dependency] = None
+                        if codecs is not None:
+                            imported.update(dict.fromkeys(codecs.function_names[dependency]))
+            self.models_package[module] = self._models_module_ast(classes, referenced, codecs is not None)
+
+        if body_classes:
+            self._add_request_bodies_module(body_classes, module_of)
+
+        self.models_package["__init__"] = models_init_ast(module_of)
+
+    def _add_request_bodies_module(self, body_classes: list[stmt], module_of: dict[str, str]) -> None:
+        """Add the module of the body models to the models package, and the body models to `module_of`."""
+        module = unique_module_name("RequestBodies", set(self.models_package))
+        used = {node.id for class_def in body_classes for node in walk(class_def) if isinstance(node, Name)}
+        referenced: dict[str, dict[str, None]] = {}
+        for name in self.component_schemas:
+            if name in used and name in module_of:
+                referenced.setdefault(module_of[name], {})[name] = None
+        module_of.update(dict.fromkeys(self.request_body_names().values(), module))
+        self.models_package[module] = self._models_module_ast(body_classes, referenced)
+
+    def _models_module_ast(
+        self, classes: list[stmt], referenced: Mapping[str, Iterable[str]], codecs: bool = False
+    ) -> list[stmt]:
+        """Build a module of the models package.
+
+        Args:
+            classes (list[stmt]): The models of the module, and their codecs.
+            referenced (Mapping[str, Iterable[str]]): The names to import from the other modules, by module.
+            codecs (bool): Whether the module defines codecs, which need the imports at runtime.
+
+        Returns:
+            list[stmt]: The module.
+        """
+        model_imports: list[stmt] = [
+            ImportFrom(module=other, names=[alias(name=name) for name in names], level=1)
+            for other, names in referenced.items()
+        ]
+
+        body: list[stmt] = [
+            ImportFrom(module="__future__", names=[alias(name="annotations")], level=0),
+            *self.extra_imports,
+        ]
+        if codecs:
+            body.append(ImportFrom(module="typing", names=[alias(name="Any")], level=0))
+        elif model_imports and not self.runtime_model_imports:
+            body.append(ImportFrom(module="typing", names=[alias(name="TYPE_CHECKING")], level=0))
+            model_imports = [If(test=Name(id="TYPE_CHECKING", ctx=Load()), body=model_imports, orelse=[])]
+        body.extend(type_imports(classes))
+        body.extend(model_imports)
+        body.extend(classes)
+        return body
+
+    def models_modules(self, models_file: Path) -> dict[Path, list[stmt]]:
+        """Return the generated models keyed by destination path.
+
+        Args:
+            models_file (Path): The path of the models module. The package of `split_models`
+                is the directory with the same name, without the suffix.
+
+        Returns:
+            dict[Path, list[stmt]]: The models module, or the modules of the models package.
+        """
+        if not self.split_models:
+            return {models_file: self.models_ast}
+        package = models_file.with_suffix("")
+        return {package / f"{module}.py": body for module, body in self.models_package.items()}
+
+    def generate_validators_ast(self) -> None:
+        """Generate the validators of the selected models and of the payloads of their request messages.
+
+        Returns:
+            None
+        """
+        payloads = {
+            f"{operation}_request": self.ref_graph.message(operation, "request").get("payload", {})
+            for operation in self.selected_operations()
+        }
+        schemas = {name: self.component_schemas[name] for name in self.selected_schemas()}
+        self.validators_ast = build_validators_ast(schemas, payloads)
+
+    def validators_modules(self, models_file: Path) -> dict[Path, list[stmt]]:
+        """Return the generated validators keyed by destination path.
+
+        Args:
+            models_file (Path): The path of the models module, the validators are written next to it.
+
+        Returns:
+            dict[Path, list[stmt]]: The validators module, nothing if `validators` isn't set.
+        """
+        if not self.validators:
+            return {}
+        return {models_file.with_name("validators.py"): self.validators_ast}
+
+    def _generate_models(self) -> None:
+        if self.split_models:
+            self.generate_models_package_ast()
+        else:
+            self.models_ast = []
+            self.generate_models_ast()
 
     def generate_function_ast(
         self,
@@ -252,6 +909,7 @@ class BasePythonGenerator:
 
         self.functions_ast.append(ImportFrom(module="__future__", names=[alias(name="annotations")], level=0))
         self.functions_ast.extend(self.extra_imports)
+        imports_index = len(self.functions_ast)
 
         if logger:
             self.functions_ast.append(Import(names=[alias(name="logging")]))
@@ -263,6 +921,8 @@ class BasePythonGenerator:
             self._add_logger_setup(app_name)
         self._add_function_definitions()
 
+        self.functions_ast[imports_index:imports_index] = type_imports(self.functions_ast[imports_index:])
+
     def _add_function_definitions(self) -> None:
         """Generate the functions as a sequence of AST nodes.
 
@@ -277,65 +937,74 @@ class BasePythonGenerator:
         Returns:
             None
         """
-        components = self.source_content.get("components", {})
-        functions = components.get("operations", {})
+        functions = self.source_content.get("components", {}).get("operations", {})
 
         if not functions:
             return
 
-        for func_name in functions:
-            processed_decorators = self._process_decorators(func_name)
-            function_args = self._build_function_args(components, func_name)
-            returns_node = self._build_return_annotation(components, func_name)
-            description = functions[func_name].get("description")
-
-            func_def = create_ast_function_definition(
-                func_name, function_args, description, returns_node, self.is_async, processed_decorators
-            )
-            self.functions_ast.append(func_def)
-
-    def _process_decorators(self, func_name: str) -> list[expr]:
+        async_operations = set(self.async_operations or ())
+        for func_name in self.selected_operations():
+            with item(self.hooks, "operation", func_name):
+                function_args = self._build_function_args(func_name)
+                returns_node = self._build_return_annotation(func_name)
+                processed_decorators = self._process_decorators(
+                    func_name, returns_node if self.response_models else None
+                )
+                description = functions[func_name].get("description")
+                if description and self.request_body_models and function_args:
+                    description = body_docstring(description, unparse(function_args[0].annotation))
+                is_async = self.is_async or func_name in async_operations
+
+                func_def = create_ast_function_definition(
+                    func_name, function_args, description, returns_node, is_async, processed_decorators
+                )
+                self.functions_ast.append(func_def)
+
+    def _process_decorators(self, func_name: str, response_model: expr | None = None) -> list[expr]:
         """Process decorators for a function.
 
-        Process the decorator list for a function by replacing the `{func_name}`
-        placeholder with the actual function name and converting the resulting
-        string back to an AST node.
+        Process the decorator list for a function by copying every decorator with
+        the `/{func_name}` placeholder of its strings replaced by the function name.
 
         Args:
             func_name (str): The name of the function.
+            response_model (expr | None): The `response_model` keyword argument of the decorators
+                that are calls, e.g. `@app.post(...)`. Defaults to None, which adds nothing.
 
         Returns:
             list[expr]: The processed decorator nodes.
         """
         processed_decorators = []
         for dec in self.decorator_list:
-            # Convert decorator to string, replace placeholder and convert back to AST
-            dec_str = unparse(dec)
-            dec_str = dec_str.replace("/{func_name}", f"/{func_name}")
-
-            # Parse the string back to an AST
-            parsed = parse(dec_str).body[0]
-            if isinstance(parsed, Expr):
-                processed_decorators.append(parsed.value)
+            processed = replace_func_name(dec, func_name)
+            if response_model is not None and isinstance(processed, Call):
+                processed.keywords.append(keyword(arg="response_model", value=response_model))
+            processed_decorators.append(processed)
 
         return processed_decorators
 
-    def _build_function_args(self, components: dict[str, Any], func_name: str) -> list[arg]:
-        """Generate function arguments from the components/messages field of the AsyncAPI document.
+    def _build_function_args(self, func_name: str) -> list[arg]:
+        """Generate function arguments from the request message of the operation.
 
-        This function generates the function arguments from the
-        components/messages field of the AsyncAPI document. The function
-        arguments are generated from the payload properties of the request message.
+        This function generates the function arguments from the request message
+        of the operation, found through the reference graph of the AsyncAPI document.
+        The function arguments are generated from the payload properties of the request message,
+        or are the single `body` argument when `request_body_models` is set.
 
         Args:
-            components (dict): The components field of the AsyncAPI document.
             func_name (str): The name of the function.
 
         Returns:
             list[arg]: The generated function arguments.
         """
         function_args: list[arg] = []
-        request_params = components.get("messages", {}).get(f"{func_name}_request", {}).get("payload", {})
+        request_params = self.ref_graph.message(func_name, "request").get("payload", {})
+
+        if self.request_body_models:
+            if "$ref" in request_params:
+                return [arg(arg="body", annotation=convert_asyncapi_property_to_ast_node(request_params))]
+            body_name = self.request_body_names().get(func_name)
+            return [arg(arg="body", annotation=Name(id=body_name, ctx=Load()))] if body_name else []
 
         if request_params.get("properties"):
             for param_name, param_value in request_params["properties"].items():
@@ -351,25 +1020,25 @@ class BasePythonGenerator:
 
         return function_args
 
-    def _build_return_annotation(self, components: dict[str, Any], func_name: str) -> Any:
-        """Generate the return annotation of the function from the components/messages field of the AsyncAPI document.
+    def _build_return_annotation(self, func_name: str) -> Any:
+        """Generate the return annotation of the function from the response message of the operation.
 
         This function generates the return annotation of the function from the
-        components/messages field of the AsyncAPI document. The return annotation
-        is generated from the payload properties of the response message.
+        reply of the operation, found through the reference graph of the AsyncAPI document.
+        The return annotation is generated from the payload of the response message.
 
         Args:
-            components (dict): The components field of the AsyncAPI document.
             func_name (str): The name of the function.
 
         Returns:
             Any: The generated return annotation.
         """
-        response = components.get("messages", {}).get(f"{func_name}_response", {})
+        response = self.ref_graph.message(func_name, "response")
         response_param = response.get("payload", {})
         returns_node = convert_asyncapi_property_to_ast_node(response_param)
 
-        if response_param and not response_param.get("format") == "required" and returns_node:
+        required = response_param.get("format") == "required" or response_param.get(REQUIRED_RESPONSE_KEY) is True
+        if response_param and not required and returns_node:
             returns_node = BinOp(
                 left=cast(expr, returns_node),
                 op=BitOr(),
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from ast import Assign, Attribute, Call, Constant, ImportFrom, Load, Name, Store, alias
+from ast import Assign, Attribute, Call, Constant, ImportFrom, Load, Name, Store, alias, keyword
 
 from zen_generator.generators.common_python import BasePythonGenerator
 
@@ -32,6 +32,8 @@ class Generator:
         """
         return BasePythonGenerator(
             override_base_class="BaseModel",
+            # pydantic resolves the annotations of the models when they are defined
+            runtime_model_imports=True,
             extra_imports=[
                 ImportFrom(module="fastapi", names=[alias(name="FastAPI")], level=0),
             ],
@@ -50,6 +52,53 @@ class Generator:
             ],
         )
 
+    @staticmethod
+    def fastapi_post_generator(orjson: bool = False) -> BasePythonGenerator:
+        """Generate a FastAPI generator of POST routes from an AsyncAPI specification.
+
+        Every route takes the request payload as a pydantic body model, validated once by FastAPI,
+        and declares the response payload as `response_model`. The routes are plain functions,
+        which FastAPI runs in its threadpool, except the ones in `async_operations`, or every
+        route with `is_async`, which run on the event loop.
+
+        Args:
+            orjson (bool): Whether the responses are serialized with `ORJSONResponse`, which
+                needs orjson installed. Defaults to False.
+
+        Returns:
+            BasePythonGenerator: A generator for generating FastAPI code from an AsyncAPI specification.
+        """
+        extra_imports = [
+            ImportFrom(module="fastapi", names=[alias(name="FastAPI")], level=0),
+            ImportFrom(module="pydantic", names=[alias(name="BaseModel")], level=0),
+        ]
+        app_keywords = []
+        if orjson:
+            extra_imports.append(ImportFrom(module="fastapi.responses", names=[alias(name="ORJSONResponse")], level=0))
+            app_keywords.append(keyword(arg="default_response_class", value=Name(id="ORJSONResponse", ctx=Load())))
+        return BasePythonGenerator(
+            override_base_class="BaseModel",
+            runtime_model_imports=True,
+            # the optional fields of the bodies must be optional in the requests too
+            optional_defaults=True,
+            request_body_models=True,
+            response_models=True,
+            extra_imports=extra_imports,
+            extra_assignments=[
+                Assign(
+                    targets=[Name(id="app", ctx=Store())],
+                    value=Call(func=Name(id="FastAPI", ctx=Load()), args=[], keywords=app_keywords),
+                )
+            ],
+            decorator_list=[
+                Call(
+                    func=Attribute(value=Name(id="app", ctx=Load()), attr="post", ctx=Load()),
+                    args=[Constant(value="/{func_name}")],
+                    keywords=[],
+                )
+            ],
+        )
+
     @staticmethod
     def pure_python_generator() -> BasePythonGenerator:
         """Generate a pure Python generator from an AsyncAPI specification.
@@ -63,3 +112,42 @@ class Generator:
                 ImportFrom(module="utils.enums", names=[alias(name="Choices")], level=0),
             ]
         )
+
+    @staticmethod
+    def dataclass_generator() -> BasePythonGenerator:
+        """Generate a generator of slotted, frozen dataclasses from an AsyncAPI specification.
+
+        The instances have no `__dict__`, which makes them much smaller than dictionaries and
+        pydantic models when millions of them are kept in memory.
+
+        Returns:
+            BasePythonGenerator: A generator for generating dataclasses and pure Python functions.
+        """
+        return BasePythonGenerator(
+            override_base_class="",
+            extra_imports=[ImportFrom(module="dataclasses", names=[alias(name="dataclass")], level=0)],
+            model_decorator_list=[
+                Call(
+                    func=Name(id="dataclass", ctx=Load()),
+                    args=[],
+                    keywords=[keyword(arg=name, value=Constant(value=True)) for name in ("slots", "frozen", "kw_only")],
+                )
+            ],
+            optional_defaults=True,
+        )
+
+    @staticmethod
+    def msgspec_generator() -> BasePythonGenerator:
+        """Generate a generator of `msgspec.Struct` models from an AsyncAPI specification.
+
+        Returns:
+            BasePythonGenerator: A generator for generating `msgspec.Struct` models and pure Python functions.
+        """
+        return BasePythonGenerator(
+            override_base_class="Struct",
+            extra_imports=[ImportFrom(module="msgspec", names=[alias(name="Struct")], level=0)],
+            model_keywords=[keyword(arg=name, value=Constant(value=True)) for name in ("frozen", "kw_only")],
+            optional_defaults=True,
+            # msgspec resolves the annotations of the fields from the module namespace on first decoding
+            runtime_model_imports=True,
+        )
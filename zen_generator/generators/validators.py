@@ -0,0 +1,256 @@
+"""This module contains utilities for generating the validators of the payloads of an AsyncAPI document.
+
+Every model of `components.schemas`, and the payload of every request message, gets a
+validation function made of straight-line checks. The schema is translated once, when the
+module is generated, into `isinstance` tests, lookups of the required properties and calls to
+the validators of the referenced models, so nothing is interpreted when a payload is validated.
+
+The checks follow the annotations of the generated models: an optional property accepts None,
+and `oneOf` accepts a value that matches any of its options.
+"""
+
+from __future__ import annotations
+
+from ast import parse, stmt
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from zen_generator.core.ast_utils import snake_case
+from zen_generator.core.type_system import (
+    ListOf,
+    NoneType,
+    Primitive,
+    Ref,
+    TypeNode,
+    TypeRegistry,
+    Union,
+    default_type_registry,
+    type_from_schema,
+)
+
+VALIDATORS_TEMPLATE = '''\
+"""The validators of the payloads, generated from the AsyncAPI document."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+_MISSING = object()
+
+
+class ValidationError(ValueError):
+    """Raised when a payload doesn't match its schema."""
+
+    def __init__(self, path: str, message: str) -> None:
+        super().__init__(f"{path}: {message}")
+        self.path = path
+        self.message = message
+
+
+def _is_valid(validator: Callable[[Any, str], None], value: Any) -> bool:
+    try:
+        validator(value, "$")
+    except ValidationError:
+        return False
+    return True
+'''
+
+# the expression that checks every JSON type, `{value}` is the checked expression
+TYPE_CHECKS = {
+    "string": "isinstance({value}, str)",
+    "integer": "isinstance({value}, int) and type({value}) is not bool",
+    "number": "isinstance({value}, (int, float)) and type({value}) is not bool",
+    "boolean": "isinstance({value}, bool)",
+    "array": "isinstance({value}, list)",
+    "object": "isinstance({value}, dict)",
+    "null": "{value} is None",
+}
+
+
+def _indent(lines: list[str]) -> list[str]:
+    return [f"    {line}" for line in lines]
+
+
+def _raise(path: str, message: str) -> str:
+    return f"raise ValidationError({path}, {message!r})"
+
+
+def _is_typed(schema: Mapping[str, Any]) -> bool:
+    """Tell whether a schema constrains the type of its value, `{}` or a bare description accept anything."""
+    if "oneOf" in schema:
+        return all(_is_typed(option) for option in schema["oneOf"])
+    return "type" in schema or "$ref" in schema
+
+
+@dataclass
+class ValidatorBuilder:
+    """Build the source code of the validators of the models and of the payloads.
+
+    Attributes:
+        schemas (Mapping[str, Any]): The models to validate, from `components.schemas`.
+        registry (TypeRegistry): The type registry, which maps the Python types back to the JSON types.
+        function_names (dict[str, str]): The name of the validator of every model and payload.
+    """
+
+    schemas: Mapping[str, Any]
+    registry: TypeRegistry = field(default_factory=lambda: default_type_registry)
+    function_names: dict[str, str] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        # the validators of the models call each other, so their names are known in advance
+        for name in self.schemas:
+            self.add_name(name, f"validate_{snake_case(name)}")
+
+    def add_name(self, name: str, function_name: str) -> str:
+        """Register the name of the validator of a model or payload, unique within the module."""
+        taken = set(self.function_names.values())
+        unique, suffix = function_name, 1
+        while unique in taken:
+            suffix += 1
+            unique = f"{function_name}_{suffix}"
+        self.function_names[name] = unique
+        return unique
+
+    def function(self, name: str, schema: Mapping[str, Any], docstring: str) -> str:
+        """Return the source code of the validator of a model or payload.
+
+        Args:
+            name (str): The name of the model or payload, registered with `add_name`.
+            schema (Mapping[str, Any]): Its schema.
+            docstring (str): The docstring of the validator.
+
+        Returns:
+            str: The source code of the function.
+        """
+        lines = [
+            f"def {self.function_names[name]}(value: Any, path: str = '$') -> None:",
+            *_indent([repr(docstring), *self.schema_checks(schema)]),
+        ]
+        return "\n".join(lines)
+
+    def schema_checks(self, schema: Mapping[str, Any]) -> list[str]:
+        """Return the statements that validate `value` against a schema."""
+        if schema.get("type") == "object" or "properties" in schema:
+            return self.object_checks(schema)
+        return self.property_checks(schema, "value", "path")
+
+    def object_checks(self, schema: Mapping[str, Any]) -> list[str]:
+        """Return the statements that validate the properties of the object `value`."""
+        lines = ["if not isinstance(value, dict):", *_indent([_raise("path", "expected object")])]
+        properties = schema.get("properties") or {}
+        required = schema.get("required") or []
+        for name, prop in properties.items():
+            checks = self.property_checks(prop, "field", f"path + {'.' + name!r}")
+            missing = _raise("path", f"missing required property {name!r}")
+            if name in required and checks:
+                lines += [f"field = value.get({name!r}, _MISSING)", "if field is _MISSING:", *_indent([missing])]
+                lines += checks
+            elif name in required:
+                lines += [f"if {name!r} not in value:", *_indent([missing])]
+            elif checks:
+                lines += [f"field = value.get({name!r})", "if field is not None:", *_indent(checks)]
+        for name in required:
+            if name not in properties:
+                lines += [
+                    f"if {name!r} not in value:",
+                    *_indent([_raise("path", f"missing required property {name!r}")]),
+                ]
+        return lines
+
+    def property_checks(self, schema: Mapping[str, Any], value: str, path: str) -> list[str]:
+        """Return the statements that check an expression against the schema of a property, none if it has no type."""
+        if not _is_typed(schema):
+            return []
+        return self.type_checks(type_from_schema(schema, self.registry), value, path)
+
+    def type_checks(self, type_node: TypeNode, value: str, path: str) -> list[str]:
+        """Return the statements that check the type of an expression.
+
+        Args:
+            type_node (TypeNode): The expected type.
+            value (str): The checked expression.
+            path (str): The expression of the path of the value, reported by the errors.
+
+        Returns:
+            list[str]: The statements, none if any value is accepted.
+        """
+        match type_node:
+            case Ref(name) if name in self.function_names:
+                return [f"{self.function_names[name]}({value}, {path})"]
+            case ListOf(item):
+                lines = [f"if not isinstance({value}, list):", *_indent([_raise(path, "expected array")])]
+                item_checks = self.type_checks(item, "item", f"{path} + f'[{{index}}]'")
+                if item_checks:
+                    lines += [f"for index, item in enumerate({value}):", *_indent(item_checks)]
+                return lines
+        condition = self.condition(type_node, value)
+        if condition is None:
+            return []
+        return [f"if not ({condition}):", *_indent([_raise(path, f"expected {self.describe(type_node)}")])]
+
+    def condition(self, type_node: TypeNode, value: str) -> str | None:
+        """Return the expression that is true when `value` has the given type, None if any value is accepted."""
+        match type_node:
+            case Primitive(name):
+                check = TYPE_CHECKS.get(self.registry.to_asyncapi(name) or name)
+                return check.format(value=value) if check is not None else None
+            case Ref(name):
+                return f"_is_valid({self.function_names[name]}, {value})" if name in self.function_names else None
+            case ListOf(item):
+                item_condition = self.condition(item, "item")
+                if item_condition is None:
+                    return f"isinstance({value}, list)"
+                return f"isinstance({value}, list) and all({item_condition} for item in {value})"
+            case Union(options):
+                conditions = [self.condition(option, value) for option in options]
+                if not conditions or None in conditions:
+                    return None
+                return " or ".join(f"({condition})" for condition in conditions)
+            case NoneType():
+                return f"{value} is None"
+        return None
+
+    def describe(self, type_node: TypeNode) -> str:
+        """Describe a type in the messages of the errors."""
+        match type_node:
+            case Primitive(name):
+                return self.registry.to_asyncapi(name) or name
+            case Ref(name):
+                return name
+            case ListOf(item):
+                return f"array of {self.describe(item)}"
+            case Union(options):
+                return " or ".join(self.describe(option) for option in options)
+        return "null"
+
+
+def build_validators_ast(
+    schemas: Mapping[str, Any],
+    payloads: Mapping[str, Any],
+    registry: TypeRegistry | None = None,
+) -> list[stmt]:
+    """Build the validators module.
+
+    The module defines `validate_<model>` for every model, `validate_<payload>` for every
+    payload, e.g. `validate_get_order_request`, and `VALIDATORS`, which maps the name of every
+    model and payload to its validator. A validator raises `ValidationError` with the path of the
+    first invalid value, e.g. `$.customer.addresses[2]`.
+
+    Args:
+        schemas (Mapping[str, Any]): The models, from `components.schemas`. The references to
+            other models are validated only if they are part of `schemas`.
+        payloads (Mapping[str, Any]): The payloads keyed by the name of their message, e.g. `get_order_request`.
+        registry (TypeRegistry | None): The type registry. Defaults to `default_type_registry`.
+
+    Returns:
+        list[stmt]: The statements of the module.
+    """
+    builder = ValidatorBuilder(schemas, registry or default_type_registry)
+    functions = [builder.function(name, schema, f"Validate the `{name}` model.") for name, schema in schemas.items()]
+    for name, payload in payloads.items():
+        builder.add_name(name, f"validate_{snake_case(name)}")
+        functions.append(builder.function(name, payload, f"Validate the payload of the `{name}` message."))
+
+    names = ", ".join(f"{name!r}: {function_name}" for name, function_name in builder.function_names.items())
+    functions.append(f"VALIDATORS: dict[str, Callable[[Any, str], None]] = {{{names}}}")
+    return parse(VALIDATORS_TEMPLATE).body + parse("\n\n".join(functions)).body